@@ -0,0 +1,304 @@
+import argparse
+import functools
+import importlib
+import itertools
+import random
+import time
+
+import numpy as np
+import torch
+
+from utils.game import Game, HeadlessGame
+from utils.helpers import ScoreTable, DiscardEvaluator, DiscardCache
+from utils.simulator import BatchSimulator
+from utils.neural_nets import ScriptedNet
+from utils.players import RandomPlayer, DGPGPlayer, DGPRPlayer, DAPGPlayer, DAPRPlayer
+
+
+SCRIPTED_PLAYERS = {
+    'random' : RandomPlayer,
+    'dgpg' : DGPGPlayer,
+    'dgpg_ev' : functools.partial(DGPGPlayer, use_crib_ev = True),
+    'dgpr' : DGPRPlayer,
+    'dapg' : DAPGPlayer,
+    'dapr' : DAPRPlayer
+}
+
+NET_FAMILIES = ('ShallowSlim', 'ShallowWide', 'DeepSlim', 'DeepWide')
+NET_ACTIVATIONS = ('Relu', 'Leaky', 'Selu', 'Sigmoid', 'Tanh')
+
+
+def benchmark_games(player1: str, player2: str, num_games: int, seed: int) -> None:
+    """
+    Measure the games per second of Game (without visuals) and HeadlessGame on the same seeded games.
+
+    ------
+
+    Arguments:
+        player1: The name of the first scripted player.
+        player2: The name of the second scripted player.
+        num_games: The number of games to play with each engine.
+        seed: The random seed, so that both engines play the exact same games.
+    """
+
+    ScoreTable.load()
+
+    results = {}
+    for engine in (Game, HeadlessGame):
+        random.seed(seed)
+        points = []
+
+        start_time = time.perf_counter()
+        for _ in range(num_games):
+            p1, p2 = SCRIPTED_PLAYERS[player1](), SCRIPTED_PLAYERS[player2]()
+
+            if engine is Game:
+                game = Game(p1, p2, visuals = False, wait_after_move = None, wait_after_info = False)
+            else:
+                game = HeadlessGame(p1, p2)
+
+            game.play()
+            points.append((p1.points, p2.points))
+
+        games_per_sec = num_games / (time.perf_counter() - start_time)
+        results[engine.__name__] = (games_per_sec, points)
+        print(f'* {engine.__name__:<12} : {games_per_sec:.1f} games/sec')
+
+    speedup = results['HeadlessGame'][0] / results['Game'][0]
+    same_games = results['HeadlessGame'][1] == results['Game'][1]
+    print(f'* Speedup      : {speedup:.2f}x')
+    print(f'* Same results : {same_games}')
+
+
+def benchmark_batch(player1: str, player2: str, num_games: int, seed: int) -> None:
+    """
+    Measure the games per second of HeadlessGame and BatchSimulator.
+
+    ------
+
+    Arguments:
+        player1: The name of the first scripted player.
+        player2: The name of the second scripted player.
+        num_games: The number of games to simulate with the batch simulator (HeadlessGame plays 1%, at least 100).
+        seed: The random seed.
+    """
+
+    ScoreTable.load()
+    random.seed(seed)
+
+    num_headless_games = max(100, num_games // 100)
+    start_time = time.perf_counter()
+    for _ in range(num_headless_games):
+        HeadlessGame(SCRIPTED_PLAYERS[player1](), SCRIPTED_PLAYERS[player2]()).play()
+    headless_games_per_sec = num_headless_games / (time.perf_counter() - start_time)
+
+    simulator = BatchSimulator(SCRIPTED_PLAYERS[player1](), SCRIPTED_PLAYERS[player2](), num_games, seed = seed)
+    start_time = time.perf_counter()
+    simulator.start()
+    batch_games_per_sec = num_games / (time.perf_counter() - start_time)
+
+    print(f'* HeadlessGame   : {headless_games_per_sec:.1f} games/sec')
+    print(f'* BatchSimulator : {batch_games_per_sec:.1f} games/sec')
+    print(f'* Speedup        : {batch_games_per_sec / headless_games_per_sec:.2f}x')
+
+
+def enumerate_discard_stats(hand: list[int], is_dealer: bool) -> dict[str, list]:
+    """
+    Get the discard suggestions of a hand by scoring every starter card and opponent discard one by one,
+    like the original DiscardEvaluator.get_discard_stats.
+
+    ------
+
+    Arguments:
+        hand: List of 6 cards.
+        is_dealer: Whether the hand belongs to the dealer.
+
+    ------
+
+    Returns:
+        The discards of each play style with their values, sorted from best to worst.
+    """
+
+    deck = [card for card in range(52) if card not in hand]
+    crib_scores = ScoreTable.crib_scores()
+
+    discard_combos = {}
+    for discard in itertools.combinations(hand, 2):
+        remaining_hand = [card for card in hand if card not in discard]
+
+        outcomes = []
+        hand_scores = []
+        for idx, starter_card in enumerate(deck):
+            hand_score = DiscardEvaluator.score_hand(remaining_hand, starter_card)
+            hand_scores.append(hand_score)
+
+            opp_discards = np.array(list(itertools.combinations(deck[:idx] + deck[idx + 1:], 2)))
+            cribs = np.concatenate([np.broadcast_to(discard, opp_discards.shape), opp_discards], axis = 1)
+            cribs_scores = crib_scores[ScoreTable.get_combo_indexes(cribs) * 52 + starter_card].astype(np.int64)
+            outcomes.extend((hand_score + cribs_scores if is_dealer else hand_score - cribs_scores).tolist())
+
+        discard_combos[discard] = {
+            'avg' : sum(outcomes) / len(outcomes),
+            'min' : min(outcomes),
+            'max' : max(outcomes),
+            'hand' : sum(hand_scores) / len(deck),
+            'high' : sorted(outcomes)[int(len(outcomes) * DiscardEvaluator.HIGH_SCORE_PERCENTILE)]
+        }
+
+    return {
+        play_style : [(discard, scores[primary]) for discard, scores in sorted(
+            discard_combos.items(), key = lambda item: (item[1][primary], item[1][secondary]), reverse = True)]
+        for play_style, (primary, secondary) in DiscardEvaluator.PLAY_STYLES.items()
+    }
+
+
+def benchmark_discards(num_hands: int, seed: int) -> None:
+    """
+    Measure the discard evaluation time of DiscardEvaluator against scoring every outcome one by one,
+    and check that both give the same suggestions.
+
+    Half of the hands are 5-5-5-J hands with the Jack in the suit of the missing 5, which hold the highest
+    possible hand score (30) with the fifth 5 as the starter.
+
+    ------
+
+    Arguments:
+        num_hands: The number of hands, each evaluated as the pone and as the dealer.
+        seed: The random seed.
+    """
+
+    ScoreTable.load()
+    rng = random.Random(seed)
+
+    hands = []
+    for _ in range(num_hands // 2):
+        fives = rng.sample(range(4), 3)
+        missing_suit = (set(range(4)) - set(fives)).pop()
+        hand = [suit * 13 + 4 for suit in fives] + [missing_suit * 13 + DiscardEvaluator.JACK]
+        hand += rng.sample([card for card in range(52) if card % 13 != 4 and card not in hand], 2)
+        hands.append(rng.sample(hand, 6))
+    hands += [rng.sample(range(52), 6) for _ in range(num_hands - len(hands))]
+
+    same_results = True
+    enumerate_time, evaluate_time = 0.0, 0.0
+    for hand in hands:
+        for is_dealer in (False, True):
+            start_time = time.perf_counter()
+            expected = enumerate_discard_stats(hand, is_dealer)
+            enumerate_time += time.perf_counter() - start_time
+
+            # Cold and cached best discards, then the full suggestions (which the cache then answers from).
+            DiscardCache.clear()
+            start_time = time.perf_counter()
+            best_discards = [DiscardEvaluator.get_best_discard(hand, is_dealer, style) for style in expected]
+            stats = DiscardEvaluator.get_discard_stats(hand, is_dealer)
+            evaluate_time += time.perf_counter() - start_time
+            best_discards += [DiscardEvaluator.get_best_discard(hand, is_dealer, style) for style in expected]
+
+            for play_style, suggestions in expected.items():
+                same_results &= stats[play_style] == suggestions
+            same_results &= best_discards == 2 * [suggestions[0][0] for suggestions in expected.values()]
+
+    num_evaluations = 2 * len(hands)
+    print(f'* Enumeration       : {enumerate_time / num_evaluations * 1e3:.1f} ms/hand')
+    print(f'* DiscardEvaluator  : {evaluate_time / num_evaluations * 1e3:.1f} ms/hand')
+    print(f'* Same results      : {same_results}')
+
+
+def time_forward(module: torch.nn.Module, inputs: torch.Tensor, repeats: int) -> float:
+    """
+    Measure the latency of a forward pass.
+
+    ------
+
+    Arguments:
+        module: The module to run.
+        inputs: The batch of inputs.
+        repeats: The number of timed forward passes (after a few warm-up passes).
+
+    ------
+
+    Returns:
+        The average latency, in microseconds.
+    """
+
+    with torch.inference_mode():
+        for _ in range(10):
+            module(inputs)
+
+        start_time = time.perf_counter()
+        for _ in range(repeats):
+            module(inputs)
+
+    return (time.perf_counter() - start_time) / repeats * 1e6
+
+
+def benchmark_nets(activation: str, batch_sizes: list[int], repeats: int) -> None:
+    """
+    Measure the CPU latency of the eager, TorchScript and int8 TorchScript networks of each architecture family.
+
+    The weights are left untrained, since they do not change the latency.
+
+    ------
+
+    Arguments:
+        activation: The activation of the measured architectures.
+        batch_sizes: The batch sizes to measure.
+        repeats: The number of timed forward passes per measurement.
+    """
+
+    print(f'* {"Network":<24} {"Batch":>6} {"Eager":>10} {"Script":>10} {"Int8":>10}')
+
+    for prefix, nets_dir in (('DNT', 'discard_nets'), ('PNT', 'pegging_nets')):
+        for family in NET_FAMILIES:
+            depth, width = family[:-4], family[-4:]
+            net_name = f'{prefix}_{depth}{activation}{width}'
+            network = getattr(importlib.import_module(f'utils.neural_nets.{nets_dir}.{net_name}'), net_name)()
+
+            modules = (network.net.cpu().eval(), ScriptedNet.script(network), ScriptedNet.script(network, True))
+
+            for batch_size in batch_sizes:
+                inputs = torch.rand(batch_size, network.INPUT_SIZE)
+                latencies = [time_forward(module, inputs, repeats) for module in modules]
+                print(f'* {net_name:<24} {batch_size:>6} ' + ' '.join(f'{latency:>8.1f}us' for latency in latencies))
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Measure the performance of the game engines and agents.')
+    subparsers = parser.add_subparsers(dest = 'benchmark', required = True)
+
+    games = subparsers.add_parser('games', help = 'Games per second of Game and HeadlessGame.')
+    games.add_argument('--player1', default = 'random', choices = SCRIPTED_PLAYERS, help = 'The first player.')
+    games.add_argument('--player2', default = 'random', choices = SCRIPTED_PLAYERS, help = 'The second player.')
+    games.add_argument('--games', type = int, default = 1000, help = 'The number of games per engine.')
+    games.add_argument('--seed', type = int, default = 0, help = 'The random seed.')
+
+    batch = subparsers.add_parser('batch', help = 'Games per second of HeadlessGame and BatchSimulator.')
+    batch.add_argument('--player1', default = 'dgpg', choices = SCRIPTED_PLAYERS, help = 'The first player.')
+    batch.add_argument('--player2', default = 'random', choices = SCRIPTED_PLAYERS, help = 'The second player.')
+    batch.add_argument('--games', type = int, default = 100_000, help = 'The number of batch simulated games.')
+    batch.add_argument('--seed', type = int, default = 0, help = 'The random seed.')
+
+    discards = subparsers.add_parser('discards', help = 'DiscardEvaluator against scoring every outcome.')
+    discards.add_argument('--hands', type = int, default = 20, help = 'The number of hands.')
+    discards.add_argument('--seed', type = int, default = 0, help = 'The random seed.')
+
+    nets = subparsers.add_parser('nets', help = 'CPU latency of the eager, TorchScript and int8 networks.')
+    nets.add_argument('--activation', default = 'Relu', choices = NET_ACTIVATIONS, help = 'The activation.')
+    nets.add_argument('--batch-sizes', type = int, nargs = '+', default = [1, 256], help = 'The batch sizes.')
+    nets.add_argument('--repeats', type = int, default = 200, help = 'The number of timed forward passes.')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'games':
+        benchmark_games(args.player1, args.player2, args.games, args.seed)
+
+    if args.benchmark == 'batch':
+        benchmark_batch(args.player1, args.player2, args.games, args.seed)
+
+    if args.benchmark == 'discards':
+        benchmark_discards(args.hands, args.seed)
+
+    if args.benchmark == 'nets':
+        benchmark_nets(args.activation, args.batch_sizes, args.repeats)
@@ -0,0 +1,200 @@
+import argparse
+import importlib
+
+import numpy as np
+import torch
+
+from utils.helpers import StateEncoder, NumpyNet, NumpyDiscardNet, NumpyPeggingNet
+from utils.neural_nets import BaseDiscardNet, BasePeggingNet, ScriptedNet, ScriptedDiscardNet, ScriptedPeggingNet
+
+
+def load_network(net_name: str, file_name: str) -> BaseDiscardNet | BasePeggingNet:
+    """
+    Create a network of the given architecture and load its trained weights.
+
+    ------
+
+    Arguments:
+        net_name: The class name of the architecture (e.g. DNT_DeepReluSlim or PNT_ShallowTanhWide).
+        file_name: The file name of the weights (at trained_nets/discard_nets or trained_nets/pegging_nets).
+
+    ------
+
+    Returns:
+        The network, in evaluation mode.
+    """
+
+    nets_dir = 'discard_nets' if net_name.startswith('DNT_') else 'pegging_nets'
+    network = getattr(importlib.import_module(f'utils.neural_nets.{nets_dir}.{net_name}'), net_name)()
+    network.load_weights(file_name)
+    network.eval()
+
+    return network
+
+
+def random_states(network: BaseDiscardNet | BasePeggingNet, num_states: int, seed: int) -> tuple[np.ndarray, ...]:
+    """
+    Generate random states for a network, to compare its exports against it.
+
+    ------
+
+    Arguments:
+        network: The network.
+        num_states: The number of states.
+        seed: The random seed.
+
+    ------
+
+    Returns:
+        The arguments of the network's get_discard_actions or get_pegging_actions, one row per state.
+    """
+
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 121, size = (2, num_states))
+    cards = np.argsort(rng.random((num_states, 52)), axis = 1)[:, :11]
+
+    if isinstance(network, BaseDiscardNet):
+        return scores[0], scores[1], rng.random(num_states) < 0.5, cards[:, :6]
+
+    # Random counts of 0-7 played cards and hands of 0-4 cards.
+    crib_sums = rng.integers(0, 32, size = num_states)
+    crib_cards = np.where(np.arange(7) < rng.integers(0, 8, size = (num_states, 1)), cards[:, 4:], -1)
+    player_hands = np.where(np.arange(4) < rng.integers(0, 5, size = (num_states, 1)), cards[:, :4], -1)
+    return scores[0], scores[1], crib_sums, crib_cards, player_hands
+
+
+def random_inputs(network: BaseDiscardNet | BasePeggingNet, num_states: int, seed: int) -> np.ndarray:
+    """
+    Generate random encoded states for a network, to compare its exports against it.
+
+    ------
+
+    Arguments:
+        network: The network.
+        num_states: The number of states.
+        seed: The random seed.
+
+    ------
+
+    Returns:
+        The encoded states (num_states x INPUT_SIZE).
+    """
+
+    inputs = np.empty((num_states, network.INPUT_SIZE), dtype = np.float32)
+    states = random_states(network, num_states, seed)
+
+    if isinstance(network, BaseDiscardNet):
+        return StateEncoder.encode_states_for_discard_phase(inputs, *states)
+
+    return StateEncoder.encode_states_for_pegging_phase(inputs, *states)
+
+
+def export_numpy(net_name: str, file_name: str, output: str) -> None:
+    """
+    Export a trained network to a NumPy weight bundle and check that it gives the same outputs.
+
+    ------
+
+    Arguments:
+        net_name: The class name of the architecture.
+        file_name: The file name of the weights.
+        output: The file name of the bundle (saved next to the weights).
+    """
+
+    network = load_network(net_name, file_name)
+    numpy_net = NumpyDiscardNet() if isinstance(network, BaseDiscardNet) else NumpyPeggingNet()
+
+    NumpyNet.export(network, f'trained_nets/{numpy_net.NETS_DIR}/{output}.npz')
+    numpy_net.load_weights(output)
+
+    inputs = random_inputs(network, 10_000, seed = 0)
+    with torch.inference_mode():
+        outputs = network(torch.from_numpy(inputs).to(network.device)).cpu().numpy()
+    numpy_outputs = numpy_net.forward(inputs)
+
+    print(f'* Saved to              : trained_nets/{numpy_net.NETS_DIR}/{output}.npz')
+    print(f'* Max output difference : {np.abs(outputs - numpy_outputs).max():.2e}')
+    print(f'* Same argmax           : {(outputs.argmax(axis = 1) == numpy_outputs.argmax(axis = 1)).mean() * 100:.2f}%')
+
+
+def export_torchscript(net_name: str, file_name: str, output: str, quantize: bool) -> None:
+    """
+    Export a trained network to a frozen TorchScript module and record its accuracy delta against the eager network.
+
+    ------
+
+    Arguments:
+        net_name: The class name of the architecture.
+        file_name: The file name of the weights.
+        output: The file name of the module (saved next to the weights).
+        quantize: Whether to quantize the weights of the Linear layers to int8.
+    """
+
+    network = load_network(net_name, file_name)
+    scripted_net = ScriptedDiscardNet() if isinstance(network, BaseDiscardNet) else ScriptedPeggingNet()
+    scripted_net.net = ScriptedNet.script(network, quantize)
+
+    num_states = 10_000
+    inputs = random_inputs(network, num_states, seed = 0)
+    states = random_states(network, num_states, seed = 0)
+
+    with torch.inference_mode():
+        outputs = network(torch.from_numpy(inputs).to(network.device)).cpu().numpy()
+        scripted_outputs = scripted_net(torch.from_numpy(inputs)).numpy()
+
+    if isinstance(network, BaseDiscardNet):
+        actions = network.get_discard_actions(*states)[0].cpu()
+        scripted_actions = scripted_net.get_discard_actions(*states)[0]
+    else:
+        actions = network.get_pegging_actions(*states)[0].cpu()
+        scripted_actions = scripted_net.get_pegging_actions(*states)[0]
+
+    output_diffs = np.abs(outputs - scripted_outputs)
+    accuracy = {
+        'num_states' : num_states,
+        'max_output_diff' : float(output_diffs.max()),
+        'mean_output_diff' : float(output_diffs.mean()),
+        'same_argmax' : float((outputs.argmax(axis = 1) == scripted_outputs.argmax(axis = 1)).mean() * 100),
+        'same_action' : float((actions == scripted_actions).float().mean() * 100)
+    }
+
+    path = f'trained_nets/{scripted_net.NETS_DIR}/{output}.{ScriptedNet.EXTENSION}'
+    ScriptedNet.save(scripted_net.net, path, {'source' : net_name, 'weights' : file_name,
+                                              'quantized' : quantize, 'accuracy' : accuracy})
+
+    # Load the module back, like the players do.
+    scripted_net.load_weights(output)
+
+    print(f'* Saved to               : {path}')
+    print(f'* Quantized              : {scripted_net.metadata["quantized"]}')
+    print(f'* Max output difference  : {accuracy["max_output_diff"]:.2e}')
+    print(f'* Mean output difference : {accuracy["mean_output_diff"]:.2e}')
+    print(f'* Same argmax            : {accuracy["same_argmax"]:.2f}%')
+    print(f'* Same action            : {accuracy["same_action"]:.2f}%')
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Export trained networks for inference.')
+    subparsers = parser.add_subparsers(dest = 'format', required = True)
+
+    numpy_bundle = subparsers.add_parser('numpy', help = 'A NumPy weight bundle, for inference without torch.')
+    numpy_bundle.add_argument('net', help = 'The class name of the architecture (e.g. DNT_DeepReluSlim).')
+    numpy_bundle.add_argument('weights', help = 'The file name of the trained weights, without the extension.')
+    numpy_bundle.add_argument('--output', default = None, help = 'The file name of the bundle (defaults to weights).')
+
+    torchscript = subparsers.add_parser('torchscript', help = 'A frozen TorchScript module, optionally quantized.')
+    torchscript.add_argument('net', help = 'The class name of the architecture (e.g. PNT_ShallowReluWide).')
+    torchscript.add_argument('weights', help = 'The file name of the trained weights, without the extension.')
+    torchscript.add_argument('--quantize', action = 'store_true', help = 'Quantize the Linear layers to int8.')
+    torchscript.add_argument('--output', default = None,
+                             help = 'The file name of the module (defaults to weights, with _int8 if quantized).')
+
+    args = parser.parse_args()
+
+    if args.format == 'numpy':
+        export_numpy(args.net, args.weights, args.output or args.weights)
+
+    if args.format == 'torchscript':
+        output = args.output or (f'{args.weights}_int8' if args.quantize else args.weights)
+        export_torchscript(args.net, args.weights, output, args.quantize)
@@ -0,0 +1,37 @@
+import argparse
+from multiprocessing import cpu_count
+
+from utils.helpers import ScoreTable, DiscardTable, CribTable
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Generate precomputed lookup tables.')
+    subparsers = parser.add_subparsers(dest = 'table', required = True)
+
+    score_tables = subparsers.add_parser('score_tables', help = 'Hand and crib scores for every 4 cards and starter.')
+    score_tables.add_argument('--output', default = ScoreTable.TABLES_DIR, help = 'The directory to save to.')
+
+    discard_table = subparsers.add_parser('discard_table', help = 'Discard statistics for every canonical 6-card hand.')
+    discard_table.add_argument('--output', default = DiscardTable.TABLES_DIR, help = 'The directory to save to.')
+    discard_table.add_argument('--workers', type = int, default = cpu_count(), help = 'The number of worker processes.')
+
+    crib_table = subparsers.add_parser('crib_table', help = 'Expected crib scores for every two-card discard.')
+    crib_table.add_argument('--output', default = CribTable.TABLES_DIR, help = 'The directory to save to.')
+
+    args = parser.parse_args()
+
+    if args.table == 'score_tables':
+        print(f'Generating score tables at "{args.output}"...')
+        ScoreTable.build(args.output)
+        print('Done.')
+
+    if args.table == 'discard_table':
+        print(f'Generating the discard table at "{args.output}"...')
+        DiscardTable.build(args.output, args.workers)
+        print('Done.')
+
+    if args.table == 'crib_table':
+        print(f'Generating the crib table at "{args.output}"...')
+        CribTable.build(args.output)
+        print('Done.')
@@ -2,7 +2,7 @@ from sty import fg as Text, bg as Back, rs as Rest
 from os import system as sys_call
 import re
 
-from utils.helpers import CardDeck
+from utils.helpers import CardDeck, Card, GameState
 from utils.players import BasePlayer, UserPlayer
 
 
@@ -120,7 +120,7 @@ class Display:
             print(f'\033[2K{trick}')
 
 
-    def update_starter(self, state: dict[str, ...]) -> None:
+    def update_starter(self, state: GameState) -> None:
         """
         Update the terminal display after the starter card is altered.
 
@@ -133,8 +133,8 @@ class Display:
         if not self.display_enabled:
             return
 
-        card = state['starter_card']
-        card_matrix = self.get_card_matrix(card) if card else self.get_flipped_card_matrix()
+        card = state.starter_card
+        card_matrix = self.get_card_matrix(card) if card is not None else self.get_flipped_card_matrix()
 
         card_row, card_col = self.STARTER_CARD
 
@@ -143,7 +143,7 @@ class Display:
                 self.matrix[row][col] = card_matrix[row - card_row][col - card_col]
 
 
-    def update_crib(self, state: dict[str, ...], hat: bool = False) -> None:
+    def update_crib(self, state: GameState, hat: bool = False) -> None:
         """
         Update the terminal display after the dealer's crib is altered.
 
@@ -159,14 +159,14 @@ class Display:
 
         card_matrix = self.get_hat_matrix() if hat else self.get_flipped_card_matrix()
 
-        card_row, card_col = self.DEALER_TOP if state['dealer'] == state['player2'] else self.DEALER_BOTTOM
+        card_row, card_col = self.DEALER_TOP if state.dealer == self.player2.seat else self.DEALER_BOTTOM
 
         for row in range(card_row, card_row + self.CARD_HEIGHT):
             for col in range(card_col, card_col + self.CARD_WIDTH):
                 self.matrix[row][col] = card_matrix[row - card_row][col - card_col]
 
 
-    def update_play(self, state: dict[str, ...], player: BasePlayer, option: str) -> None:
+    def update_play(self, state: GameState, player: BasePlayer, option: str) -> None:
         """
         Update the terminal display after player makes a move.
 
@@ -193,13 +193,13 @@ class Display:
             return
 
         card_col = self.current_card_pos[1]
-        card_row = self.PLAY_CARD_TOP[0] if player == state["player2"] else self.PLAY_CARD_BOTTOM[0]
+        card_row = self.PLAY_CARD_TOP[0] if player == self.player2 else self.PLAY_CARD_BOTTOM[0]
 
         if option in ("next_card", "next_crib_31"):
             if option == 'next_crib_31':
-                card_matrix = self.get_card_matrix(state['cribs'][state['current_crib_idx'] - 1][-1])
+                card_matrix = self.get_card_matrix(state.cribs[state.current_crib_idx - 1][-1])
             else:
-                card_matrix = self.get_card_matrix(state["cribs"][state["current_crib_idx"]][-1])
+                card_matrix = self.get_card_matrix(state.cribs[state.current_crib_idx][-1])
 
             for row in range(card_row, card_row + self.CARD_HEIGHT):
                 for col in range(card_col, card_col + self.CARD_WIDTH):
@@ -215,7 +215,7 @@ class Display:
         self.update_crib_sum(state)
 
 
-    def update_hand(self, state: dict[str, ...], player: BasePlayer) -> None:
+    def update_hand(self, state: GameState, player: BasePlayer) -> None:
         """
         Update the terminal display after the player's hand is altered.
 
@@ -230,10 +230,10 @@ class Display:
             return
 
         player_cards = player.cards + [None] * (6 - len(player.cards))
-        if not self.show_opponents_hand and player == state["player2"]:
+        if not self.show_opponents_hand and player == self.player2:
             player_cards = ["F"] * len(player.cards) + [None] * (6 - len(player.cards))
 
-        card_row, card_col = self.HAND_TOP if player == state["player2"] else self.HAND_BOTTOM
+        card_row, card_col = self.HAND_TOP if player == self.player2 else self.HAND_BOTTOM
 
         for card in player_cards:
 
@@ -251,7 +251,7 @@ class Display:
             card_col += 1 + self.CARD_WIDTH
 
 
-    def update_crib_reveal(self, state: dict[str, ...], dealers_crib: list[str]) -> None:
+    def update_crib_reveal(self, state: GameState, dealers_crib: list[Card]) -> None:
         """
         Update the terminal display to show dealer's crib being scored.
 
@@ -267,7 +267,7 @@ class Display:
 
         self.update_crib(state, hat = True)
 
-        card_row, card_col = self.HAND_TOP if state["dealer"] == state["player2"] else self.HAND_BOTTOM
+        card_row, card_col = self.HAND_TOP if state.dealer == self.player2.seat else self.HAND_BOTTOM
 
         for card in dealers_crib:
             card_matrix = self.get_card_matrix(card)
@@ -279,7 +279,7 @@ class Display:
             card_col += 1 + self.CARD_WIDTH
 
 
-    def update_points(self, state: dict[str, ...], player: BasePlayer) -> None:
+    def update_points(self, state: GameState, player: BasePlayer) -> None:
         """
         Update the terminal display after the player scores points.
 
@@ -295,19 +295,19 @@ class Display:
 
         points = f'{player.points} pts'
 
-        pts_row, pts_col = self.POINTS_TOP if player == state['player2'] else self.POINTS_BOTTOM
+        pts_row, pts_col = self.POINTS_TOP if player == self.player2 else self.POINTS_BOTTOM
 
         for col in range(pts_col, pts_col + len(points)):
             self.matrix[pts_row][col] = f'{Back.da_green}{Text.li_yellow}{points[col - pts_col]}{Rest.all}'
 
 
-    def update_crib_sum(self, state: dict[str, ...]) -> None:
+    def update_crib_sum(self, state: GameState) -> None:
         """ Update the terminal display after a card is added to the current crib. """
 
         if not self.display_enabled:
             return
 
-        crib_sum = state['crib_sums'][state['current_crib_idx']]
+        crib_sum = state.crib_sums[state.current_crib_idx]
         crib_sum = f'{crib_sum:<2} sum'
 
         sum_row, sum_col = self.CRIB_SUM
@@ -316,9 +316,9 @@ class Display:
             self.matrix[sum_row][col] = f'{Back.da_green}{Text.li_yellow}{crib_sum[col - sum_col]}{Rest.all}'
 
 
-    def get_card_matrix(self, card: str) -> list[list[str]]:
+    def get_card_matrix(self, card: Card) -> list[list[str]]:
         """
-        Convert a card from rank-suit format to printable format.
+        Convert a card to printable format.
 
         ------
 
@@ -331,10 +331,10 @@ class Display:
             The same card in a format ready for printing.
         """
 
-        rank = card[0]
+        rank, suit_name = CardDeck.card_to_str(card)
         suit = CardDeck.get_card_suit(card)
 
-        color = Text.red if card[1] in 'DH' else Text.black
+        color = Text.red if suit_name in 'DH' else Text.black
 
         matrix = [[f'{Back.white} {Back.rs}' for _ in range(self.CARD_WIDTH)] for _ in range(self.CARD_HEIGHT)]
 
@@ -1 +1,2 @@
 from .game import *
+from .headless_game import *
\ No newline at end of file
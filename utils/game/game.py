@@ -3,16 +3,16 @@ import time
 
 from utils.assets import Display
 from utils.players import BasePlayer, UserPlayer
-from utils.helpers import CardDeck
-from utils.helpers import Scoring
+from utils.helpers import CardDeck, Card
+from utils.helpers import Scoring, GameState
 
 
 class Game:
     """ Cribbage game logic and flow. """
 
-    state: dict[str, ...] = None
+    state: GameState = None
     card_deck: CardDeck = None
-    dealers_crib: list[str] = None
+    dealers_crib: list[Card] = None
     called_go: bool = False
 
 
@@ -58,8 +58,12 @@ class Game:
         if first_dealer:
             # self.prepare_new_round() switches the dealer, so we assign the opposite of the given first dealer
             first_dealer = player1 if first_dealer == 'player2' else player2
+            first_dealer = 0 if first_dealer == self.player1 else 1
         self.first_dealer = first_dealer
 
+        self.player1.seat = 0
+        self.player2.seat = 1
+
         self.visuals = visuals
         self.display = Display(self.player1, self.player2, show_opponents_hand, display_enabled = visuals)
 
@@ -90,15 +94,7 @@ class Game:
     def reset_game(self) -> None:
         """ Reset the game state to its starting form and clear all player data. """
 
-        self.state = {
-            'cribs' : [[], [], []],
-            'current_crib_idx' : 0,
-            'crib_sums': [0, 0, 0],
-            'starter_card': None,
-            'dealer' : random.choice([self.player1, self.player2]) if self.first_dealer is None else self.first_dealer,
-            'player1' : self.player1,
-            'player2' : self.player2
-        }
+        self.state = GameState(dealer = random.choice([0, 1]) if self.first_dealer is None else self.first_dealer)
 
         self.dealers_crib = []
 
@@ -123,11 +119,7 @@ class Game:
     def prepare_new_round(self) -> None:
         """ Prepare the game state for a new round. """
 
-        self.state['cribs'] = [[], [], []]
-        self.state['current_crib_idx'] = 0
-        self.state['crib_sums'] = [0, 0, 0]
-        self.state['starter_card'] = None
-        self.state['dealer'] = self.player1 if self.state['dealer'] == self.player2 else self.player2
+        self.state = GameState(dealer = 1 - self.state.dealer, points = [self.player1.points, self.player2.points])
         self.dealers_crib = []
 
         self.card_deck = CardDeck(shuffle = True)
@@ -146,6 +138,26 @@ class Game:
         self.display.print(show_board = True)
 
 
+    def get_dealer(self) -> BasePlayer:
+        """
+        Get the dealer of the current round.
+
+        ------
+
+        Returns:
+            The dealer player.
+        """
+
+        return self.player2 if self.state.dealer else self.player1
+
+
+    def sync_points(self) -> None:
+        """ Copy the players' points to the game state, so that they are up to date when a player moves. """
+
+        self.state.points[0] = self.player1.points
+        self.state.points[1] = self.player2.points
+
+
     def check_win(self) -> BasePlayer | None:
         """
         Check if there is a winner in the current game state.
@@ -175,6 +187,7 @@ class Game:
             player: The player whose turn it is to play.
         """
 
+        self.sync_points()
         discarded_cards = player.discard_cards(self.state)
         self.dealers_crib.extend(discarded_cards)
 
@@ -193,33 +206,40 @@ class Game:
             player: The player whose turn it is to play.
         """
 
+        self.sync_points()
         played_card = player.play_card(self.state)
+        tracker = self.state.pegging
 
         if played_card == "GO":
             if self.called_go:
-                self.state['current_crib_idx'] += 1
+                self.state.current_crib_idx += 1
+                tracker.next_count()
                 self.called_go = False
 
                 self.display.update_play(self.state, player, option = "next_crib_go")
                 self.display.print(show_board = True, clear = True)
             else:
                 self.called_go = True
-                score, tricks_info = Scoring.score_go(self.state, player, update_points = True)
                 other_player = self.player1 if player == self.player2 else self.player2
+                score, tricks_info = Scoring.score_go(self.state, other_player, update_points = True,
+                                                      explain = self.visuals)
                 self.display.update_points(self.state, other_player)
                 self.display.update_play(self.state, player, option = "stay")
                 self.display.print(tricks_info = tricks_info, show_board = True, clear = True)
             return
 
-        current_crib_idx = self.state['current_crib_idx']
-        self.state['cribs'][current_crib_idx].append(played_card)
+        current_crib_idx = self.state.current_crib_idx
+        self.state.cribs[current_crib_idx].append(played_card)
 
-        score, tricks_info = Scoring.score_card(self.state, player, update_points = True)
+        # The tracker scores the card in constant time, Scoring is only needed to describe the tricks.
+        tricks_info = Scoring.score_card(self.state, player)[1] if self.visuals else []
+        player.points += tracker.play(played_card)
         self.display.update_points(self.state, player)
 
-        self.state['crib_sums'][current_crib_idx] += CardDeck.get_card_worth(played_card)
-        if self.state['crib_sums'][current_crib_idx] == 31:
-            self.state['current_crib_idx'] += 1
+        self.state.crib_sums[current_crib_idx] += CardDeck.get_card_worth(played_card)
+        if self.state.crib_sums[current_crib_idx] == 31:
+            self.state.current_crib_idx += 1
+            tracker.next_count()
             self.called_go = False
 
             self.display.update_play(self.state, player, option="next_crib_31")
@@ -248,7 +268,7 @@ class Game:
                 self.stats_total_game_rounds += 1
 
             self.prepare_new_round()
-            dealer = self.state['dealer']
+            dealer = self.get_dealer()
             non_dealer = self.player1 if dealer == self.player2 else self.player2
 
             # DISCARD PHASE
@@ -259,19 +279,23 @@ class Game:
             self.discard_cards(self.player2)
             self.wait_after_move()
 
-            self.state['starter_card'] = self.card_deck.deal_cards(1)[0]
+            self.state.starter_card = self.card_deck.deal_cards(1)[0]
 
             self.display.update_starter(self.state)
             self.display.print(show_board = True, clear = True)
 
-            _, tricks_info = Scoring.score_heels(self.state, update_points = True)
+            _, tricks_info = Scoring.score_heels(self.state, dealer, update_points = True, explain = self.visuals)
 
             self.display.update_points(self.state, dealer)
             self.display.print(tricks_info = tricks_info, show_board = True, clear = True)
 
             # PRE-CALCULATION FOR THE SHOW PHASE
-            hand_score_dealer, hand_score_dealer_info = Scoring.score_hand(self.state, dealer, update_points = False)
-            hand_score_non_dealer, hand_score_non_dealer_info = Scoring.score_hand(self.state, non_dealer, update_points = False)
+            hand_score_dealer, hand_score_dealer_info = Scoring.score_hand(
+                self.state, dealer, update_points = False, explain = self.visuals
+            )
+            hand_score_non_dealer, hand_score_non_dealer_info = Scoring.score_hand(
+                self.state, non_dealer, update_points = False, explain = self.visuals
+            )
 
             # PLAY PHASE
             current_player = non_dealer
@@ -311,7 +335,8 @@ class Game:
             if winner:
                 break
 
-            _, crib_score_info = Scoring.score_crib(self.state, self.dealers_crib, update_points = True)
+            _, crib_score_info = Scoring.score_crib(self.state, dealer, self.dealers_crib, update_points = True,
+                                                    explain = self.visuals)
             self.display.update_crib_reveal(self.state, self.dealers_crib)
             self.display.update_points(self.state, dealer)
             self.display.print(tricks_info = ['Dealer crib score:'] + crib_score_info,
@@ -0,0 +1,263 @@
+import random
+
+from utils.players import BasePlayer, UserPlayer
+from utils.helpers import CardDeck, Card, GameState, ScoreTable
+
+
+class HeadlessGame:
+    """
+    Cribbage game logic and flow without a display, for simulations and training.
+
+    Follows the same rules as Game, but keeps the points in the game state and scores the hands
+    and the crib with score table lookups.
+    """
+
+    state: GameState = None
+    card_deck: CardDeck = None
+    dealers_crib: list[Card] = None
+    called_go: bool = False
+    turn: int = 0
+
+
+    def __init__(self, player1: BasePlayer, player2: BasePlayer, first_dealer: str = None,
+                 measure_statistics: bool = False) -> None:
+        """
+        Create and initialize an instance of the HeadlessGame class.
+
+        ------
+
+        Arguments:
+            player1: The first player object. Cannot be UserPlayer.
+            player2: The second player object. Cannot be UserPlayer.
+            first_dealer: Which player starts as the dealer ("player1" or "player2").
+            measure_statistics: Whether to measure game statistics and player performance.
+        """
+
+        if isinstance(player1, UserPlayer) or isinstance(player2, UserPlayer):
+            raise Exception('Players cannot be of type UserPlayer in a headless game.')
+
+        self.player1, self.player2 = player1, player2
+        self.players = (player1, player2)
+        player1.seat = 0
+        player2.seat = 1
+
+        if first_dealer:
+            # self.prepare_new_round() switches the dealer, so we assign the opposite of the given first dealer
+            first_dealer = 1 if first_dealer == 'player1' else 0
+        self.first_dealer = first_dealer
+
+        self.measure_statistics = measure_statistics
+        self.stats_score_diff = []
+        self.stats_score_diff_dealer1 = []
+        self.stats_score_diff_dealer2 = []
+        self.stats_total_game_rounds = 0
+
+        self.reset_game()
+
+
+    def reset_game(self) -> None:
+        """ Reset the game state to its starting form and clear all player data. """
+
+        self.state = GameState(dealer = random.choice([0, 1]) if self.first_dealer is None else self.first_dealer)
+        self.dealers_crib = []
+
+        self.card_deck = CardDeck(shuffle = True)
+        self.player1.cards = []
+        self.player2.cards = []
+
+        self.called_go = False
+        self.sync_points()
+
+        if self.measure_statistics:
+            self.stats_score_diff = []
+            self.stats_score_diff_dealer1 = []
+            self.stats_score_diff_dealer2 = []
+            self.stats_total_game_rounds = 0
+
+
+    def prepare_new_round(self) -> None:
+        """ Prepare the game state for a new round. """
+
+        self.state = GameState(dealer = 1 - self.state.dealer, points = self.state.points)
+        self.dealers_crib = []
+
+        self.card_deck = CardDeck(shuffle = True)
+        self.player1.cards = sorted(self.card_deck.deal_cards(6), key = CardDeck.RANK_LOOKUP.__getitem__)
+        self.player2.cards = sorted(self.card_deck.deal_cards(6), key = CardDeck.RANK_LOOKUP.__getitem__)
+
+        self.called_go = False
+
+
+    def resume_play(self, state: GameState) -> None:
+        """
+        Continue the Play phase from the given state, with the non-dealer to move.
+
+        ------
+
+        Arguments:
+            state: The game state going into the Play phase. The players must already hold their cards.
+        """
+
+        self.state = state
+        self.called_go = False
+        self.turn = 1 - state.dealer
+
+
+    def sync_points(self) -> None:
+        """ Copy the points from the game state to the players, so that they are up to date when a player moves. """
+
+        self.player1.points = self.state.points[0]
+        self.player2.points = self.state.points[1]
+
+
+    def check_win(self) -> BasePlayer | None:
+        """
+        Check if there is a winner in the current game state.
+
+        ------
+
+        Returns:
+            The winning player or None if there is no winner yet.
+        """
+
+        points = self.state.points
+
+        if points[0] >= 121:
+            return self.player1
+
+        if points[1] >= 121:
+            return self.player2
+
+        return None
+
+
+    def play_move(self, move: Card | str) -> int:
+        """
+        Apply a move of the player whose turn it is during the Play phase, then pass the turn if needed.
+
+        ------
+
+        Arguments:
+            move: The played card, or GO.
+
+        ------
+
+        Returns:
+            The points scored by the player who made the move.
+        """
+
+        state = self.state
+        seat = self.turn
+        prev_called_go = self.called_go
+        score = 0
+
+        if move == 'GO':
+            if self.called_go:
+                state.current_crib_idx += 1
+                state.pegging.next_count()
+                self.called_go = False
+            else:
+                self.called_go = True
+                state.points[1 - seat] += 1
+        else:
+            crib_idx = state.current_crib_idx
+            state.cribs[crib_idx].append(move)
+            score = state.pegging.play(move)
+            state.points[seat] += score
+
+            state.crib_sums[crib_idx] += CardDeck.WORTH_LOOKUP[move]
+            if state.crib_sums[crib_idx] == 31:
+                state.current_crib_idx += 1
+                state.pegging.next_count()
+                self.called_go = False
+
+        if not (self.called_go and prev_called_go):
+            self.turn = 1 - seat
+
+        return score
+
+
+    def play(self) -> BasePlayer:
+        """
+        Start the main game loop.
+
+        ------
+
+        Returns:
+            The player who won.
+        """
+
+        self.reset_game()
+        hand_scores, crib_scores = ScoreTable.hand_scores(), ScoreTable.crib_scores()
+
+        winner = None
+        while winner is None:
+
+            if self.measure_statistics:
+                self.stats_total_game_rounds += 1
+
+            self.prepare_new_round()
+            state = self.state
+            points = state.points
+            dealer_seat = state.dealer
+            dealer, non_dealer = self.players[dealer_seat], self.players[1 - dealer_seat]
+
+            # DISCARD PHASE
+            self.sync_points()
+            self.dealers_crib.extend(self.player1.discard_cards(state))
+            self.dealers_crib.extend(self.player2.discard_cards(state))
+
+            starter_card = self.card_deck.deal_cards(1)[0]
+            state.starter_card = starter_card
+
+            heels = 2 if CardDeck.RANK_LOOKUP[starter_card] == 11 else 0
+            points[dealer_seat] += heels
+
+            # PRE-CALCULATION FOR THE SHOW PHASE
+            hand_score_dealer = int(hand_scores[ScoreTable.get_combo_index(dealer.cards) * 52 + starter_card])
+            hand_score_non_dealer = int(hand_scores[ScoreTable.get_combo_index(non_dealer.cards) * 52 + starter_card])
+
+            # PLAY PHASE
+            self.resume_play(state)
+
+            while self.player1.cards or self.player2.cards:
+                self.sync_points()
+                self.play_move(self.players[self.turn].play_card(state))
+
+                winner = self.check_win()
+                if winner:
+                    break
+
+            # SHOW PHASE
+            points[1 - dealer_seat] += hand_score_non_dealer
+            winner = self.check_win()
+            if winner:
+                break
+
+            points[dealer_seat] += hand_score_dealer
+            winner = self.check_win()
+            if winner:
+                break
+
+            # The crib table includes his heels, which were already scored when the starter card was cut.
+            crib_idx = ScoreTable.get_combo_index(self.dealers_crib) * 52 + starter_card
+            points[dealer_seat] += int(crib_scores[crib_idx]) - heels
+            winner = self.check_win()
+            if winner:
+                break
+
+            if self.measure_statistics:
+                score_diff = points[0] - points[1]
+                self.stats_score_diff.append(score_diff)
+
+                if dealer_seat == 0:
+                    self.stats_score_diff_dealer1.append(score_diff)
+                else:
+                    self.stats_score_diff_dealer2.append(score_diff)
+
+        # GAME END
+        self.sync_points()
+        return winner
+
+
+__all__ = ['HeadlessGame']
@@ -1,5 +1,14 @@
 from .card_deck import *
+from .suit_canonicalizer import *
+from .pegging_tracker import *
+from .game_state import *
 from .scoring import *
+from .score_table import *
 from .discard_evaluator import *
+from .discard_table import *
+from .discard_cache import *
+from .crib_table import *
 # from .state_encoder import *
 from .simple_state_encoder import *
+from .numpy_net import *
+from .inference_memo import *
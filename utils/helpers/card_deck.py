@@ -1,13 +1,27 @@
+import itertools
 import random
 
 
+Card = int
+
+
 class CardDeck:
-    """ Helper functions for card deck logic. """
+    """
+    Helper functions for card deck logic.
+
+    Cards are integers from 0 to 51 (suit index * 13 + rank index), in the same order as an unshuffled deck.
+    The rank-suit format (e.g. "JH") is only used when cards are shown to or read from the user.
+    """
 
     CARD_RANKS = '123456789TJQK'
     CARD_SUITS = 'SDCH'
     CARD_EMOJIS = '♠♦♣♥'
 
+    CARD_NAMES: tuple[str, ...] = tuple(rank + suit for suit, rank in itertools.product(CARD_SUITS, CARD_RANKS))
+    RANK_LOOKUP: tuple[int, ...] = tuple(card % 13 + 1 for card in range(52))
+    SUIT_LOOKUP: tuple[int, ...] = tuple(card // 13 for card in range(52))
+    WORTH_LOOKUP: tuple[int, ...] = tuple(min(rank, 10) for rank in RANK_LOOKUP)
+
 
     def __init__(self, shuffle: bool = True) -> None:
         """
@@ -19,16 +33,13 @@ class CardDeck:
             shuffle: Whether to shuffle the deck.
         """
 
-        self.cards = []
-        for suit in self.CARD_SUITS:
-            for rank in self.CARD_RANKS:
-                self.cards.append(f'{rank}{suit}')
+        self.cards = list(range(52))
 
         if shuffle:
             random.shuffle(self.cards)
 
 
-    def deal_cards(self, number_of_cards: int) -> list[str]:
+    def deal_cards(self, number_of_cards: int) -> list[Card]:
         """
         Deal a number of cards from the deck.
 
@@ -47,14 +58,71 @@ class CardDeck:
 
 
     @staticmethod
-    def unpack_card(card: str) -> tuple[int, str, int]:
+    def card_to_str(card: Card) -> str:
+        """
+        Convert a card to rank-suit format.
+
+        ------
+
+        Arguments:
+            card: The card to convert.
+
+        ------
+
+        Returns:
+            The card in rank-suit format.
+        """
+
+        return CardDeck.CARD_NAMES[card]
+
+
+    @staticmethod
+    def card_from_str(card: str) -> Card:
+        """
+        Convert a card from rank-suit format.
+
+        ------
+
+        Arguments:
+            card: The card in rank-suit format.
+
+        ------
+
+        Returns:
+            The card.
+        """
+
+        return CardDeck.CARD_SUITS.index(card[1]) * 13 + CardDeck.CARD_RANKS.index(card[0])
+
+
+    @staticmethod
+    def parse_card(card: Card | str) -> Card:
+        """
+        Convert a card that may be in rank-suit format (e.g. loaded from an older dataset).
+
+        ------
+
+        Arguments:
+            card: The card, or the card in rank-suit format.
+
+        ------
+
+        Returns:
+            The card.
+        """
+
+        return CardDeck.card_from_str(card) if isinstance(card, str) else card
+
+
+    @staticmethod
+    def unpack_card(card: Card) -> tuple[int, str, int]:
         """
         Get elements of the given card.
 
         ------
 
         Arguments:
-            card: The card to unpack in rank-suit format.
+            card: The card to unpack.
 
         ------
 
@@ -62,18 +130,18 @@ class CardDeck:
             The rank (1-13), suit (emoji) and worth (1-10) of the card.
         """
 
-        return CardDeck.get_card_rank(card), CardDeck.get_card_suit(card), CardDeck.get_card_worth(card)
+        return CardDeck.RANK_LOOKUP[card], CardDeck.get_card_suit(card), CardDeck.WORTH_LOOKUP[card]
 
 
     @staticmethod
-    def get_card_worth(card: str) -> int:
+    def get_card_worth(card: Card) -> int:
         """
         Get the given card's worth.
 
         ------
 
         Arguments:
-             card: The card in rank-suit format.
+             card: The card.
 
         ------
 
@@ -81,19 +149,18 @@ class CardDeck:
             The worth of the given card.
         """
 
-        rank = CardDeck.get_card_rank(card)
-        return rank if rank < 11 else 10
+        return CardDeck.WORTH_LOOKUP[card]
 
 
     @staticmethod
-    def get_card_rank(card: str) -> int:
+    def get_card_rank(card: Card) -> int:
         """
         Get the given card's rank.
 
         ------
 
         Arguments:
-             card: The card in rank-suit format.
+             card: The card.
 
         ------
 
@@ -101,18 +168,18 @@ class CardDeck:
             The rank of the given card.
         """
 
-        return CardDeck.CARD_RANKS.index(card[0]) + 1
+        return CardDeck.RANK_LOOKUP[card]
 
 
     @staticmethod
-    def get_card_suit(card: str) -> str:
+    def get_card_suit(card: Card) -> str:
         """
         Get the given card's suit as an emoji.
 
         ------
 
         Arguments:
-             card: The card in rank-suit format.
+             card: The card.
 
         ------
 
@@ -120,7 +187,7 @@ class CardDeck:
             The card's suit as an emoji.
         """
 
-        return CardDeck.CARD_EMOJIS[CardDeck.CARD_SUITS.index(card[1])]
+        return CardDeck.CARD_EMOJIS[CardDeck.SUIT_LOOKUP[card]]
 
 
-__all__ = ["CardDeck"]
+__all__ = ["CardDeck", "Card"]
@@ -0,0 +1,145 @@
+import itertools
+import os
+
+import numpy as np
+
+from utils.helpers import Card, ScoreTable
+
+
+class CribTable:
+    """
+    Precomputed expected crib score of every two-card discard, memory-mapped from disk.
+
+    Only the ranks of the discarded cards and whether they share a suit matter, so the expected value is stored
+    by dealer (0 for the pone, 1 for the dealer), rank (0-12) of each card and suitedness (0 or 1). The values
+    average the crib score over every starter card and opponent discard from the other 50 cards, with his heels
+    included like in the crib score table, and count against the pone.
+    """
+
+    TABLES_DIR = 'precomputed/crib_table'
+
+    _crib_ev: np.ndarray = None
+
+
+    @classmethod
+    def _compute_crib_ev(cls) -> np.ndarray:
+        """
+        Compute the expected crib score of every discard from the crib score table.
+
+        ------
+
+        Returns:
+            The table of expected crib scores (2 x 13 x 13 x 2). Suited pairs of the same rank are NaN.
+        """
+
+        crib_scores = ScoreTable.crib_scores()
+        crib_ev = np.full((2, 13, 13, 2), np.nan)
+
+        for rank1, rank2 in itertools.combinations_with_replacement(range(13), 2):
+            for suited in ((False, True) if rank1 != rank2 else (False,)):
+                discard = [rank1, rank2 if suited else 13 + rank2]
+
+                deck = np.array([card for card in range(52) if card not in discard], dtype = np.intp)
+                opp_discards = np.array(list(itertools.combinations(deck, 2)), dtype = np.intp)
+                cribs = np.concatenate([np.broadcast_to(discard, opp_discards.shape), opp_discards], axis = 1)
+
+                # Every crib with every starter card that is not part of the opponent discard.
+                scores = crib_scores[ScoreTable.get_combo_indexes(cribs)[:, None] * 52 + deck[None, :]]
+                is_starter = (opp_discards[:, :, None] != deck[None, None, :]).all(axis = 1)
+                expected_score = scores[is_starter].mean(dtype = np.float64)
+
+                for r1, r2 in ((rank1, rank2), (rank2, rank1)):
+                    crib_ev[:, r1, r2, int(suited)] = -expected_score, expected_score
+
+        return crib_ev
+
+
+    @classmethod
+    def build(cls, tables_dir: str = TABLES_DIR) -> None:
+        """
+        Generate the expected crib score table and save it to disk.
+
+        ------
+
+        Arguments:
+            tables_dir: The directory to save the table in.
+        """
+
+        os.makedirs(tables_dir, exist_ok = True)
+
+        # Write to a temporary file first so that concurrent readers never see a partial table.
+        tmp_path = os.path.join(tables_dir, f'crib_ev.{os.getpid()}.tmp.npy')
+        np.save(tmp_path, cls._compute_crib_ev())
+        os.replace(tmp_path, os.path.join(tables_dir, 'crib_ev.npy'))
+
+
+    @classmethod
+    def load(cls, tables_dir: str = TABLES_DIR) -> None:
+        """
+        Memory-map the expected crib score table from disk, generating it first if it does not exist.
+
+        ------
+
+        Arguments:
+            tables_dir: The directory to load the table from.
+        """
+
+        if cls._crib_ev is not None:
+            return
+
+        path = os.path.join(tables_dir, 'crib_ev.npy')
+        if not os.path.exists(path):
+            print(f'[ CRIB TABLE ] : Generating the crib table at "{tables_dir}"...')
+            cls.build(tables_dir)
+
+        cls._crib_ev = np.load(path, mmap_mode = 'r')
+
+
+    @classmethod
+    def crib_ev(cls, card1: Card, card2: Card, is_dealer: bool) -> float:
+        """
+        Get the expected crib value of a discard.
+
+        ------
+
+        Arguments:
+            card1: The first discarded card.
+            card2: The second discarded card.
+            is_dealer: Whether the discarding player is the dealer (whose crib it is).
+
+        ------
+
+        Returns:
+            The expected crib score, positive for the dealer and negative for the pone.
+        """
+
+        cls.load()
+        return float(cls._crib_ev[int(is_dealer), card1 % 13, card2 % 13, int(card1 // 13 == card2 // 13)])
+
+
+    @classmethod
+    def crib_evs(cls, discards: np.ndarray, is_dealer: np.ndarray) -> np.ndarray:
+        """
+        Get the expected crib values of many discards at once.
+
+        ------
+
+        Arguments:
+            discards: The discarded cards, with the 2 cards of each discard along the last axis.
+            is_dealer: Whether the discarding player is the dealer, broadcastable to the discards
+                       (without their last axis).
+
+        ------
+
+        Returns:
+            The expected crib scores, positive for the dealer and negative for the pone.
+        """
+
+        cls.load()
+        discards = np.asarray(discards)
+        card1, card2 = discards[..., 0], discards[..., 1]
+        return cls._crib_ev[np.asarray(is_dealer, dtype = np.intp), card1 % 13, card2 % 13,
+                            (card1 // 13 == card2 // 13).astype(np.intp)]
+
+
+__all__ = ['CribTable']
@@ -0,0 +1,199 @@
+import itertools
+from collections import OrderedDict
+
+from utils.helpers import Card, DiscardEvaluator, DiscardStats, DiscardTable, SuitCanonicalizer
+
+
+class DiscardCache:
+    """
+    Bounded LRU cache of discard decisions, in front of DiscardEvaluator.
+
+    Hands that only differ by a renaming of the suits score the same, so they share one entry under their
+    canonical key (see SuitCanonicalizer) and the dealer flag. Each entry is solved on the sorted canonical hand
+    and mapped back to the cards of the live hand, so cached decisions are the same as uncached ones.
+
+    The cache and its counters belong to the process: every Pool worker has its own, and sends its counters
+    back to the main process with pop_counters.
+    """
+
+    MAX_SIZE = 4096
+
+    max_size: int = MAX_SIZE
+    hits: int = 0
+    misses: int = 0
+    _entries: OrderedDict = OrderedDict()
+
+
+    @classmethod
+    def configure(cls, max_size: int = MAX_SIZE) -> None:
+        """
+        Set the maximum number of cached hands, evicting the least recently used ones if needed.
+
+        ------
+
+        Arguments:
+            max_size: The maximum number of cached hands, 0 to disable the cache.
+        """
+
+        cls.max_size = max(max_size, 0)
+        while len(cls._entries) > cls.max_size:
+            cls._entries.popitem(last = False)
+
+
+    @classmethod
+    def clear(cls) -> None:
+        """ Remove every cached hand and reset the counters. """
+
+        cls._entries.clear()
+        cls.hits, cls.misses = 0, 0
+
+
+    @classmethod
+    def get_counters(cls) -> dict[str, int]:
+        """
+        Get the counters of the cache.
+
+        ------
+
+        Returns:
+            A dictionary with the number of hits, misses and cached hands.
+        """
+
+        return {'hits' : cls.hits, 'misses' : cls.misses, 'size' : len(cls._entries)}
+
+
+    @classmethod
+    def pop_counters(cls) -> dict[str, int]:
+        """
+        Get the hit and miss counters of the cache and reset them, so that a worker can send them with each result.
+
+        ------
+
+        Returns:
+            A dictionary with the number of hits and misses since the last call.
+        """
+
+        counters = {'hits' : cls.hits, 'misses' : cls.misses}
+        cls.hits, cls.misses = 0, 0
+
+        return counters
+
+
+    @classmethod
+    def _get_entry(cls, hand: list[Card], is_dealer: bool) -> tuple[dict[str, ...], list[Card], list[int]]:
+        """
+        Get the cache entry of a hand, adding an empty one (and evicting the least recently used) if needed.
+
+        ------
+
+        Arguments:
+            hand: List of 6 cards.
+            is_dealer: Whether the hand belongs to the dealer.
+
+        ------
+
+        Returns:
+            The entry, the sorted canonical hand and the index of each discard of the hand
+            among the discards of the canonical hand.
+        """
+
+        key, suit_map = SuitCanonicalizer.get_hand_key(hand)
+        pair_idxs = DiscardTable.get_pair_indexes(hand, suit_map)
+        canonical_hand = SuitCanonicalizer.hand_from_key(key)
+
+        entry = cls._entries.get((key, is_dealer))
+        if entry is None:
+            entry = {'stats' : None, 'best' : {}}
+            cls._entries[(key, is_dealer)] = entry
+            if len(cls._entries) > cls.max_size:
+                cls._entries.popitem(last = False)
+        else:
+            cls._entries.move_to_end((key, is_dealer))
+
+        return entry, canonical_hand, pair_idxs
+
+
+    @classmethod
+    def get_discard_stats(cls, hand: list[Card], is_dealer: bool, num_workers: int = 1) -> DiscardStats:
+        """
+        Get discard suggestions for a given hand, from the cache if possible.
+
+        ------
+
+        Arguments:
+            hand: List of 6 cards.
+            is_dealer: Whether the hand belongs to the dealer.
+            num_workers: The number of processes to split the discards across on a miss.
+
+        ------
+
+        Returns:
+            The same suggestions as DiscardEvaluator.get_discard_stats.
+        """
+
+        if cls.max_size == 0:
+            return DiscardEvaluator._solve_discard_stats(hand, is_dealer, num_workers)
+
+        entry, canonical_hand, pair_idxs = cls._get_entry(hand, is_dealer)
+
+        if entry['stats'] is None:
+            cls.misses += 1
+            entry['stats'] = DiscardEvaluator._solve_discard_stats(canonical_hand, is_dealer, num_workers)
+        else:
+            cls.hits += 1
+
+        return entry['stats'].reorder(list(itertools.combinations(hand, 2)), pair_idxs)
+
+
+    @classmethod
+    def get_best_discard(cls, hand: list[Card], is_dealer: bool, play_style: str = 'recommended',
+                         num_workers: int = 1) -> tuple[Card, Card]:
+        """
+        Get the best discard of a given hand for a single play style, from the cache if possible.
+
+        The discards that can be the best are cached for each play style, so that exact ties between
+        discards are broken in the order of the live hand, like without the cache.
+
+        ------
+
+        Arguments:
+            hand: List of 6 cards.
+            is_dealer: Whether the hand belongs to the dealer.
+            play_style: The play style to discard by.
+            num_workers: The number of processes to split the discards across on a miss.
+
+        ------
+
+        Returns:
+            The same discard as DiscardEvaluator.get_best_discard.
+        """
+
+        if cls.max_size == 0:
+            candidates = DiscardEvaluator._get_best_candidates(hand, is_dealer, play_style, num_workers)
+
+        else:
+            entry, canonical_hand, pair_idxs = cls._get_entry(hand, is_dealer)
+
+            if play_style in entry['best']:
+                cls.hits += 1
+            else:
+                cls.misses += 1
+                canonical_candidates = DiscardEvaluator._get_best_candidates(canonical_hand, is_dealer, play_style,
+                                                                             num_workers)
+                canonical_discards = list(itertools.combinations(canonical_hand, 2))
+                entry['best'][play_style] = {
+                    canonical_discards.index(discard) : value for discard, value in canonical_candidates.items()
+                }
+
+            best = entry['best'][play_style]
+            candidates = {discard : best[pair_idx]
+                          for discard, pair_idx in zip(itertools.combinations(hand, 2), pair_idxs)
+                          if pair_idx in best}
+
+        if len(candidates) == 1:
+            return next(iter(candidates))
+
+        return max(candidates, key = candidates.__getitem__)
+
+
+__all__ = ['DiscardCache']
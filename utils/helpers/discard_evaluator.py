@@ -1,66 +1,163 @@
+import atexit
 import itertools
+import time
+import warnings
+from collections.abc import Mapping
+from multiprocessing import current_process
+from multiprocessing.pool import Pool
+from statistics import NormalDist
 
-from utils.helpers import CardDeck, Scoring
+import numpy as np
+
+from utils.helpers import CardDeck, Card, ScoreTable
+
+
+def _get_discard_stats_chunk(args: tuple[np.ndarray, np.ndarray, str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get discard suggestions of one play style for a chunk of hands, in a worker process.
+
+    ------
+
+    Arguments:
+        args: The hands, their dealer flags and the play style.
+
+    ------
+
+    Returns:
+        The same arrays as DiscardEvaluator.get_discard_stats_many.
+    """
+
+    hands, is_dealer_flags, play_style = args
+    return DiscardEvaluator.get_discard_stats_many(hands, is_dealer_flags, play_style)
+
+
+def _get_discard_distributions_chunk(
+        args: tuple[list[Card], bool, list[tuple[Card, Card]]]) -> dict[tuple[Card, Card], dict[str, np.ndarray]]:
+    """
+    Calculate the outcome distributions of some of the discards of a hand, in a worker process.
+
+    ------
+
+    Arguments:
+        args: The hand, whether it belongs to the dealer and the discards to evaluate.
+
+    ------
+
+    Returns:
+        The same dictionary as DiscardEvaluator.get_discard_distributions.
+    """
+
+    hand, is_dealer, discards = args
+    return DiscardEvaluator.get_discard_distributions(hand, is_dealer, discards)
 
 
 class DiscardEvaluator:
     """ Helper for discarding cards based on statistical probability. """
 
-    _precomputed_scores: dict[int, int] = {}
-    _shift_key_by: dict[str, int] = {rank : 1 << (i * 3) for i, rank in enumerate(CardDeck.CARD_RANKS)}
+    DECK_SIZE = 52 - 6
+    NUM_OPP_DISCARDS = (DECK_SIZE - 1) * (DECK_SIZE - 2) // 2
+    NUM_OUTCOMES = DECK_SIZE * NUM_OPP_DISCARDS
+    HIGH_SCORE_PERCENTILE = 0.95
+    HISTOGRAM_STATS = ('avg', 'min', 'max', 'var', 'high')
+
+    # Outcomes range from the best possible crib of the opponent (with nothing in hand)
+    # to the best possible hand plus the best possible crib, 30 points each: 5-5-5-J with the last 5
+    # as the starter (his nobs included) and 5-5-5-5 with a Jack as the starter (his heels included).
+    MAX_HAND_SCORE = 30
+    MAX_CRIB_SCORE = 30
+    MIN_SCORE = -MAX_CRIB_SCORE
+    MAX_SCORE = MAX_HAND_SCORE + MAX_CRIB_SCORE
+    NUM_SCORES = MAX_SCORE - MIN_SCORE + 1
+    SCORE_VALUES = np.arange(MIN_SCORE, MAX_SCORE + 1, dtype = np.int64)
+    HAND_SCORE_VALUES = np.arange(MAX_HAND_SCORE + 1, dtype = np.int64)
+
+    # Opponent discards are grouped by their unordered pair of ranks (0-12), since only the ranks matter
+    # for the crib score apart from 5-card flushes.
+    RANK_PAIRS = np.array(list(itertools.combinations_with_replacement(range(13), 2)), dtype = np.intp)
+    RANK_PAIR_INDEXES = np.zeros((13, 13), dtype = np.intp)
+    RANK_PAIR_INDEXES[RANK_PAIRS[:, 0], RANK_PAIRS[:, 1]] = np.arange(len(RANK_PAIRS))
+    # Base-13 rank keys of every opponent rank pair with every starter rank (13 x 91). The discarded ranks
+    # are the two leading digits, so adding them completes the key of a crib.
+    OPP_RANK_KEYS = RANK_PAIRS[:, 0] * 13 ** 2 + RANK_PAIRS[:, 1] * 13 + np.arange(13)[:, None]
+    JACK = CardDeck.CARD_RANKS.index('J')
+
+    # The statistics each play style sorts the discards by, from best to worst.
+    # If there are multiple discards with the same value, the one with the best second statistic goes first.
+    PLAY_STYLES = {
+        # Recommended: The highest average when discarded, then the highest average hand score.
+        'recommended' : ('avg', 'hand'),
+        # Sure Bet: The highest minimum when discarded.
+        'sure_bet' : ('min', 'avg'),
+        # Risky Bet: The highest maximum when discarded.
+        'risky_bet' : ('max', 'avg'),
+        # Hail Mary: The best shot at a high score when discarded, where the high score is X points or more,
+        #            5% of the time.
+        'hail_mary' : ('high', 'avg'),
+        # Aggressive: The highest average hand score when discarded.
+        'aggressive' : ('hand', 'avg')
+    }
+
+    # Persistent worker pool for splitting a single hand's discards across processes.
+    _pool: Pool = None
+    _pool_size: int = 0
 
 
     @classmethod
-    def _get_cards_key(cls, cards: list[str]) -> int:
+    def _get_pool(cls, num_workers: int) -> Pool | None:
         """
-        Get a key for the precomputed scores dictionary based on the given cards.
+        Get the persistent worker pool, starting it (with the score tables mapped in every worker) if needed.
 
         ------
 
         Arguments:
-            cards: A list of cards in rank-suit format.
+            num_workers: The number of worker processes.
 
         ------
 
         Returns:
-            The dictionary key.
+            The worker pool, or None if the discards should be evaluated in this process.
         """
 
-        key = 0
-        for card in cards:
-            key += cls._shift_key_by[card[0]]
+        if num_workers <= 1:
+            return None
 
-        return key
+        # Pool workers are daemonic, so they cannot have worker processes of their own.
+        if current_process().daemon:
+            warnings.warn('DiscardEvaluator cannot start a worker pool inside a daemonic process (such as a Pool '
+                          'worker), the discards are evaluated in a single process.', RuntimeWarning, stacklevel = 3)
+            return None
 
+        if cls._pool_size != num_workers:
+            cls.close_pool()
 
-    @classmethod
-    def _precompute_scores(cls) -> None:
-        """ Precompute scores for all possible 5-card hand combinations, ignoring suits. """
+            ScoreTable.load()
+            cls._pool = Pool(processes = num_workers)
+            cls._pool_size = num_workers
+            atexit.register(cls.close_pool)
 
-        if cls._precomputed_scores:
-            return
+        return cls._pool
 
-        for combo in itertools.combinations_with_replacement(CardDeck.CARD_RANKS, 5):
-            if any(combo.count(card) > 4 for card in set(combo)):
-                continue
 
-            cards = list(combo)
-            cls._precomputed_scores[cls._get_cards_key(cards)] = \
-                Scoring.score_15(cards, 'hand')[0] + \
-                Scoring.score_run(cards, 'hand')[0] + \
-                Scoring.score_pair(cards, 'hand')[0]
+    @classmethod
+    def close_pool(cls) -> None:
+        """ Stop the persistent worker pool, if it is running. """
+
+        if cls._pool is not None:
+            cls._pool.terminate()
+            cls._pool.join()
+            cls._pool, cls._pool_size = None, 0
 
 
     @classmethod
-    def score_hand(cls, cards: list[str], starter_card: str) -> int:
+    def score_hand(cls, cards: list[Card], starter_card: Card) -> int:
         """
-        Calculate the score of a given hand and starter card using precomputed hand scores.
+        Calculate the score of a given hand and starter card using the precomputed hand score table.
 
         ------
 
         Arguments:
-             cards: List of 4 cards in rank-suit format.
-             starter_card: The starter card in rank-suit format.
+             cards: List of 4 cards.
+             starter_card: The starter card.
 
         ------
 
@@ -68,148 +165,1040 @@ class DiscardEvaluator:
             The hand's score.
         """
 
-        if not cls._precomputed_scores:
-            cls._precompute_scores()
+        return int(ScoreTable.hand_scores()[ScoreTable.get_combo_index(cards) * 52 + starter_card])
 
-        score_key = cls._get_cards_key(cards + [starter_card])
-        score = cls._precomputed_scores[score_key]
 
-        # Flush
-        if cards[0][1] == cards[1][1] == cards[2][1] == cards[3][1]:
-            score += 4
-            if starter_card[1] == cards[0][1]:
-                score += 1
+    @classmethod
+    def score_crib(cls, cards: list[Card], starter_card: Card) -> int:
+        """
+        Calculate the score of a given crib and starter card using the precomputed crib score table.
 
-        # His nobs
-        for card in cards:
-            if card[0] == 'J' and starter_card[1] == card[1]:
-                score += 2
-                break
+        ------
 
-        return score
+        Arguments:
+             cards: List of 4 cards.
+             starter_card: The starter card.
+
+        ------
+
+        Returns:
+            The crib's score.
+        """
+
+        return int(ScoreTable.crib_scores()[ScoreTable.get_combo_index(cards) * 52 + starter_card])
 
 
     @classmethod
-    def score_crib(cls, cards: list[str], starter_card: str) -> int:
+    def get_percentile(cls, histogram: np.ndarray, percentile: float) -> int:
         """
-        Calculate the score of a given crib and starter card using precomputed hand scores.
+        Get a percentile of the outcomes counted in a histogram.
 
         ------
 
         Arguments:
-             cards: List of 4 cards in rank-suit format.
-             starter_card: The starter card in rank-suit format.
+            histogram: The outcome counts of every score (from MIN_SCORE to MAX_SCORE).
+            percentile: The fraction of outcomes (0-1) that lie below the returned score.
 
         ------
 
         Returns:
-            The crib's score.
+            The score at the given position of the sorted outcomes.
+        """
+
+        cumulative_counts = np.cumsum(histogram)
+        outcome_idx = int(int(cumulative_counts[-1]) * percentile)
+        return cls.MIN_SCORE + int(np.searchsorted(cumulative_counts, outcome_idx, side = 'right'))
+
+
+    @classmethod
+    def get_histogram_stats(cls, histogram: np.ndarray) -> dict[str, float | int]:
+        """
+        Calculate the statistics of the outcomes counted in a histogram.
+
+        ------
+
+        Arguments:
+            histogram: The outcome counts of every score (from MIN_SCORE to MAX_SCORE).
+
+        ------
+
+        Returns:
+            A dictionary with the average, minimum, maximum, variance and high score of the outcomes.
+        """
+
+        return cls.get_histograms_stats(histogram[None, :])[0]
+
+
+    @classmethod
+    def get_histograms_stats(cls, histograms: np.ndarray,
+                             stats: tuple[str, ...] = HISTOGRAM_STATS) -> list[dict[str, float | int]]:
+        """
+        Calculate the statistics of the outcomes counted in many histograms at once.
+
+        ------
+
+        Arguments:
+            histograms: The outcome counts of every score (from MIN_SCORE to MAX_SCORE), one histogram per row.
+            stats: The statistics to calculate (all of them by default), the others are skipped.
+
+        ------
+
+        Returns:
+            A dictionary with the requested statistics of each histogram's outcomes, out of the average, minimum,
+            maximum, variance and high score.
+        """
+
+        scores = cls.SCORE_VALUES
+        cumulative_counts = np.cumsum(histograms, axis = 1)
+        columns = {}
+
+        # Python integers keep the sums exact and the averages identical to dividing the sums directly.
+        num_outcomes = cumulative_counts[:, -1].tolist()
+        if 'avg' in stats or 'var' in stats:
+            score_sums = (histograms @ scores).tolist()
+            if 'avg' in stats:
+                columns['avg'] = [score_sum / count for count, score_sum in zip(num_outcomes, score_sums)]
+            if 'var' in stats:
+                square_sums = (histograms @ (scores * scores)).tolist()
+                columns['var'] = [(count * square_sum - score_sum * score_sum) / count ** 2
+                                  for count, score_sum, square_sum in zip(num_outcomes, score_sums, square_sums)]
+
+        if 'min' in stats:
+            columns['min'] = (cls.MIN_SCORE + (cumulative_counts == 0).sum(axis = 1)).tolist()
+
+        if 'max' in stats:
+            columns['max'] = (cls.MIN_SCORE + (cumulative_counts < cumulative_counts[:, -1:]).sum(axis = 1)).tolist()
+
+        if 'high' in stats:
+            high_idxs = (cumulative_counts[:, -1] * cls.HIGH_SCORE_PERCENTILE).astype(np.int64)
+            columns['high'] = (cls.MIN_SCORE + (cumulative_counts <= high_idxs[:, None]).sum(axis = 1)).tolist()
+
+        columns = {stat : columns[stat] for stat in stats}
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+    @classmethod
+    def _get_shared_scores(cls, hand: list[Card], discards: list[tuple[Card, Card]]) -> dict[str, np.ndarray]:
+        """
+        Calculate the scores that the discards of a hand are built from, once for all of them.
+
+        The remaining deck and the opponent discards are the same for every discard of the hand, so they are only
+        counted once, by starter rank and opponent rank pair. The crib scores of all discards are looked up at once,
+        by adding the key of each discard's ranks to the shared keys of the opponent rank pairs and starter ranks.
+
+        ------
+
+        Arguments:
+            hand: List of 6 cards.
+            discards: The discards to score.
+
+        ------
+
+        Returns:
+            A dictionary with the remaining deck, the hand score of every discard with every starter card
+            (discards x 46), the number of opponent discards of every rank pair with every starter rank (13 x 91)
+            and the crib rank scores of every discard with every starter rank and opponent rank pair
+            (discards x 13 x 91), without flushes and his heels.
+        """
+
+        deck = CardDeck(shuffle = False)
+        deck = np.array([card for card in deck.cards if card not in hand], dtype = np.intp)
+        deck_ranks = deck % 13
+
+        remaining_hands = np.array([[card for card in hand if card not in discard] for discard in discards])
+        combo_idxs = ScoreTable.get_combo_indexes(remaining_hands)
+        hand_scores = ScoreTable.hand_scores()[combo_idxs[:, None] * 52 + deck].astype(np.int64)
+
+        # Number of opponent discards of each rank pair, for every starter rank (which leaves the deck).
+        # Ranks that are not in the deck get meaningless counts, since they are never a starter rank.
+        rank_counts = np.bincount(deck_ranks, minlength = 13)[None, :] - np.eye(13, dtype = np.int64)
+        low_counts = rank_counts[:, cls.RANK_PAIRS[:, 0]]
+        high_counts = rank_counts[:, cls.RANK_PAIRS[:, 1]]
+        pair_counts = np.where(cls.RANK_PAIRS[:, 0] == cls.RANK_PAIRS[:, 1],
+                               low_counts * (low_counts - 1) // 2, low_counts * high_counts)
+
+        disc_ranks = np.array(discards) % 13
+        disc_keys = disc_ranks[:, 0] * 13 ** 4 + disc_ranks[:, 1] * 13 ** 3
+        crib_scores = ScoreTable.rank_scores()[disc_keys[:, None, None] + cls.OPP_RANK_KEYS].astype(np.intp)
+
+        return {
+            'deck' : deck,
+            'hand_scores' : hand_scores,
+            'pair_counts' : pair_counts,
+            'crib_scores' : crib_scores
+        }
+
+
+    @classmethod
+    def get_discard_distributions(
+            cls, hand: list[Card], is_dealer: bool, discards: list[tuple[Card, Card]] = None, num_workers: int = 1
+    ) -> dict[tuple[Card, Card], dict[str, np.ndarray]]:
+        """
+        Calculate the outcome distribution of every possible discard for a given hand.
+
+        For each discard, every starter card and every opponent discard from the remaining deck is considered.
+        Opponent discards are counted by rank pair instead of being enumerated one by one: with a given starter,
+        every pair of the same ranks adds the same crib score, except for the pairs that complete a 5-card flush.
+        All discards are scored and counted at once, or split across num_workers processes.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             discards: The discards to evaluate (all 15 by default).
+             num_workers: The number of processes to split the discards across (see _get_pool).
+
+        ------
+
+        Returns:
+            A dictionary mapping each discard to the histogram of its outcomes (hand score plus or minus the crib
+            score, indexed by score - MIN_SCORE) and the histogram of its hand scores (indexed by score).
+        """
+
+        discards = list(itertools.combinations(hand, 2)) if discards is None else discards
+        num_discards = len(discards)
+
+        # The pool is sized by num_workers alone, so that it persists across calls with fewer discards to evaluate.
+        pool = cls._get_pool(num_workers)
+        if pool is not None and num_discards > 1:
+            chunk_size = -(-num_discards // min(cls._pool_size, num_discards))
+            chunks = [(hand, is_dealer, discards[start : start + chunk_size])
+                      for start in range(0, num_discards, chunk_size)]
+
+            chunk_distributions = pool.map(_get_discard_distributions_chunk, chunks)
+            return {discard : distributions for distributions_by_discard in chunk_distributions
+                    for discard, distributions in distributions_by_discard.items()}
+
+        shared = cls._get_shared_scores(hand, discards)
+
+        deck, hand_scores = shared['deck'], shared['hand_scores']
+        deck_ranks, deck_suits = deck % 13, deck // 13
+
+        # The histograms of all discards are counted with single flat bincounts, so a score out of range would
+        # silently land in the histogram of the next discard.
+        heels = np.where(np.arange(13) == cls.JACK, 2, 0)
+        max_crib_score = (shared['crib_scores'] + heels[:, None]).max()
+        if hand_scores.max() > cls.MAX_HAND_SCORE or max_crib_score > cls.MAX_CRIB_SCORE:
+            raise Exception(f'Scores of hand {hand} are out of the range of the discard histograms.')
+
+        # Crib score histograms of every discard with every starter rank (discards x 13 x 31),
+        # weighted by the number of opponent discards of each rank pair.
+        num_crib_bins = cls.MAX_CRIB_SCORE + 1
+        crib_offsets = np.arange(num_discards * 13).reshape(num_discards, 13) * num_crib_bins + heels
+        crib_histograms = np.bincount((shared['crib_scores'] + crib_offsets[:, :, None]).ravel(),
+                                      weights = np.tile(shared['pair_counts'].ravel(), num_discards),
+                                      minlength = num_discards * 13 * num_crib_bins)
+        crib_histograms = crib_histograms.reshape(num_discards, 13, num_crib_bins)
+
+        # Every starter card moves the crib histogram of its rank by the hand score, in one histogram per discard.
+        crib_values = np.arange(num_crib_bins) if is_dealer else -np.arange(num_crib_bins)
+        offsets = np.arange(num_discards)[:, None] * cls.NUM_SCORES - cls.MIN_SCORE
+        bins = (hand_scores + offsets)[:, :, None] + crib_values
+        outcomes = np.bincount(bins.ravel(), weights = crib_histograms[:, deck_ranks].ravel(),
+                               minlength = num_discards * cls.NUM_SCORES)
+        outcomes = np.rint(outcomes).astype(np.int64).reshape(num_discards, cls.NUM_SCORES)
+
+        hand_bins = hand_scores + (np.arange(num_discards) * (cls.MAX_HAND_SCORE + 1))[:, None]
+        hand_histograms = np.bincount(hand_bins.ravel(), minlength = num_discards * (cls.MAX_HAND_SCORE + 1))
+        hand_histograms = hand_histograms.reshape(num_discards, cls.MAX_HAND_SCORE + 1)
+
+        # 5-card flushes: when both discarded cards and the starter share a suit, the opponent discards
+        # of two more cards of that suit score 5 points more than the rest of their rank pair.
+        suit_flushes = {}
+        flush_discards = []
+        for disc_idx, (card1, card2) in enumerate(discards):
+            flush_suit = card1 // 13
+            if card2 // 13 != flush_suit:
+                continue
+
+            # The starters and opponent rank pairs of the flushes only depend on the suit.
+            if flush_suit not in suit_flushes:
+                suit_idxs = np.flatnonzero(deck_suits == flush_suit)
+                suit_pairs = np.array(list(itertools.combinations(suit_idxs, 2)), dtype = np.intp).reshape(-1, 2)
+                starter_idxs, pair_idxs = np.nonzero((suit_pairs[None, :, 0] != suit_idxs[:, None]) &
+                                                     (suit_pairs[None, :, 1] != suit_idxs[:, None]))
+
+                # The deck is sorted, so the cards of a suit pair are in ascending rank.
+                pair_classes = cls.RANK_PAIR_INDEXES[deck_ranks[suit_pairs[pair_idxs, 0]],
+                                                     deck_ranks[suit_pairs[pair_idxs, 1]]]
+                suit_flushes[flush_suit] = (suit_idxs[starter_idxs], pair_classes)
+
+            flush_discards.append((disc_idx, *suit_flushes[flush_suit]))
+
+        if flush_discards:
+            disc_idxs, starter_idxs, pair_classes = zip(*flush_discards)
+            disc_idxs = np.repeat(disc_idxs, [len(idxs) for idxs in starter_idxs])
+            starter_idxs, pair_classes = np.concatenate(starter_idxs), np.concatenate(pair_classes)
+            starter_ranks = deck_ranks[starter_idxs]
+
+            crib_scores = shared['crib_scores'][disc_idxs, starter_ranks, pair_classes] + heels[starter_ranks]
+            if is_dealer:
+                flush_bins = hand_scores[disc_idxs, starter_idxs] + crib_scores + offsets[disc_idxs, 0]
+            else:
+                flush_bins = hand_scores[disc_idxs, starter_idxs] - crib_scores + offsets[disc_idxs, 0]
+
+            flat_outcomes = outcomes.reshape(-1)
+            flat_outcomes -= np.bincount(flush_bins, minlength = flat_outcomes.size)
+            flat_outcomes += np.bincount(flush_bins + (5 if is_dealer else -5), minlength = flat_outcomes.size)
+
+        return {
+            discard : {'outcomes' : outcomes[disc_idx], 'hand' : hand_histograms[disc_idx]}
+            for disc_idx, discard in enumerate(discards)
+        }
+
+
+    @classmethod
+    def get_discard_scores(cls, hand: list[Card], is_dealer: bool, discards: list[tuple[Card, Card]] = None,
+                           num_workers: int = 1) -> dict[tuple[Card, Card], dict[str, float | int]]:
         """
+        Calculate the statistics of every possible discard for a given hand.
+
+        ------
 
-        if not cls._precomputed_scores:
-            cls._precompute_scores()
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             discards: The discards to evaluate (all 15 by default).
+             num_workers: The number of processes to split the discards across.
 
-        score_key = cls._get_cards_key(cards + [starter_card])
-        score = cls._precomputed_scores[score_key]
+        ------
+
+        Returns:
+            A dictionary mapping each discard to its average, minimum, maximum, variance, average hand and high score.
+        """
 
-        # Flush
-        if cards[0][1] == cards[1][1] == cards[2][1] == cards[3][1] == starter_card[1]:
-            score += 5
+        discard_distributions = cls.get_discard_distributions(hand, is_dealer, discards, num_workers)
+        outcomes = np.stack([distributions['outcomes'] for distributions in discard_distributions.values()])
+        hands = np.stack([distributions['hand'] for distributions in discard_distributions.values()])
 
-        # His heels
-        if starter_card[0] == 'J':
-            score += 2
+        discard_combos = dict(zip(discard_distributions, cls.get_histograms_stats(outcomes)))
+        for scores, hand_sum in zip(discard_combos.values(), (hands @ cls.HAND_SCORE_VALUES).tolist()):
+            scores['hand'] = hand_sum / cls.DECK_SIZE
 
-        return score
+        return discard_combos
 
 
     @classmethod
-    def get_discard_stats(cls, hand: list[str], is_dealer: bool) -> dict[str, list]:
+    def get_discard_stats(cls, hand: list[Card], is_dealer: bool, num_workers: int = 1) -> 'DiscardStats':
         """
-        Get discard suggestions for a given hand.
+        Get discard suggestions for a given hand, through the discard cache.
 
         ------
 
         Arguments:
-             hand: List of 6 cards in rank-suit format.
+             hand: List of 6 cards.
              is_dealer: Whether the hand belongs to the dealer.
+             num_workers: The number of processes to split the discards across.
 
         ------
 
         Returns:
             A dictionary of different discard suggestions, sorted from best to worst (by their criteria).
+            Each play style is only ranked when it is looked up.
         """
 
-        discard_combos = {}
-        deck = CardDeck(shuffle = False)
-        deck = [card for card in deck.cards if card not in hand]
-        for my_discard in itertools.combinations(hand, 2):
-            remaining_hand = [card for card in hand if card not in my_discard]
-
-            all_disc_scores = []
-            sum_disc_scores = 0
-            sum_hand_scores = 0
-            max_score = float('-inf')
-            min_score = float('inf')
-            for i, starter_card in enumerate(deck):
-
-                hand_score = cls.score_hand(remaining_hand, starter_card)
-                sum_hand_scores += hand_score
-
-                remaining_deck = deck[:i] + deck[i + 1:]
-                for opp_discard in itertools.combinations(remaining_deck, 2):
-                    crib_cards = list(my_discard + opp_discard)
-                    crib_score = cls.score_crib(crib_cards, starter_card)
-
-                    disc_score = hand_score + crib_score if is_dealer else hand_score - crib_score
-                    sum_disc_scores += disc_score
-                    if disc_score > max_score:
-                        max_score = disc_score
-                    if disc_score < min_score:
-                        min_score = disc_score
-                    all_disc_scores.append(disc_score)
-
-            avg_score = sum_disc_scores / len(all_disc_scores)
-            hand_score = sum_hand_scores / len(deck)
-            high_score = sorted(all_disc_scores)[int(len(all_disc_scores) * 0.95)]
-
-            discard_combos[my_discard] = {
-                'avg' : avg_score, 'min' : min_score, 'max' : max_score, 'hand' : hand_score, 'high' : high_score
-            }
-
-        # Recommended: Card pairs sorted by the highest average when discarded.
-        #              If there are multiple combinations with the same average, take the one with the
-        #              highest hand score.
-        recommended = [(cards, scores['avg']) for cards, scores in sorted(
-            discard_combos.items(), key = lambda item: (item[1]['avg'], item[1]['hand']), reverse = True)]
-
-        # For the following plays, if there are multiple combinations with the same value (min, max, ...),
-        # take the one with the highest average.
-
-        # Sure Bet: Card pairs sorted by the highest minimum when discarded.
-        sure_bet = [(cards, scores['min']) for cards, scores in sorted(
-            discard_combos.items(), key = lambda item: (item[1]['min'], item[1]['avg']), reverse = True)]
-
-        # Risky Bet: Card pairs sorted by the highest maximum when discarded.
-        risky_bet = [(cards, scores['max']) for cards, scores in sorted(
-            discard_combos.items(), key = lambda item: (item[1]['max'], item[1]['avg']), reverse = True)]
-
-        # Hail Mary: Card pairs sorted by their best shot at a high score when discarded.
-        #            Where the high score is X points or more, 5% of the time.
-        hail_mary = [(cards, scores['high']) for cards, scores in sorted(
-            discard_combos.items(), key = lambda item: (item[1]['high'], item[1]['avg']), reverse = True)]
-
-        # Aggressive: Card pairs sorted by the highest average hand score when discarded.
-        aggressive = [(cards, scores['hand']) for cards, scores in sorted(
-            discard_combos.items(), key = lambda item: (item[1]['hand'], item[1]['avg']), reverse = True)]
+        # Imported here since the discard cache is built on this class.
+        from utils.helpers.discard_cache import DiscardCache
+
+        return DiscardCache.get_discard_stats(hand, is_dealer, num_workers)
+
+
+    @classmethod
+    def _solve_discard_stats(cls, hand: list[Card], is_dealer: bool, num_workers: int = 1) -> 'DiscardStats':
+        """
+        Get discard suggestions for a given hand, without the discard cache.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             num_workers: The number of processes to split the discards across.
+
+        ------
+
+        Returns:
+            The same suggestions as get_discard_stats.
+        """
+
+        # Imported here since the discard table is built with this class.
+        from utils.helpers.discard_table import DiscardTable
+
+        # Use the pre-solved discard table when it has been built, otherwise solve the hand on the spot.
+        discard_combos = DiscardTable.get_discard_scores(hand, is_dealer)
+        if discard_combos is not None:
+            return DiscardStats.from_scores(discard_combos)
+
+        discard_distributions = cls.get_discard_distributions(hand, is_dealer, num_workers = num_workers)
+        outcomes = np.stack([distributions['outcomes'] for distributions in discard_distributions.values()])
+        hands = np.stack([distributions['hand'] for distributions in discard_distributions.values()])
+        hand_avgs = [hand_sum / cls.DECK_SIZE for hand_sum in (hands @ cls.HAND_SCORE_VALUES).tolist()]
+
+        return DiscardStats(list(discard_distributions), outcomes, {'hand' : hand_avgs})
+
+
+    @classmethod
+    def get_play_style_stats(cls, hand: list[Card], is_dealer: bool, play_style: str = 'recommended') -> list:
+        """
+        Get discard suggestions of one play style for a given hand.
+
+        Gives the same suggestions as the play style's entry of get_discard_stats, but only calculates
+        the statistics the play style sorts by. Play styles that only need the averages skip the outcome
+        distributions altogether.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             play_style: The play style to sort the discards by.
+
+        ------
+
+        Returns:
+            The discard suggestions with their values, sorted from best to worst.
+        """
+
+        return cls._get_play_style_discard_stats(hand, is_dealer, play_style)[play_style]
+
+
+    @classmethod
+    def _get_play_style_discard_stats(cls, hand: list[Card], is_dealer: bool, play_style: str) -> 'DiscardStats':
+        """
+        Get the discard suggestions of a given hand that are needed for one play style.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             play_style: The play style to sort the discards by.
+
+        ------
+
+        Returns:
+            Discard suggestions that can at least rank the discards by the given play style.
+        """
+
+        # Imported here since the discard table is built with this class.
+        from utils.helpers.discard_table import DiscardTable
+
+        primary, secondary = cls.PLAY_STYLES[play_style]
+        if not {primary, secondary} <= {'avg', 'hand'} or DiscardTable.load():
+            return cls.get_discard_stats(hand, is_dealer)
+
+        discards = list(itertools.combinations(hand, 2))
+        shared = cls._get_shared_scores(hand, discards)
+        disc_sums = cls._get_outcome_sums(shared, discards, is_dealer).tolist()
+        hand_sums = shared['hand_scores'].sum(axis = 1).tolist()
+
+        return DiscardStats(discards, columns = {
+            'avg' : [disc_sum / cls.NUM_OUTCOMES for disc_sum in disc_sums],
+            'hand' : [hand_sum / cls.DECK_SIZE for hand_sum in hand_sums]
+        })
+
+
+    @classmethod
+    def get_discard_stats_many(cls, hands: np.ndarray | list[list[Card]], is_dealer_flags: np.ndarray | list[bool],
+                               play_style: str = 'recommended', num_workers: int = 1,
+                               chunk_size: int = 256) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get discard suggestions of one play style for many hands at once.
+
+        With more than one worker, the hands are split into chunks that are solved by a pool of worker processes,
+        which share the score tables mapped in this process.
+
+        ------
+
+        Arguments:
+             hands: The hands, 6 cards each (hands x 6).
+             is_dealer_flags: Whether each hand belongs to the dealer.
+             play_style: The play style to sort the discards by.
+             num_workers: The number of worker processes (1 solves the hands in this process).
+             chunk_size: The number of hands solved by a worker at a time.
+
+        ------
+
+        Returns:
+            The index of each hand's discards among itertools.combinations of the hand, sorted from best to worst
+            (hands x 15), and the value of their play style statistic in the same order (hands x 15).
+        """
+
+        hands = np.asarray(hands, dtype = np.int8).reshape(-1, 6)
+        is_dealer_flags = np.asarray(is_dealer_flags, dtype = bool)
+
+        if num_workers > 1 and len(hands) > chunk_size:
+            chunks = [(hands[start : start + chunk_size], is_dealer_flags[start : start + chunk_size], play_style)
+                      for start in range(0, len(hands), chunk_size)]
+
+            ScoreTable.load()
+
+            with Pool(processes = num_workers) as pool:
+                results = pool.map(_get_discard_stats_chunk, chunks)
+
+            return np.concatenate([idxs for idxs, _ in results]), np.concatenate([values for _, values in results])
+
+        primary, _ = cls.PLAY_STYLES[play_style]
+        discard_idxs = np.empty((len(hands), 15), dtype = np.int8)
+        values = np.empty((len(hands), 15), dtype = np.float64)
+
+        for hand_idx, (hand, is_dealer) in enumerate(zip(hands.tolist(), is_dealer_flags.tolist())):
+            stats = cls._get_play_style_discard_stats(hand, is_dealer, play_style)
+            order = stats.get_order(play_style)
+            primaries = stats.get_stats(primary)[0]
+
+            discard_idxs[hand_idx] = order
+            values[hand_idx] = [primaries[idx] for idx in order]
+
+        return discard_idxs, values
+
+
+    @classmethod
+    def _get_outcome_sums(cls, shared: dict[str, np.ndarray], discards: list[tuple[Card, Card]],
+                          is_dealer: bool) -> np.ndarray:
+        """
+        Calculate the exact sum of the outcomes of every discard, without counting their distributions.
+
+        ------
+
+        Arguments:
+            shared: The shared scores of the hand, from _get_shared_scores.
+            discards: The discards the shared scores were calculated for.
+            is_dealer: Whether the hand belongs to the dealer.
+
+        ------
+
+        Returns:
+            The sum of the outcomes of each discard, over all NUM_OUTCOMES outcomes.
+        """
+
+        deck, hand_scores = shared['deck'], shared['hand_scores']
+        deck_ranks, deck_suits = deck % 13, deck // 13
+        starter_rank_counts = np.bincount(deck_ranks, minlength = 13)
+        disc_suits = np.array(discards) // 13
+
+        crib_sums = np.einsum('r,rp,drp->d', starter_rank_counts, shared['pair_counts'], shared['crib_scores'])
+        crib_sums += int(np.where(deck_ranks == cls.JACK, 2, 0).sum()) * cls.NUM_OPP_DISCARDS
+
+        # Every 3 cards of the suit of two suited discarded cards (a starter and an opponent discard) make a flush.
+        flush_sizes = np.bincount(deck_suits, minlength = 4)[disc_suits[:, 0]]
+        crib_sums += np.where(disc_suits[:, 0] == disc_suits[:, 1],
+                              5 * flush_sizes * ((flush_sizes - 1) * (flush_sizes - 2) // 2), 0)
+
+        hand_sums = hand_scores.sum(axis = 1) * cls.NUM_OPP_DISCARDS
+        return hand_sums + crib_sums if is_dealer else hand_sums - crib_sums
+
+
+    @classmethod
+    def _get_discard_bounds(cls, hand: list[Card], is_dealer: bool,
+                            play_style: str) -> tuple[list[tuple[Card, Card]], np.ndarray, np.ndarray]:
+        """
+        Calculate cheap lower and upper bounds of the main statistic of a play style, for every possible discard.
+
+        Only the ranks of the starter card are looked at for the crib, so each discard needs 13 x 91 crib scores
+        instead of 46 x 91. That is enough for the exact averages, given as sums over all outcomes so that they
+        compare exactly, while the other statistics are bounded by the lowest and highest crib of each starter.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             play_style: The play style whose main statistic is bounded.
+
+        ------
+
+        Returns:
+            The discards, with the lower and upper bounds of their statistic.
+        """
+
+        discards = list(itertools.combinations(hand, 2))
+        shared = cls._get_shared_scores(hand, discards)
+
+        deck, hand_scores = shared['deck'], shared['hand_scores']
+        deck_ranks, deck_suits = deck % 13, deck // 13
+
+        primary, _ = cls.PLAY_STYLES[play_style]
+        if primary == 'hand':
+            hand_sums = hand_scores.sum(axis = 1)
+            return discards, hand_sums, hand_sums
+
+        pair_counts, crib_scores = shared['pair_counts'], shared['crib_scores']
+        starter_rank_counts = np.bincount(deck_ranks, minlength = 13)
+        disc_suits = np.array(discards) // 13
+
+        # 5-card flushes need both discarded cards, the starter and two more cards of the opponent in one suit.
+        suit_sizes = np.bincount(deck_suits, minlength = 4)
+        is_suited = disc_suits[:, 0] == disc_suits[:, 1]
+        heels = np.where(deck_ranks == cls.JACK, 2, 0)
+
+        if primary == 'avg':
+            disc_sums = cls._get_outcome_sums(shared, discards, is_dealer)
+            return discards, disc_sums, disc_sums
+
+        # Lowest and highest outcome of each starter card, apart from the 5 extra points of a flush,
+        # which can only raise the crib.
+        has_pairs = pair_counts > 0
+        crib_low = np.where(has_pairs, crib_scores, np.iinfo(np.int64).max).min(axis = 2)[:, deck_ranks] + heels
+        crib_high = np.where(has_pairs, crib_scores, -1).max(axis = 2)[:, deck_ranks] + heels
+        flush = 5 * (is_suited[:, None] & (deck_suits == disc_suits[:, :1]) & (suit_sizes[deck_suits] >= 3))
+
+        if is_dealer:
+            starter_min, starter_max = hand_scores + crib_low, hand_scores + crib_high
+            min_bounds, max_bounds = (starter_min, starter_min + flush), (starter_max, starter_max + flush)
+        else:
+            starter_min, starter_max = hand_scores - crib_high, hand_scores - crib_low
+            min_bounds, max_bounds = (starter_min - flush, starter_min), (starter_max - flush, starter_max)
+
+        if primary == 'min':
+            return discards, min_bounds[0].min(axis = 1), min_bounds[1].min(axis = 1)
+
+        if primary == 'max':
+            return discards, max_bounds[0].max(axis = 1), max_bounds[1].max(axis = 1)
+
+        # The high score is bounded by the outcomes of every starter rank and opponent rank pair, taking
+        # the lowest (or highest) hand score among the starters of the rank and flushes wherever possible.
+        rank_hand_low = np.full((len(discards), 13), np.iinfo(np.int64).max)
+        rank_hand_high = np.full((len(discards), 13), -1)
+        np.minimum.at(rank_hand_low, (slice(None), deck_ranks), hand_scores)
+        np.maximum.at(rank_hand_high, (slice(None), deck_ranks), hand_scores)
+
+        rank_crib_scores = crib_scores + np.where(np.arange(13) == cls.JACK, 2, 0)[:, None]
+        rank_flush = 5 * is_suited[:, None, None]
+        if is_dealer:
+            outcome_low = rank_hand_low[:, :, None] + rank_crib_scores
+            outcome_high = rank_hand_high[:, :, None] + rank_crib_scores + rank_flush
+        else:
+            outcome_low = rank_hand_low[:, :, None] - rank_crib_scores - rank_flush
+            outcome_high = rank_hand_high[:, :, None] - rank_crib_scores
+
+        # Starter ranks that are not in the deck have no weight. The bounds are clipped to the range of
+        # possible outcomes and counted into one histogram per discard.
+        weights = np.tile((starter_rank_counts[:, None] * pair_counts).ravel(), len(discards))
+        offsets = (np.arange(len(discards)) * cls.NUM_SCORES - cls.MIN_SCORE)[:, None, None]
+        high_idx = int(cls.NUM_OUTCOMES * cls.HIGH_SCORE_PERCENTILE)
+
+        high_bounds = []
+        for outcomes in (outcome_low, outcome_high):
+            outcomes = np.clip(outcomes, cls.MIN_SCORE, cls.MAX_SCORE) + offsets
+            histograms = np.bincount(outcomes.ravel(), weights = weights, minlength = len(discards) * cls.NUM_SCORES)
+            cumulative_counts = np.cumsum(histograms.reshape(len(discards), cls.NUM_SCORES), axis = 1)
+            high_bounds.append(cls.MIN_SCORE + (cumulative_counts <= high_idx).sum(axis = 1))
+
+        return discards, high_bounds[0], high_bounds[1]
+
+
+    @classmethod
+    def _get_best_candidates(cls, hand: list[Card], is_dealer: bool, play_style: str, num_workers: int = 1
+                             ) -> dict[tuple[Card, Card], tuple[float | int, float | int] | None]:
+        """
+        Find the discards of a given hand that can be the best for a single play style.
+
+        Discards that provably cannot be the best are dropped by their bounds, and only the remaining ones
+        are evaluated exactly. Every dropped discard is strictly worse than the best one.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             play_style: The play style to discard by.
+             num_workers: The number of processes to split the remaining discards across.
+
+        ------
+
+        Returns:
+            A dictionary mapping the remaining discards (in the order of the hand) to their primary and secondary
+            statistics, which are None if only one discard remains.
+        """
+
+        # Imported here since the discard table is built with this class.
+        from utils.helpers.discard_table import DiscardTable
+
+        discard_combos = DiscardTable.get_discard_scores(hand, is_dealer)
+
+        if discard_combos is None:
+            discards, lower_bounds, upper_bounds = cls._get_discard_bounds(hand, is_dealer, play_style)
+            survivors = [discard for discard, upper_bound in zip(discards, upper_bounds)
+                         if upper_bound >= lower_bounds.max()]
+
+            if len(survivors) == 1:
+                return {survivors[0] : None}
+
+            discard_combos = cls.get_discard_scores(hand, is_dealer, survivors, num_workers)
+
+        primary, secondary = cls.PLAY_STYLES[play_style]
+        return {discard : (scores[primary], scores[secondary]) for discard, scores in discard_combos.items()}
+
+
+    @classmethod
+    def get_best_discard(cls, hand: list[Card], is_dealer: bool, play_style: str = 'recommended',
+                         num_workers: int = 1) -> tuple[Card, Card]:
+        """
+        Get the best discard of a given hand for a single play style.
+
+        Picks the same discard as the first suggestion of get_discard_stats, but only evaluates exactly
+        the discards that can be the best. Goes through the discard cache.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             play_style: The play style to discard by.
+             num_workers: The number of processes to split the discards across.
+
+        ------
+
+        Returns:
+            The best discard.
+        """
+
+        # Imported here since the discard cache is built on this class.
+        from utils.helpers.discard_cache import DiscardCache
+
+        return DiscardCache.get_best_discard(hand, is_dealer, play_style, num_workers)
+
+
+    @classmethod
+    def _get_sample_stats(cls, histogram: np.ndarray, z_score: float) -> dict[str, tuple[float, float, float]]:
+        """
+        Estimate the statistics of a discard from its sampled outcomes.
+
+        ------
+
+        Arguments:
+            histogram: The counts of the sampled outcomes of every score (from MIN_SCORE to MAX_SCORE).
+            z_score: The z-score of the confidence level.
+
+        ------
+
+        Returns:
+            A dictionary mapping the average, minimum, maximum, variance and high score
+            to their estimate and confidence interval, as (estimate, low, high).
+        """
+
+        num_samples = int(histogram.sum())
+        avg = float(histogram @ cls.SCORE_VALUES) / num_samples
+        deviations = cls.SCORE_VALUES - avg
+        var = float(histogram @ (deviations * deviations)) / (num_samples - 1) if num_samples > 1 else 0.0
+        avg_margin = z_score * (var / num_samples) ** 0.5
+
+        # Normal approximation of the sample variance, from the fourth central moment.
+        fourth_moment = float(histogram @ deviations ** 4) / num_samples
+        var_margin = z_score * (max(fourth_moment - var * var, 0.0) / num_samples) ** 0.5
+
+        # The outcome at each position of the sorted samples, read from the cumulative counts.
+        cumulative_counts = np.cumsum(histogram)
+        sorted_idxs = [0, num_samples - 1]
+
+        # Confidence interval of a percentile from the positions of the order statistics around it.
+        percentile = cls.HIGH_SCORE_PERCENTILE
+        rank_margin = z_score * (num_samples * percentile * (1 - percentile)) ** 0.5
+        sorted_idxs.append(int(num_samples * percentile))
+        sorted_idxs.append(max(int(num_samples * percentile - rank_margin), 0))
+        sorted_idxs.append(min(int(np.ceil(num_samples * percentile + rank_margin)), num_samples - 1))
+
+        min_score, max_score, high, high_low, high_high = (
+            cls.MIN_SCORE + np.searchsorted(cumulative_counts, sorted_idxs, side = 'right')).tolist()
 
         return {
-            'recommended' : recommended,
-            'sure_bet' : sure_bet,
-            'risky_bet' : risky_bet,
-            'hail_mary' : hail_mary,
-            'aggressive' : aggressive
+            'avg' : (avg, avg - avg_margin, avg + avg_margin),
+            'min' : (min_score, cls.MIN_SCORE, min_score),
+            'max' : (max_score, max_score, cls.MAX_SCORE),
+            'var' : (var, max(var - var_margin, 0.0), var + var_margin),
+            'high' : (high, high_low, high_high)
         }
 
 
-__all__ = ['DiscardEvaluator']
+    @classmethod
+    def sample_discard_scores(cls, hand: list[Card], is_dealer: bool, play_style: str = 'recommended',
+                              confidence: float = 0.95, time_budget: float | None = None, batch_size: int = 1000,
+                              max_samples: int = 50_000, rng: np.random.Generator = None
+                              ) -> dict[tuple[Card, Card], dict[str, tuple[float, float, float]]]:
+        """
+        Estimate the statistics of every possible discard for a given hand from randomly sampled outcomes.
+
+        Each sample is a starter card and an opponent discard from the remaining deck, shared by all discards
+        so that their differences are measured on the same outcomes. Sampling stops once the best discard of
+        the play style is separated from the runner-up at the given confidence level, once the time budget
+        runs out or after max_samples samples.
+
+        Average hand scores only need the starter card, so they are always exact.
+        The minimum and maximum are bounded on one side by the observed outcomes only, so they can never
+        separate two discards. Play styles ranked by them (sure_bet and risky_bet) get the exact statistics
+        instead, as intervals of a single value.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             play_style: The play style whose best discard decides when to stop.
+             confidence: The confidence level of the intervals (0-1).
+             time_budget: The maximum time to sample for in seconds, or None for no time limit.
+             batch_size: The number of samples drawn at once.
+             max_samples: The maximum number of samples.
+             rng: The random generator to sample with.
+
+        ------
+
+        Returns:
+            A dictionary mapping each discard to its average, minimum, maximum, variance, average hand and high score,
+            each given as (estimate, low, high) of its confidence interval.
+        """
+
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        rng = np.random.default_rng() if rng is None else rng
+        z_score = NormalDist().inv_cdf((1 + confidence) / 2)
+        primary, secondary = cls.PLAY_STYLES[play_style]
+
+        if primary in ('min', 'max'):
+            return {discard : {stat : (value, value, value) for stat, value in scores.items()}
+                    for discard, scores in cls.get_discard_scores(hand, is_dealer).items()}
+
+        deck = CardDeck(shuffle = False)
+        deck = np.array([card for card in deck.cards if card not in hand], dtype = np.intp)
+
+        discards = list(itertools.combinations(hand, 2))
+        remaining_hands = np.array([[card for card in hand if card not in discard] for discard in discards])
+        combo_idxs = ScoreTable.get_combo_indexes(remaining_hands)
+        hand_scores = ScoreTable.hand_scores()[combo_idxs[:, None] * 52 + deck].astype(np.int16)
+        hand_avgs = hand_scores.sum(axis = 1) / cls.DECK_SIZE
+        crib_table = ScoreTable.crib_scores()
+
+        discarded_cards = np.array(discards, dtype = np.intp)[:, None, :]
+        sign = 1 if is_dealer else -1
+
+        # Running counts of the outcomes of every discard and sums of the products of every pair of discards,
+        # so that each batch only adds to them instead of the statistics being recomputed from every sample.
+        histogram_offsets = np.arange(len(discards))[:, None] * cls.NUM_SCORES - cls.MIN_SCORE
+        histograms = np.zeros((len(discards), cls.NUM_SCORES), dtype = np.int64)
+        product_sums = np.zeros((len(discards), len(discards)))
+
+        num_samples = 0
+        while True:
+            # Three different cards of the deck: the starter and the opponent discard.
+            starter_idxs = rng.integers(cls.DECK_SIZE, size = batch_size)
+            opp_idxs1 = rng.integers(cls.DECK_SIZE - 1, size = batch_size)
+            opp_idxs1 += opp_idxs1 >= starter_idxs
+            opp_idxs2 = rng.integers(cls.DECK_SIZE - 2, size = batch_size)
+            opp_idxs2 += opp_idxs2 >= np.minimum(starter_idxs, opp_idxs1)
+            opp_idxs2 += opp_idxs2 >= np.maximum(starter_idxs, opp_idxs1)
+
+            opp_cards = np.stack([deck[opp_idxs1], deck[opp_idxs2]], axis = 1)
+            cribs = np.concatenate(np.broadcast_arrays(discarded_cards, opp_cards[None, :, :]), axis = 2)
+            crib_scores = crib_table[ScoreTable.get_combo_indexes(cribs) * 52 + deck[starter_idxs]].astype(np.int16)
+
+            outcomes = (hand_scores[:, starter_idxs] + sign * crib_scores).astype(np.int64)
+            histograms += np.bincount((outcomes + histogram_offsets).ravel(),
+                                      minlength = histograms.size).reshape(histograms.shape)
+            # Float products are exact for these sums and much faster than integer ones.
+            product_sums += outcomes.astype(np.float64) @ outcomes.T.astype(np.float64)
+            num_samples += batch_size
+
+            discard_combos = {}
+            for discard, histogram, hand_avg in zip(discards, histograms, hand_avgs):
+                discard_combos[discard] = cls._get_sample_stats(histogram, z_score)
+                discard_combos[discard]['hand'] = (float(hand_avg), float(hand_avg), float(hand_avg))
+
+            if num_samples >= max_samples or (deadline is not None and time.perf_counter() >= deadline):
+                return discard_combos
+
+            # Separation of the best discard from the runner-up.
+            ranking = sorted(range(len(discards)), reverse = True, key = lambda idx: (
+                discard_combos[discards[idx]][primary][0], discard_combos[discards[idx]][secondary][0]))
+            best_idx, runner_up_idx = ranking[0], ranking[1]
+            best, runner_up = discard_combos[discards[best_idx]], discard_combos[discards[runner_up_idx]]
+
+            if primary == 'hand' and best['hand'][0] > runner_up['hand'][0]:
+                return discard_combos
+
+            if primary in ('avg', 'hand'):
+                # Both discards are measured on the same samples, so their difference is tested directly.
+                sums = histograms[[best_idx, runner_up_idx]] @ cls.SCORE_VALUES
+                difference_avg = float(sums[0] - sums[1]) / num_samples
+                pair_sums = product_sums[np.ix_([best_idx, runner_up_idx], [best_idx, runner_up_idx])]
+                difference_square_sum = float(pair_sums[0, 0] + pair_sums[1, 1] - 2 * pair_sums[0, 1])
+                difference_var = max(difference_square_sum - num_samples * difference_avg ** 2, 0.0) / (num_samples - 1)
+                margin = z_score * (difference_var / num_samples) ** 0.5
+                if difference_avg - margin > 0:
+                    return discard_combos
+
+            elif best[primary][1] > runner_up[primary][2]:
+                return discard_combos
+
+    @classmethod
+    def sample_discard_stats(cls, hand: list[Card], is_dealer: bool, play_style: str = 'recommended',
+                             confidence: float = 0.95, time_budget: float | None = None) -> list:
+        """
+        Get discard suggestions of one play style for a given hand, estimated by sampling.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+             play_style: The play style to sort the discards by.
+             confidence: The confidence level at which the best discard has to be separated from the runner-up.
+             time_budget: The maximum time to sample for in seconds, or None for no time limit.
+
+        ------
+
+        Returns:
+            The discard suggestions with their estimated values, sorted from best to worst,
+            like the play style's entry of get_discard_stats.
+        """
+
+        discard_combos = cls.sample_discard_scores(hand, is_dealer, play_style, confidence, time_budget)
+        primary, secondary = cls.PLAY_STYLES[play_style]
+
+        return [(cards, scores[primary][0]) for cards, scores in sorted(
+            discard_combos.items(), key = lambda item: (item[1][primary][0], item[1][secondary][0]), reverse = True)]
+
+
+class DiscardStats(Mapping):
+    """
+    Discard suggestions of a hand, mapping each play style to its discards sorted from best to worst.
+
+    The statistics of the discards are only calculated from their outcome histograms when a play style that sorts
+    by them is looked up, and each play style is only ranked once, on its first lookup.
+    """
+
+    def __init__(self, discards: list[tuple[Card, Card]], histograms: np.ndarray = None,
+                 columns: dict[str, list[float | int]] = None,
+                 source: tuple['DiscardStats', list[int]] = None) -> None:
+        """
+        Create a new DiscardStats instance.
+
+        ------
+
+        Arguments:
+            discards: The discards of the hand.
+            histograms: The outcome histogram of each discard, for the statistics that are not given.
+            columns: The already known statistics, mapped to their value for each discard.
+            source: Another instance to take the statistics from instead of the histograms,
+                    with the index of each discard among its discards.
+        """
+
+        self.discards = discards
+        self._histograms = histograms
+        self._columns = {} if columns is None else dict(columns)
+        self._source = source
+        self._orders = {}
+
+
+    @classmethod
+    def from_scores(cls, discard_combos: dict[tuple[Card, Card], dict[str, float | int]]) -> 'DiscardStats':
+        """
+        Create a new DiscardStats instance from the statistics of every discard.
+
+        ------
+
+        Arguments:
+            discard_combos: A dictionary mapping each discard to its statistics, as given by get_discard_scores.
+
+        ------
+
+        Returns:
+            The DiscardStats instance.
+        """
+
+        stats = next(iter(discard_combos.values()))
+        return cls(list(discard_combos), columns = {
+            stat : [scores[stat] for scores in discard_combos.values()] for stat in stats
+        })
+
+
+    def reorder(self, discards: list[tuple[Card, Card]], idxs: list[int]) -> 'DiscardStats':
+        """
+        Create a view of the suggestions for other discards with the same statistics, such as the discards
+        of a hand that only differs by a renaming of the suits.
+
+        The statistics are shared with this instance, so they are only ever calculated once,
+        while the play styles are ranked in the order of the new discards.
+
+        ------
+
+        Arguments:
+            discards: The new discards.
+            idxs: The index of each new discard among the discards of this instance.
+
+        ------
+
+        Returns:
+            The new DiscardStats instance.
+        """
+
+        return DiscardStats(discards, source = (self, idxs))
+
+
+    def get_stats(self, *stats: str) -> list[list[float | int]]:
+        """
+        Get statistics of every discard, calculating the missing ones on first use.
+
+        ------
+
+        Arguments:
+            stats: The names of the statistics.
+
+        ------
+
+        Returns:
+            The values of each statistic for every discard, in the order of the discards.
+        """
+
+        missing_stats = tuple(stat for stat in dict.fromkeys(stats) if stat not in self._columns)
+        if missing_stats and self._source is not None:
+            source, idxs = self._source
+            for stat, values in zip(missing_stats, source.get_stats(*missing_stats)):
+                self._columns[stat] = [values[idx] for idx in idxs]
+
+        elif missing_stats:
+            discard_scores = DiscardEvaluator.get_histograms_stats(self._histograms, missing_stats)
+            for stat in missing_stats:
+                self._columns[stat] = [scores[stat] for scores in discard_scores]
+
+        return [self._columns[stat] for stat in stats]
+
+
+    def get_order(self, play_style: str) -> list[int]:
+        """
+        Get the ranking of the discards by a play style, ranking them on first use.
+
+        ------
+
+        Arguments:
+            play_style: The play style to sort the discards by.
+
+        ------
+
+        Returns:
+            The indexes of the discards, sorted from best to worst.
+        """
+
+        if play_style not in self._orders:
+            primary, secondary = DiscardEvaluator.PLAY_STYLES[play_style]
+            primaries, secondaries = self.get_stats(primary, secondary)
+
+            self._orders[play_style] = sorted(range(len(self.discards)), reverse = True,
+                                              key = lambda idx: (primaries[idx], secondaries[idx]))
+
+        return self._orders[play_style]
+
+
+    def __getitem__(self, play_style: str) -> list:
+        primaries = self.get_stats(DiscardEvaluator.PLAY_STYLES[play_style][0])[0]
+        return [(self.discards[idx], primaries[idx]) for idx in self.get_order(play_style)]
+
+
+    def __iter__(self):
+        return iter(DiscardEvaluator.PLAY_STYLES)
+
+
+    def __len__(self) -> int:
+        return len(DiscardEvaluator.PLAY_STYLES)
+
+
+__all__ = ['DiscardEvaluator', 'DiscardStats']
@@ -0,0 +1,288 @@
+import bisect
+import itertools
+import os
+import warnings
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+
+from utils.helpers import Card, DiscardEvaluator, ScoreTable, SuitCanonicalizer
+
+
+def _solve_hands(keys: np.ndarray) -> np.ndarray:
+    """
+    Solve the discard statistics of a chunk of canonical hands.
+
+    ------
+
+    Arguments:
+        keys: The canonical keys of the hands.
+
+    ------
+
+    Returns:
+        The table records of the hands, in the same order as the keys.
+    """
+
+    records = np.zeros(len(keys), dtype = DiscardTable.RECORD_DTYPE)
+
+    for record, key in zip(records, keys):
+        hand = SuitCanonicalizer.hand_from_key(int(key))
+
+        for dealer_idx, is_dealer in enumerate((False, True)):
+            discard_distributions = DiscardEvaluator.get_discard_distributions(hand, is_dealer)
+
+            for pair_idx, distributions in enumerate(discard_distributions.values()):
+                outcomes = distributions['outcomes']
+                scores = DiscardEvaluator.get_histogram_stats(outcomes)
+                score_values = DiscardEvaluator.SCORE_VALUES
+
+                record['disc_sum'][dealer_idx, pair_idx] = int(outcomes @ score_values)
+                record['disc_square_sum'][dealer_idx, pair_idx] = int(outcomes @ (score_values * score_values))
+                record['min'][dealer_idx, pair_idx] = scores['min']
+                record['max'][dealer_idx, pair_idx] = scores['max']
+                record['high'][dealer_idx, pair_idx] = scores['high']
+                record['hand_sum'][pair_idx] = int(distributions['hand'] @ DiscardEvaluator.HAND_SCORE_VALUES)
+
+    return records
+
+
+class DiscardTable:
+    """
+    Pre-solved discard statistics for every 6-card hand up to suit isomorphism, memory-mapped from disk.
+
+    Hands that only differ by a renaming of the suits score the same, so each hand is stored once under its
+    canonical key (see SuitCanonicalizer.get_hand_key): the rank bitmasks of its 4 suits, sorted from highest
+    to lowest. The table keeps the raw statistics of all 15 discards for the pone and the dealer, so every play
+    style ranks the discards exactly like DiscardEvaluator does.
+    """
+
+    TABLES_DIR = 'precomputed/discard_table'
+    # Bumped whenever the stored statistics change, so that tables built by older code are never loaded.
+    # Version 2: hands that score 30 (5-5-5-J with his nobs) are counted in their own histogram bin.
+    VERSION = 2
+    HAND_SIZE = 6
+    NUM_STARTERS = 52 - HAND_SIZE
+    NUM_OUTCOMES = NUM_STARTERS * (NUM_STARTERS - 1) * (NUM_STARTERS - 2) // 2
+    CHUNK_SIZE = 256
+
+    # Statistics of the 15 discards of a hand, by dealer (0 for the pone, 1 for the dealer) and discard index.
+    RECORD_DTYPE = np.dtype([
+        ('disc_sum', '<i4', (2, 15)),
+        ('disc_square_sum', '<i4', (2, 15)),
+        ('hand_sum', '<i2', (15,)),
+        ('min', 'i1', (2, 15)),
+        ('max', 'i1', (2, 15)),
+        ('high', 'i1', (2, 15))
+    ])
+
+    # Index of each discard (pair of card positions) among the itertools.combinations of a sorted hand.
+    PAIR_INDEXES = {pair: n for n, pair in enumerate(itertools.combinations(range(HAND_SIZE), 2))}
+
+    _hand_keys: np.ndarray = None
+    _hand_stats: np.ndarray = None
+
+
+    @classmethod
+    def get_pair_indexes(cls, hand: list[Card], suit_map: list[int]) -> list[int]:
+        """
+        Get the index of each discard of a hand among the discards of its sorted canonical hand.
+
+        ------
+
+        Arguments:
+            hand: The cards of the hand.
+            suit_map: The canonical suit index of each of the hand's suits, from SuitCanonicalizer.get_hand_key.
+
+        ------
+
+        Returns:
+            The discard index of each discard, in the order of itertools.combinations of the hand.
+        """
+
+        # Position of each card of the hand within the sorted canonical hand.
+        canonical_hand = [suit_map[card // 13] * 13 + card % 13 for card in hand]
+        sorted_hand = sorted(canonical_hand)
+        positions = [sorted_hand.index(card) for card in canonical_hand]
+
+        return [cls.PAIR_INDEXES[(pos1, pos2) if pos1 < pos2 else (pos2, pos1)]
+                for pos1, pos2 in itertools.combinations(positions, 2)]
+
+
+    @classmethod
+    def get_hand_keys(cls) -> np.ndarray:
+        """
+        Enumerate the canonical keys of all 6-card hands.
+
+        ------
+
+        Returns:
+            The sorted canonical keys.
+        """
+
+        masks_by_count = [[] for _ in range(cls.HAND_SIZE + 1)]
+        for mask in range(1 << 13):
+            if mask.bit_count() <= cls.HAND_SIZE:
+                masks_by_count[mask.bit_count()].append(mask)
+
+        # The suit masks of a canonical key never increase, so each suit only looks at masks up to the previous one.
+        keys = []
+
+        def add_keys(key: int, prev_mask: int, cards_left: int, suits_left: int) -> None:
+            if suits_left == 0:
+                if cards_left == 0:
+                    keys.append(key)
+                return
+
+            for count in range(cards_left + 1):
+                masks = masks_by_count[count]
+                for mask in masks[: bisect.bisect_right(masks, prev_mask)]:
+                    add_keys((key << 13) | mask, mask, cards_left - count, suits_left - 1)
+
+        add_keys(0, (1 << 13) - 1, cls.HAND_SIZE, 4)
+
+        return np.sort(np.array(keys, dtype = np.int64))
+
+
+    @classmethod
+    def build(cls, tables_dir: str = TABLES_DIR, num_workers: int = cpu_count()) -> None:
+        """
+        Solve every canonical hand with DiscardEvaluator and save the table to disk.
+
+        ------
+
+        Arguments:
+            tables_dir: The directory to save the table in.
+            num_workers: The number of worker processes.
+        """
+
+        os.makedirs(tables_dir, exist_ok = True)
+
+        keys = cls.get_hand_keys()
+        chunks = [keys[start : start + cls.CHUNK_SIZE] for start in range(0, len(keys), cls.CHUNK_SIZE)]
+
+        # Write to temporary files first so that concurrent readers never see a partial table.
+        tmp_keys_path = os.path.join(tables_dir, f'hand_keys.{os.getpid()}.tmp.npy')
+        tmp_stats_path = os.path.join(tables_dir, f'hand_stats.{os.getpid()}.tmp.npy')
+        stats = np.lib.format.open_memmap(tmp_stats_path, mode = 'w+', dtype = cls.RECORD_DTYPE,
+                                          shape = (len(keys),))
+
+        ScoreTable.load()
+
+        with Pool(processes = num_workers) as pool:
+            start = 0
+            for n, records in enumerate(pool.imap(_solve_hands, chunks), start = 1):
+                stats[start : start + len(records)] = records
+                start += len(records)
+
+                percent_done = n / len(chunks) * 100
+                print(f'\r\033[K[ DISCARD TABLE ] : Solving hands... {percent_done:.2f}%', end = '')
+
+        print()
+        stats.flush()
+        del stats
+
+        np.save(tmp_keys_path, keys)
+        os.replace(tmp_stats_path, os.path.join(tables_dir, 'hand_stats.npy'))
+        os.replace(tmp_keys_path, os.path.join(tables_dir, 'hand_keys.npy'))
+        with open(os.path.join(tables_dir, 'version.txt'), 'w') as file:
+            file.write(str(cls.VERSION))
+
+
+    @classmethod
+    def load(cls, tables_dir: str = TABLES_DIR) -> bool:
+        """
+        Memory-map the discard table from disk, if it has been built.
+
+        Unlike the score tables, the discard table is never built on demand, since solving every hand takes hours.
+        Tables built by an older version of the code are not loaded either, since their statistics may be wrong.
+
+        ------
+
+        Arguments:
+            tables_dir: The directory to load the table from.
+
+        ------
+
+        Returns:
+            Whether the table is available.
+        """
+
+        if cls._hand_stats is not None:
+            return True
+
+        names = ('hand_keys', 'hand_stats')
+        if not all(os.path.exists(os.path.join(tables_dir, f'{name}.npy')) for name in names):
+            return False
+
+        version_path = os.path.join(tables_dir, 'version.txt')
+        version = None
+        if os.path.exists(version_path):
+            with open(version_path) as file:
+                version = file.read().strip()
+
+        if version != str(cls.VERSION):
+            warnings.warn(f'The discard table at "{tables_dir}" was built by an older version and is ignored, '
+                          f'rebuild it with "python precompute.py discard_table".', RuntimeWarning, stacklevel = 2)
+            return False
+
+        cls._hand_keys, cls._hand_stats = [
+            np.load(os.path.join(tables_dir, f'{name}.npy'), mmap_mode = 'r') for name in names
+        ]
+
+        return True
+
+
+    @classmethod
+    def get_discard_scores(cls, hand: list[Card], is_dealer: bool) -> dict[tuple[Card, Card], dict[str, float | int]]:
+        """
+        Look up the statistics of every possible discard for a given hand.
+
+        ------
+
+        Arguments:
+             hand: List of 6 cards.
+             is_dealer: Whether the hand belongs to the dealer.
+
+        ------
+
+        Returns:
+            The same dictionary as DiscardEvaluator.get_discard_scores, or None if the table has not been built.
+        """
+
+        if not cls.load():
+            return None
+
+        key, suit_map = SuitCanonicalizer.get_hand_key(hand)
+        row = int(np.searchsorted(cls._hand_keys, key))
+        if row == len(cls._hand_keys) or cls._hand_keys[row] != key:
+            return None
+
+        pair_idxs = cls.get_pair_indexes(hand, suit_map)
+
+        record = cls._hand_stats[row]
+        dealer_idx = int(is_dealer)
+        disc_sums = record['disc_sum'][dealer_idx].tolist()
+        disc_square_sums = record['disc_square_sum'][dealer_idx].tolist()
+        hand_sums = record['hand_sum'].tolist()
+        mins = record['min'][dealer_idx].tolist()
+        maxs = record['max'][dealer_idx].tolist()
+        highs = record['high'][dealer_idx].tolist()
+
+        num_outcomes = cls.NUM_OUTCOMES
+        discard_combos = {}
+        for (card1, card2), pair_idx in zip(itertools.combinations(hand, 2), pair_idxs):
+            disc_sum = disc_sums[pair_idx]
+            discard_combos[(card1, card2)] = {
+                'avg' : disc_sum / num_outcomes,
+                'min' : mins[pair_idx],
+                'max' : maxs[pair_idx],
+                'var' : (num_outcomes * disc_square_sums[pair_idx] - disc_sum * disc_sum) / num_outcomes ** 2,
+                'hand' : hand_sums[pair_idx] / cls.NUM_STARTERS,
+                'high' : highs[pair_idx]
+            }
+
+        return discard_combos
+
+
+__all__ = ['DiscardTable']
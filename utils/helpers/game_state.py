@@ -0,0 +1,89 @@
+from utils.helpers import CardDeck, Card, PeggingTracker
+
+
+class GameState:
+    """
+    The public state of a round, as seen by the players.
+
+    Holds no references to the player objects, players are identified by their seat (0 or 1),
+    so copying the state never copies a player (or their neural networks).
+    """
+
+    __slots__ = ('cribs', 'current_crib_idx', 'crib_sums', 'starter_card', 'dealer', 'points', 'pegging')
+
+
+    def __init__(self, cribs: list[list[Card]] = None, current_crib_idx: int = 0, crib_sums: list[int] = None,
+                 starter_card: Card | None = None, dealer: int = 0, points: list[int] = None,
+                 pegging: PeggingTracker = None) -> None:
+        """
+        Create a new GameState instance.
+
+        ------
+
+        Arguments:
+            cribs: The cards played in each count of the Play phase.
+            current_crib_idx: The index of the current count.
+            crib_sums: The sum of the card worths in each count.
+            starter_card: The starter card, or None if it has not been cut yet.
+            dealer: The seat of the dealer.
+            points: The points of the players, by seat.
+            pegging: The pegging tracker of the current count (built from the cribs if not given).
+        """
+
+        self.cribs = cribs if cribs is not None else [[], [], []]
+        self.current_crib_idx = current_crib_idx
+        self.crib_sums = crib_sums if crib_sums is not None else [0, 0, 0]
+        self.starter_card = starter_card
+        self.dealer = dealer
+        self.points = points if points is not None else [0, 0]
+        self.pegging = pegging if pegging is not None else PeggingTracker.from_cribs(self.cribs, current_crib_idx)
+
+
+    def snapshot(self) -> 'GameState':
+        """
+        Create an independent copy of the state.
+
+        ------
+
+        Returns:
+            The copied GameState instance.
+        """
+
+        state = GameState.__new__(GameState)
+        state.cribs = [crib.copy() for crib in self.cribs]
+        state.current_crib_idx = self.current_crib_idx
+        state.crib_sums = self.crib_sums.copy()
+        state.starter_card = self.starter_card
+        state.dealer = self.dealer
+        state.points = self.points.copy()
+        state.pegging = self.pegging.copy()
+
+        return state
+
+
+    def with_played(self, card: Card) -> 'GameState':
+        """
+        Create a copy of the state in which the given card is played on the current count.
+
+        The count is not moved on, even if it reaches 31.
+
+        ------
+
+        Arguments:
+            card: The played card.
+
+        ------
+
+        Returns:
+            The new GameState instance.
+        """
+
+        state = self.snapshot()
+        state.cribs[state.current_crib_idx].append(card)
+        state.crib_sums[state.current_crib_idx] += CardDeck.WORTH_LOOKUP[card]
+        state.pegging.play(card)
+
+        return state
+
+
+__all__ = ['GameState']
@@ -0,0 +1,123 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+
+class InferenceMemo:
+    """
+    Bounded LRU memo of network outputs, keyed by the encoded input of each state.
+
+    Pegging states (the count, the played cards, the hand and the scores) recur constantly across games,
+    so a network can look up the outputs of a batch of states and only run the ones it has not seen.
+    Each key is a 16-byte hash of the encoded input, which is far smaller than the input itself.
+
+    The memo is disabled (max_size 0) by default. It belongs to a single network and does not notice
+    changes to its weights, so it has to be cleared if the weights change (load_weights does so).
+    """
+
+    MAX_SIZE = 65_536
+    KEY_SIZE = 16
+
+    def __init__(self, max_size: int = 0) -> None:
+        """
+        Create a new InferenceMemo instance.
+
+        ------
+
+        Arguments:
+            max_size: The maximum number of memoized states, 0 to disable the memo.
+        """
+
+        self.max_size = max(max_size, 0)
+        self.hits = 0
+        self.misses = 0
+        self.forced = 0
+        self._entries = OrderedDict()
+
+
+    def configure(self, max_size: int = MAX_SIZE) -> None:
+        """
+        Set the maximum number of memoized states, evicting the least recently used ones if needed.
+
+        ------
+
+        Arguments:
+            max_size: The maximum number of memoized states, 0 to disable the memo.
+        """
+
+        self.max_size = max(max_size, 0)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last = False)
+
+
+    def clear(self) -> None:
+        """ Remove every memoized state and reset the counters. """
+
+        self._entries.clear()
+        self.hits, self.misses, self.forced = 0, 0, 0
+
+
+    def get_counters(self) -> dict[str, int | float]:
+        """
+        Get the counters of the memo.
+
+        ------
+
+        Returns:
+            A dictionary with the number of hits, misses, forced states (answered without the network, since
+            they have a single legal action) and memoized states, along with the hit rate of the lookups.
+        """
+
+        lookups = self.hits + self.misses
+        return {'hits' : self.hits, 'misses' : self.misses, 'forced' : self.forced, 'size' : len(self._entries),
+                'hit_rate' : self.hits / lookups if lookups else 0.0}
+
+
+    def get_outputs(self, inputs: np.ndarray, forward: Callable[[np.ndarray | slice], np.ndarray]) -> np.ndarray:
+        """
+        Get the outputs of a batch of encoded states, from the memo if possible.
+
+        ------
+
+        Arguments:
+            inputs: The encoded states (states x input size).
+            forward: A function that gets the outputs of the states at the given indexes (or slice) of the inputs.
+
+        ------
+
+        Returns:
+            The outputs of the states, in the same order.
+        """
+
+        if self.max_size == 0:
+            return forward(slice(None))
+
+        keys = [hashlib.blake2b(row.tobytes(), digest_size = self.KEY_SIZE).digest() for row in inputs]
+        cached = [self._entries.get(key) for key in keys]
+        miss_idxs = [idx for idx, row in enumerate(cached) if row is None]
+
+        self.hits += len(keys) - len(miss_idxs)
+        self.misses += len(miss_idxs)
+
+        if not miss_idxs:
+            for key in keys:
+                self._entries.move_to_end(key)
+            return np.stack(cached)
+
+        computed = forward(np.array(miss_idxs))
+        for idx, row in zip(miss_idxs, computed):
+            cached[idx] = row
+
+        for key, row in zip(keys, cached):
+            self._entries[key] = row
+            self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last = False)
+
+        return np.stack(cached)
+
+
+__all__ = ['InferenceMemo']
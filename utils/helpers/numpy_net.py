@@ -0,0 +1,281 @@
+from itertools import combinations
+
+import numpy as np
+
+from utils.helpers import StateEncoder, Card
+
+
+class NumpyNet:
+    """
+    Lightweight NumPy inference for the trained networks, without torch.
+
+    All networks are plain stacks of Linear layers and activations, so a network can be exported to a compact
+    weight bundle (see export) and run with a few matrix products. Simulation workers and the interactive game
+    can then use neural network players without importing torch or paying for autograd and dispatching.
+    """
+
+    NETS_DIR: str = None
+
+    # Constants of torch.nn.SELU.
+    SELU_ALPHA = 1.6732632423543772848170429916717
+    SELU_SCALE = 1.0507009873554804934193349852946
+
+    def __init__(self) -> None:
+        """ Create a new NumpyNet instance. """
+
+        self.layers = []
+        self.source = None
+        self._input_buffer = None
+
+
+    @classmethod
+    def export(cls, network: object, path: str) -> None:
+        """
+        Export the weights and the layers of a trained network to a NumPy weight bundle.
+
+        ------
+
+        Arguments:
+            network: The network to export (a BaseDiscardNet or BasePeggingNet with its weights loaded).
+            path: The path to save the bundle to (.npz).
+        """
+
+        arrays = {'source' : np.array(network.__class__.__name__)}
+        layer_types = []
+
+        for idx, layer in enumerate(network.net):
+            layer_type = layer.__class__.__name__
+            layer_types.append(layer_type)
+
+            if layer_type == 'Linear':
+                arrays[f'weight_{idx}'] = layer.weight.detach().cpu().numpy().astype(np.float32)
+                arrays[f'bias_{idx}'] = layer.bias.detach().cpu().numpy().astype(np.float32)
+            elif layer_type == 'LeakyReLU':
+                arrays[f'negative_slope_{idx}'] = np.array(layer.negative_slope, dtype = np.float32)
+            elif layer_type not in ('ReLU', 'SELU', 'Sigmoid', 'Tanh'):
+                raise Exception(f'Layers of type {layer_type} cannot be exported.')
+
+        np.savez(path, layer_types = np.array(layer_types), **arrays)
+
+
+    def load_weights(self, file_name: str) -> None:
+        """
+        Load the weights from an exported network (at trained_nets/NETS_DIR/file_name.npz).
+
+        ------
+
+        Arguments:
+            file_name: The file name to load from.
+        """
+
+        with np.load(f'trained_nets/{self.NETS_DIR}/{file_name}.npz') as bundle:
+            self.source = str(bundle['source'])
+            self.layers = []
+
+            for idx, layer_type in enumerate(bundle['layer_types'].tolist()):
+                if layer_type == 'Linear':
+                    # Transposed once here, so that a batch of rows goes through with a single matrix product.
+                    weight = np.ascontiguousarray(bundle[f'weight_{idx}'].T)
+                    self.layers.append((layer_type, weight, bundle[f'bias_{idx}']))
+                elif layer_type == 'LeakyReLU':
+                    self.layers.append((layer_type, bundle[f'negative_slope_{idx}']))
+                else:
+                    self.layers.append((layer_type,))
+
+
+    def eval(self) -> 'NumpyNet':
+        """ Match the interface of the torch networks, which are always in inference mode here. """
+
+        return self
+
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        """ Send a batch of inputs through the net and get the outputs. """
+
+        for layer_type, *params in self.layers:
+            if layer_type == 'Linear':
+                weight, bias = params
+                x = x @ weight
+                x += bias
+            elif layer_type == 'ReLU':
+                np.maximum(x, 0, out = x)
+            elif layer_type == 'LeakyReLU':
+                x = np.where(x >= 0, x, x * params[0])
+            elif layer_type == 'SELU':
+                x = self.SELU_SCALE * np.where(x > 0, x, self.SELU_ALPHA * np.expm1(np.minimum(x, 0)))
+            elif layer_type == 'Sigmoid':
+                # Written with tanh, which cannot overflow like exp.
+                x = 0.5 * np.tanh(0.5 * x) + 0.5
+            elif layer_type == 'Tanh':
+                np.tanh(x, out = x)
+
+        return x.astype(np.float32, copy = False)
+
+
+    @staticmethod
+    def log_softmax(x: np.ndarray) -> np.ndarray:
+        """ Get the log-softmax of each row of the outputs. """
+
+        x = x - x.max(axis = 1, keepdims = True)
+        return x - np.log(np.exp(x).sum(axis = 1, keepdims = True))
+
+
+    def _get_input_buffer(self, batch_size: int, input_size: int) -> np.ndarray:
+        """
+        Get the preallocated input buffer for a batch of states, growing it if needed.
+
+        ------
+
+        Arguments:
+            batch_size: The number of states in the batch.
+            input_size: The length of an encoded state.
+
+        ------
+
+        Returns:
+            A view of the buffer with one row per state (batch_size x input_size).
+        """
+
+        if self._input_buffer is None or len(self._input_buffer) < batch_size:
+            size = batch_size if self._input_buffer is None else max(batch_size, 2 * len(self._input_buffer))
+            self._input_buffer = np.empty((size, input_size), dtype = np.float32)
+
+        return self._input_buffer[:batch_size]
+
+
+class NumpyDiscardNet(NumpyNet):
+    """ NumPy inference for an exported discard network, with the interface of BaseDiscardNet. """
+
+    NETS_DIR = 'discard_nets'
+    INPUT_SIZE = StateEncoder.LENGTH_DISCARD_INPUT
+    OUTPUT_SIZE = 15
+    DISCARD_COMBO_ORDER = tuple(enumerate(combinations(range(6), 2)))
+
+
+    def get_discard_actions(self, player_scores: list[int], opponent_scores: list[int], is_dealer: list[bool],
+                            player_hands: list[list[Card]]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Choose which cards to discard in a batch of states, like BaseDiscardNet.get_discard_actions.
+
+        ------
+
+        Arguments:
+            player_scores: The neural network player's score in each state.
+            opponent_scores: The opponent's score in each state.
+            is_dealer: Whether the neural network player is the dealer in each state.
+            player_hands: The neural network player's 6 cards in hand in each state (states x 6).
+
+        ------
+
+        Returns:
+            The index of the chosen discard combination (into DISCARD_COMBO_ORDER) in each state,
+            along with its confidence score.
+        """
+
+        inputs = self._get_input_buffer(len(player_hands), self.INPUT_SIZE)
+        StateEncoder.encode_states_for_discard_phase(inputs, player_scores, opponent_scores, is_dealer, player_hands)
+
+        probs = self.log_softmax(self.forward(inputs))
+        combo_idxs = probs.argmax(axis = 1)
+
+        return combo_idxs, probs[np.arange(len(probs)), combo_idxs]
+
+
+    def get_discard_action(self, player_score: int, opponent_score: int, is_dealer: bool,
+                           player_hand: list[Card]) -> tuple[Card, Card, float]:
+        """
+        Choose which cards to discard based on the given state, like BaseDiscardNet.get_discard_action.
+
+        ------
+
+        Arguments:
+            player_score: The neural network player's score.
+            opponent_score: The opponent's score.
+            is_dealer: Whether the neural network player is the dealer.
+            player_hand: The neural network player's cards in hand.
+
+        ------
+
+        Returns:
+            The combination of cards chosen to be discarded along with their confidence score.
+        """
+
+        combo_idxs, confidences = self.get_discard_actions([player_score], [opponent_score], [is_dealer], [player_hand])
+        card1, card2 = self.DISCARD_COMBO_ORDER[combo_idxs[0]][1]
+        return player_hand[card1], player_hand[card2], float(confidences[0])
+
+
+class NumpyPeggingNet(NumpyNet):
+    """ NumPy inference for an exported pegging network, with the interface of BasePeggingNet. """
+
+    NETS_DIR = 'pegging_nets'
+    INPUT_SIZE = StateEncoder.LENGTH_PEGGING_INPUT
+    OUTPUT_SIZE = 5
+    GO_ACTION = 4
+
+
+    def get_pegging_actions(self, player_scores: list[int], opponent_scores: list[int], current_crib_sums: list[int],
+                            current_crib_cards: list[list[Card]], player_hands: list[list[Card]]
+                            ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Choose which card to play in a batch of states, like BasePeggingNet.get_pegging_actions.
+
+        ------
+
+        Arguments:
+            player_scores: The neural network player's score in each state.
+            opponent_scores: The opponent's score in each state.
+            current_crib_sums: The total of the current crib in each state.
+            current_crib_cards: The first 7 played cards in the current crib in each state,
+                                padded with -1 (states x 7).
+            player_hands: The neural network player's cards in hand in each state, padded with -1 (states x 4).
+
+        ------
+
+        Returns:
+            The index of the chosen action in each state (the slot of the card in hand, or GO_ACTION),
+            along with its confidence score.
+        """
+
+        inputs = self._get_input_buffer(len(player_hands), self.INPUT_SIZE)
+        StateEncoder.encode_states_for_pegging_phase(inputs, player_scores, opponent_scores, current_crib_sums,
+                                                     current_crib_cards, player_hands)
+        valid_mask = StateEncoder.get_pegging_valid_mask(current_crib_sums, player_hands)
+
+        probs = self.log_softmax(np.where(valid_mask, self.forward(inputs), -np.inf))
+        action_idxs = probs.argmax(axis = 1)
+
+        return action_idxs, probs[np.arange(len(probs)), action_idxs]
+
+
+    def get_pegging_action(self, player_score: int, opponent_score: int,
+                           current_crib_sum: int, current_crib_cards: list[Card],
+                           player_hand: list[Card]) -> tuple[Card | str, float]:
+        """
+        Choose which card to play based on the given state, like BasePeggingNet.get_pegging_action.
+
+        ------
+
+        Arguments:
+            player_score: The neural network player's score.
+            opponent_score: The opponent's score.
+            current_crib_sum: The total of the current crib.
+            current_crib_cards: The played cards in the current crib.
+            player_hand: The neural network player's cards in hand.
+
+        ------
+
+        Returns:
+            The card chosen to be played along with its confidence score.
+        """
+
+        action_idxs, confidences = self.get_pegging_actions(
+            [player_score], [opponent_score], [current_crib_sum],
+            [StateEncoder.pad_cards(current_crib_cards, 7)], [StateEncoder.pad_cards(player_hand, 4)]
+        )
+
+        action_idx = int(action_idxs[0])
+        return 'GO' if action_idx == self.GO_ACTION else player_hand[action_idx], float(confidences[0])
+
+
+__all__ = ['NumpyNet', 'NumpyDiscardNet', 'NumpyPeggingNet']
@@ -0,0 +1,190 @@
+from utils.helpers import CardDeck, Card
+
+
+def _get_run_length(mask: int) -> int:
+    """
+    Get the length of the run formed by a set of ranks.
+
+    ------
+
+    Arguments:
+        mask: Bitmask of the ranks (bit 0 for the Ace).
+
+    ------
+
+    Returns:
+        The number of ranks if they are consecutive and there are at least 3 of them, otherwise 0.
+    """
+
+    run_len = mask.bit_count()
+    if run_len < 3:
+        return 0
+
+    lowest_bit = mask & -mask
+    return run_len if mask == lowest_bit * ((1 << run_len) - 1) else 0
+
+
+class PeggingTracker:
+    """
+    Incremental scoring of the Play phase.
+
+    Keeps just enough about the current count to score any card in constant time: the running sum,
+    the rank and length of the pair streak at the end of the count and the rank bitmasks of every
+    suffix of the count that holds no repeated rank (runs can only be formed inside those).
+    """
+
+    __slots__ = ('crib_sum', 'cards_played', '_pair_rank', '_pair_len', '_suffix_masks')
+
+    TOTAL_CARDS = 8
+    _RUN_LENGTHS: tuple[int, ...] = tuple(_get_run_length(mask) for mask in range(1 << 13))
+
+
+    def __init__(self) -> None:
+        """ Create a new PeggingTracker instance for the start of a Play phase. """
+
+        self.crib_sum = 0
+        self.cards_played = 0
+        self._pair_rank = -1
+        self._pair_len = 0
+        # The rank bitmasks of the last 1, 2, 3... cards, for as long as no rank repeats.
+        self._suffix_masks: tuple[int, ...] = ()
+
+
+    @classmethod
+    def from_cribs(cls, cribs: list[list[Card]], current_crib_idx: int) -> 'PeggingTracker':
+        """
+        Create a PeggingTracker instance for a Play phase that is already in progress.
+
+        ------
+
+        Arguments:
+            cribs: The cards played in each count.
+            current_crib_idx: The index of the current count.
+
+        ------
+
+        Returns:
+            The PeggingTracker instance.
+        """
+
+        tracker = cls()
+        for crib_idx, crib in enumerate(cribs[: current_crib_idx + 1]):
+            if crib_idx:
+                tracker.next_count()
+            for card in crib:
+                tracker.play(card)
+
+        return tracker
+
+
+    def copy(self) -> 'PeggingTracker':
+        """
+        Create an independent copy of the tracker.
+
+        ------
+
+        Returns:
+            The copied PeggingTracker instance.
+        """
+
+        tracker = PeggingTracker.__new__(PeggingTracker)
+        tracker.crib_sum = self.crib_sum
+        tracker.cards_played = self.cards_played
+        tracker._pair_rank = self._pair_rank
+        tracker._pair_len = self._pair_len
+        tracker._suffix_masks = self._suffix_masks
+
+        return tracker
+
+
+    def score(self, card: Card) -> int:
+        """
+        Calculate the score of playing the given card, without playing it.
+
+        Matches Scoring.score_card for the same card.
+
+        ------
+
+        Arguments:
+            card: The card to score.
+
+        ------
+
+        Returns:
+            The total score of the card.
+        """
+
+        rank = CardDeck.RANK_LOOKUP[card] - 1
+        rank_bit = 1 << rank
+        crib_sum = self.crib_sum + CardDeck.WORTH_LOOKUP[card]
+
+        points = 2 if crib_sum == 15 or crib_sum == 31 else 0
+
+        if rank == self._pair_rank:
+            pair_len = self._pair_len + 1
+            points += pair_len * (pair_len - 1)
+        else:
+            run_lengths = self._RUN_LENGTHS
+            for mask in reversed(self._suffix_masks):
+                if mask & rank_bit:
+                    continue
+                run_len = run_lengths[mask | rank_bit]
+                if run_len:
+                    points += run_len
+                    break
+
+        if self.cards_played + 1 == self.TOTAL_CARDS:
+            points += 1
+
+        return points
+
+
+    def play(self, card: Card) -> int:
+        """
+        Play the given card on the current count.
+
+        ------
+
+        Arguments:
+            card: The played card.
+
+        ------
+
+        Returns:
+            The total score of the card.
+        """
+
+        points = self.score(card)
+
+        rank = CardDeck.RANK_LOOKUP[card] - 1
+        rank_bit = 1 << rank
+
+        self.crib_sum += CardDeck.WORTH_LOOKUP[card]
+        self.cards_played += 1
+
+        if rank == self._pair_rank:
+            self._pair_len += 1
+        else:
+            self._pair_rank = rank
+            self._pair_len = 1
+
+        suffix_masks = [rank_bit]
+        for mask in self._suffix_masks:
+            if mask & rank_bit:
+                break
+            suffix_masks.append(mask | rank_bit)
+        self._suffix_masks = tuple(suffix_masks)
+
+        return points
+
+
+    def next_count(self) -> None:
+        """ Start a new count (after 31 or when both players called "GO"). """
+
+        self.crib_sum = 0
+        self._pair_rank = -1
+        self._pair_len = 0
+        self._suffix_masks = ()
+
+
+__all__ = ['PeggingTracker']
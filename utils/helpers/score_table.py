@@ -0,0 +1,230 @@
+import itertools
+import os
+from math import comb
+
+import numpy as np
+
+from utils.helpers import CardDeck, Card, Scoring
+
+
+class ScoreTable:
+    """ Precomputed scores for every 4-card hand or crib with every starter card, memory-mapped from disk. """
+
+    TABLES_DIR = 'precomputed/score_tables'
+    NUM_CARDS = 52
+    NUM_COMBOS = comb(NUM_CARDS, 4)
+
+    BINOMIALS = tuple(tuple(comb(n, k) for k in range(5)) for n in range(NUM_CARDS + 1))
+    BINOMIALS_ARRAY = np.array(BINOMIALS, dtype = np.int64)
+
+    _rank_scores: np.ndarray = None
+    _hand_scores: np.ndarray = None
+    _crib_scores: np.ndarray = None
+
+
+    @classmethod
+    def get_combo_index(cls, cards: list[Card]) -> int:
+        """
+        Get the combinatorial rank of a 4-card combination.
+
+        ------
+
+        Arguments:
+            cards: The 4 cards, in any order.
+
+        ------
+
+        Returns:
+            The rank of the combination among all C(52, 4) combinations (0-270724).
+        """
+
+        c0, c1, c2, c3 = sorted(cards)
+        binomials = cls.BINOMIALS
+        return binomials[c0][1] + binomials[c1][2] + binomials[c2][3] + binomials[c3][4]
+
+
+    @classmethod
+    def get_combo_indexes(cls, cards: np.ndarray) -> np.ndarray:
+        """
+        Get the combinatorial ranks of many 4-card combinations at once.
+
+        ------
+
+        Arguments:
+            cards: Array of cards with the 4 cards of each combination along the last axis.
+
+        ------
+
+        Returns:
+            The ranks of the combinations among all C(52, 4) combinations (0-270724).
+        """
+
+        cards = np.sort(cards, axis = -1)
+        return cls.BINOMIALS_ARRAY[cards, np.arange(1, 5)].sum(axis = -1)
+
+
+    @classmethod
+    def _compute_rank_scores(cls) -> np.ndarray:
+        """
+        Compute the scores of all ordered 5-rank combinations, ignoring suits (15s, runs and pairs).
+
+        ------
+
+        Returns:
+            A table of 13^5 scores indexed by the ranks (0-12) of the 5 cards as digits of a base-13 number.
+        """
+
+        # Cards 0-12 are the 13 ranks of a single suit, which is all that 15s, runs and pairs look at.
+        scores_by_ranks = {}
+        for combo in itertools.combinations_with_replacement(range(13), 5):
+            if any(combo.count(card) > 4 for card in set(combo)):
+                continue
+
+            cards = list(combo)
+            scores_by_ranks[combo] = \
+                Scoring.score_15(cards, 'hand', explain = False)[0] + \
+                Scoring.score_run(cards, 'hand', explain = False)[0] + \
+                Scoring.score_pair(cards, 'hand', explain = False)[0]
+
+        # Every ordering of the same ranks shares the score of its sorted form.
+        ranks = np.indices((13,) * 5).reshape(5, -1).T
+        sorted_keys = np.sort(ranks, axis = 1) @ (13 ** np.arange(4, -1, -1))
+
+        sorted_scores = np.zeros(13 ** 5, dtype = np.uint8)
+        for combo, score in scores_by_ranks.items():
+            key = sum(rank * 13 ** (4 - i) for i, rank in enumerate(combo))
+            sorted_scores[key] = score
+
+        return sorted_scores[sorted_keys]
+
+
+    @classmethod
+    def _compute_combo_scores(cls, rank_scores: np.ndarray, crib: bool) -> np.ndarray:
+        """
+        Compute the scores of all 4-card combinations with every starter card.
+
+        ------
+
+        Arguments:
+            rank_scores: The table of scores for all ordered 5-rank combinations.
+            crib: Whether to score the combinations as a crib (5-card flush, his heels)
+                  or as a hand (4 or 5-card flush, his nobs).
+
+        ------
+
+        Returns:
+            A flat table of scores indexed by the combination's rank * 52 + the starter card.
+            Entries where the starter card is part of the combination are meaningless.
+        """
+
+        combos = np.array(list(itertools.combinations(range(cls.NUM_CARDS), 4)), dtype = np.int64)
+        ranks = np.array(CardDeck.RANK_LOOKUP)[combos] - 1
+        suits = np.array(CardDeck.SUIT_LOOKUP)[combos]
+
+        starters = np.arange(cls.NUM_CARDS)
+        starter_ranks = np.array(CardDeck.RANK_LOOKUP)[starters] - 1
+        starter_suits = np.array(CardDeck.SUIT_LOOKUP)[starters]
+
+        keys = ranks @ (13 ** np.arange(4, 0, -1))
+        scores = rank_scores[keys[:, None] + starter_ranks[None, :]].astype(np.uint8)
+
+        is_flush = (suits == suits[:, :1]).all(axis = 1)[:, None]
+        starter_flush = is_flush & (suits[:, :1] == starter_suits[None, :])
+
+        jack = CardDeck.CARD_RANKS.index('J')
+        if crib:
+            scores += np.where(starter_flush, 5, 0).astype(np.uint8)
+            scores += np.where(starter_ranks == jack, 2, 0).astype(np.uint8)[None, :]
+        else:
+            scores += np.where(is_flush, 4, 0).astype(np.uint8)
+            scores += starter_flush.astype(np.uint8)
+            jack_suits = np.where(ranks == jack, suits, -1)
+            has_nobs = (jack_suits[:, :, None] == starter_suits[None, None, :]).any(axis = 1)
+            scores += np.where(has_nobs, 2, 0).astype(np.uint8)
+
+        table = np.zeros(cls.NUM_COMBOS * cls.NUM_CARDS, dtype = np.uint8)
+        combo_idxs = cls.get_combo_indexes(combos)
+        table.reshape(cls.NUM_COMBOS, cls.NUM_CARDS)[combo_idxs] = scores
+
+        return table
+
+
+    @classmethod
+    def build(cls, tables_dir: str = TABLES_DIR) -> None:
+        """
+        Generate all score tables and save them to disk.
+
+        ------
+
+        Arguments:
+            tables_dir: The directory to save the tables in.
+        """
+
+        os.makedirs(tables_dir, exist_ok = True)
+
+        rank_scores = cls._compute_rank_scores()
+        tables = {
+            'rank_scores' : rank_scores,
+            'hand_scores' : cls._compute_combo_scores(rank_scores, crib = False),
+            'crib_scores' : cls._compute_combo_scores(rank_scores, crib = True)
+        }
+
+        for name, table in tables.items():
+            # Write to a temporary file first so that concurrent readers never see a partial table.
+            tmp_path = os.path.join(tables_dir, f'{name}.{os.getpid()}.tmp.npy')
+            np.save(tmp_path, table)
+            os.replace(tmp_path, os.path.join(tables_dir, f'{name}.npy'))
+
+
+    @classmethod
+    def load(cls, tables_dir: str = TABLES_DIR) -> None:
+        """
+        Memory-map the score tables from disk, generating them first if they do not exist.
+
+        Call it before starting worker processes: forked workers inherit the mapping, so they all share
+        the same pages of the tables instead of each mapping them again.
+
+        ------
+
+        Arguments:
+            tables_dir: The directory to load the tables from.
+        """
+
+        if cls._crib_scores is not None:
+            return
+
+        names = ('rank_scores', 'hand_scores', 'crib_scores')
+        if not all(os.path.exists(os.path.join(tables_dir, f'{name}.npy')) for name in names):
+            print(f'[ SCORE TABLE ] : Generating score tables at "{tables_dir}"...')
+            cls.build(tables_dir)
+
+        cls._rank_scores, cls._hand_scores, cls._crib_scores = [
+            np.load(os.path.join(tables_dir, f'{name}.npy'), mmap_mode = 'r') for name in names
+        ]
+
+
+    @classmethod
+    def rank_scores(cls) -> np.ndarray:
+        """ Get the table of scores for all ordered 5-rank combinations (13^5, base-13 rank keys). """
+
+        cls.load()
+        return cls._rank_scores
+
+
+    @classmethod
+    def hand_scores(cls) -> np.ndarray:
+        """ Get the flat table of hand scores (combination rank * 52 + starter card). """
+
+        cls.load()
+        return cls._hand_scores
+
+
+    @classmethod
+    def crib_scores(cls) -> np.ndarray:
+        """ Get the flat table of crib scores (combination rank * 52 + starter card). """
+
+        cls.load()
+        return cls._crib_scores
+
+
+__all__ = ['ScoreTable']
@@ -1,13 +1,14 @@
 from itertools import combinations
 
-from utils.helpers import CardDeck
+from utils.helpers import CardDeck, Card, GameState
 
 
 class Scoring:
     """ Calculating card combination scores. """
 
     @staticmethod
-    def score_card(state: dict[str, ...], player: ..., update_points: bool = False) -> tuple[int, list[str]]:
+    def score_card(state: GameState, player: ..., update_points: bool = False,
+                   explain: bool = True) -> tuple[int, list[str]]:
         """
         Calculate score of the last played card.
 
@@ -17,34 +18,35 @@ class Scoring:
              state: The game state.
              player: The player whose turn it is.
              update_points: Whether to update the player's points or just return them.
+             explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
         total_score = 0
         tricks = []
-        cards = state['cribs'][state['current_crib_idx']]
+        cards = state.cribs[state.current_crib_idx]
 
-        score, info = Scoring.score_15(cards, option = 'play')
+        score, info = Scoring.score_15(cards, option = 'play', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_run(cards, option = 'play')
+        score, info = Scoring.score_run(cards, option = 'play', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_pair(cards, option = 'play')
+        score, info = Scoring.score_pair(cards, option = 'play', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_31(cards)
+        score, info = Scoring.score_31(cards, explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_last(state, player, update_points = False)
+        score, info = Scoring.score_last(state, player, update_points = False, explain = explain)
         total_score += score
         tricks.extend(info)
 
@@ -55,7 +57,8 @@ class Scoring:
 
 
     @staticmethod
-    def score_hand(state: dict[str, ...], player: ..., update_points: bool = False) -> tuple[int, list[str]]:
+    def score_hand(state: GameState, player: ..., update_points: bool = False,
+                   explain: bool = True) -> tuple[int, list[str]]:
         """
         Calculate score for the player's hand.
 
@@ -65,35 +68,36 @@ class Scoring:
             state: The game state.
             player: The player whose hand is being scored.
             update_points: Whether to update the player's points or just return them.
+            explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
         total_score = 0
         tricks = []
         hand = player.cards
-        cards = hand + [state['starter_card']]
+        cards = hand + [state.starter_card]
 
-        score, info = Scoring.score_15(cards, option = 'hand')
+        score, info = Scoring.score_15(cards, option = 'hand', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_run(cards, option = 'hand')
+        score, info = Scoring.score_run(cards, option = 'hand', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_pair(cards, option = 'hand')
+        score, info = Scoring.score_pair(cards, option = 'hand', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_flush(hand, state['starter_card'], option = 'hand')
+        score, info = Scoring.score_flush(hand, state.starter_card, option = 'hand', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_nobs(state, player, update_points = False)
+        score, info = Scoring.score_nobs(state, player, update_points = False, explain = explain)
         total_score += score
         tricks.extend(info)
 
@@ -104,7 +108,8 @@ class Scoring:
 
 
     @staticmethod
-    def score_crib(state: dict[str, ...], crib: list[str], update_points: bool = False) -> tuple[int, list[str]]:
+    def score_crib(state: GameState, player: ..., crib: list[Card], update_points: bool = False,
+                   explain: bool = True) -> tuple[int, list[str]]:
         """
         Calculate score for the dealer's crib.
 
@@ -112,34 +117,34 @@ class Scoring:
 
         Arguments:
              state: The game state.
-             crib: The dealer's crib as a sequence of cards in rank-suit format.
+             player: The dealer.
+             crib: The dealer's crib as a sequence of cards.
              update_points: Whether to update the dealer's points or just return them.
+             explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
-        player = state['dealer']
-
         total_score = 0
         tricks = []
-        cards = crib + [state['starter_card']]
+        cards = crib + [state.starter_card]
 
-        score, info = Scoring.score_15(cards, option = 'crib')
+        score, info = Scoring.score_15(cards, option = 'crib', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_run(cards, option = 'crib')
+        score, info = Scoring.score_run(cards, option = 'crib', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_pair(cards, option = 'crib')
+        score, info = Scoring.score_pair(cards, option = 'crib', explain = explain)
         total_score += score
         tricks.extend(info)
 
-        score, info = Scoring.score_flush(crib, state['starter_card'], option = 'crib')
+        score, info = Scoring.score_flush(crib, state.starter_card, option = 'crib', explain = explain)
         total_score += score
         tricks.extend(info)
 
@@ -150,7 +155,8 @@ class Scoring:
 
 
     @staticmethod
-    def score_heels(state: dict[str, ...], update_points: bool = False) -> tuple[int, list[str]]:
+    def score_heels(state: GameState, player: ..., update_points: bool = False,
+                    explain: bool = True) -> tuple[int, list[str]]:
         """
         Calculate score for the dealer if the starter card is a Jack.
 
@@ -158,25 +164,28 @@ class Scoring:
 
         Arguments:
              state: The game state.
+             player: The dealer.
              update_points: Whether to update the dealer's points or just return them.
+             explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
-        if state['starter_card'][0] != 'J':
+        if CardDeck.RANK_LOOKUP[state.starter_card] != 11:
             return 0, []
 
         if update_points:
-            state['dealer'].points += 2
+            player.points += 2
 
-        return 2, ['2 for his heels']
+        return 2, ['2 for his heels'] if explain else []
 
 
     @staticmethod
-    def score_go(state: dict[str, ...], player: ..., update_points: bool = False) -> tuple[int, list[str]]:
+    def score_go(state: GameState, player: ..., update_points: bool = False,
+                 explain: bool = True) -> tuple[int, list[str]]:
         """
         Calculate score for the opposite player of the one who called "GO".
 
@@ -184,24 +193,25 @@ class Scoring:
 
         Arguments:
              state: The game state.
-             player: The player who called "GO".
+             player: The opposite player of the one who called "GO", who scores the point.
              update_points: Whether to update the player's points or just return them.
+             explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
-        other_player = state['player1'] if player == state['player2'] else state['player2']
         if update_points:
-            other_player.points += 1
+            player.points += 1
 
-        return 1, ['1 for GO']
+        return 1, ['1 for GO'] if explain else []
 
 
     @staticmethod
-    def score_nobs(state: dict[str, ...], player: ..., update_points: bool = False) -> tuple[int, list[str]]:
+    def score_nobs(state: GameState, player: ..., update_points: bool = False,
+                   explain: bool = True) -> tuple[int, list[str]]:
         """
         Calculate score for the player's if there's a Jack of the same suit as the starter card in their hand.
 
@@ -211,28 +221,34 @@ class Scoring:
             state: The game state.
             player: The player whose hand is being scored.
             update_points: Whether to update the player's points or just return them.
+            explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
-        starter_card = state['starter_card']
+        starter_card = state.starter_card
+        starter_suit = CardDeck.SUIT_LOOKUP[starter_card]
 
         for card in player.cards:
-            if card[0] == 'J' and card[1] == starter_card[1]:
+            if CardDeck.RANK_LOOKUP[card] == 11 and CardDeck.SUIT_LOOKUP[card] == starter_suit:
 
                 if update_points:
                     player.points += 2
 
-                return 2, [f'2 for his nob [{card} {starter_card}]']
+                if not explain:
+                    return 2, []
+
+                return 2, [f'2 for his nob [{CardDeck.card_to_str(card)} {CardDeck.card_to_str(starter_card)}]']
 
         return 0, []
 
 
     @staticmethod
-    def score_last(state: dict[str, ...], player: ..., update_points: bool = False) -> tuple[int, list[str]]:
+    def score_last(state: GameState, player: ..., update_points: bool = False,
+                   explain: bool = True) -> tuple[int, list[str]]:
         """
         Calculate score for the player if they played the last (8th) card.
 
@@ -242,27 +258,28 @@ class Scoring:
             state: The game state.
             player: The player who played the last card.
             update_points: Whether to update the player's points or just return them.
+            explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
-        if state['crib_sums'][state['current_crib_idx']] == 31:
+        if state.crib_sums[state.current_crib_idx] == 31:
             return 0, []
 
-        if len(state['cribs'][0]) + len(state['cribs'][1]) + len(state['cribs'][2]) != 8:
+        if len(state.cribs[0]) + len(state.cribs[1]) + len(state.cribs[2]) != 8:
             return 0, []
 
         if update_points:
             player.points += 1
 
-        return 1, ['Last card for 1']
+        return 1, ['Last card for 1'] if explain else []
 
 
     @staticmethod
-    def score_15(cards: list[str], option: str) -> tuple[int, list[str]]:
+    def score_15(cards: list[Card], option: str, explain: bool = True) -> tuple[int, list[str]]:
         """
         Option "play": Calculate score if the given sequence sums up to 15.
 
@@ -271,23 +288,33 @@ class Scoring:
         ------
 
         Arguments:
-            cards: A sequence of cards in rank-suit format.
+            cards: A sequence of cards.
             option: What is being scored ("play", "hand", "crib").
+            explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
-        cards_worths = [CardDeck.get_card_worth(card) for card in cards]
+        cards_worths = [CardDeck.WORTH_LOOKUP[card] for card in cards]
 
         if option == 'play':
             if sum(cards_worths) == 15:
-                return 2, ['15 for 2']
+                return 2, ['15 for 2'] if explain else []
 
             return 0, []
 
+        if not explain:
+            num_combos = 0
+            for combo_len in range(2, 6):
+                for combo_worths in combinations(cards_worths, combo_len):
+                    if sum(combo_worths) == 15:
+                        num_combos += 1
+
+            return num_combos * 2, []
+
         combos = []
         for combo_len in range(2, 6):
             for combo in combinations(zip(cards, cards_worths), combo_len):
@@ -296,36 +323,37 @@ class Scoring:
                 if sum(combo_worths) != 15:
                     continue
 
-                combo_cards = ' '.join(combo_cards)
+                combo_cards = ' '.join(map(CardDeck.card_to_str, combo_cards))
                 combos.append(f'15 for 2 [{combo_cards}]')
 
         return len(combos) * 2, combos
 
 
     @staticmethod
-    def score_31(cards: list[str]) -> tuple[int, list[str]]:
+    def score_31(cards: list[Card], explain: bool = True) -> tuple[int, list[str]]:
         """
         Calculate score if the given sequence sums up to 31.
 
         ------
 
         Arguments:
-            cards: A sequence of cards in rank-suit format.
+            cards: A sequence of cards.
+            explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
-        if sum([CardDeck.get_card_worth(card) for card in cards]) == 31:
-            return 2, ['31 for 2']
+        if sum([CardDeck.WORTH_LOOKUP[card] for card in cards]) == 31:
+            return 2, ['31 for 2'] if explain else []
 
         return 0, []
 
 
     @staticmethod
-    def score_pair(cards: list[str], option: str) -> tuple[int, list[str]]:
+    def score_pair(cards: list[Card], option: str, explain: bool = True) -> tuple[int, list[str]]:
         """
         Option "play": Calculate score if the last card starts or continues a pair.
 
@@ -334,24 +362,25 @@ class Scoring:
         ------
 
         Arguments:
-            cards: A sequence of cards in rank-suit format.
+            cards: A sequence of cards.
             option: What is being scored ("play", "hand", "crib").
+            explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
         if len(cards) < 2:
             return 0, []
 
         if option == 'play':
-            card_rank = cards[-1][0]
+            card_rank = CardDeck.RANK_LOOKUP[cards[-1]]
             pair_len = 1
 
             for card in cards[-2 :: -1]:
-                if card[0] != card_rank:
+                if CardDeck.RANK_LOOKUP[card] != card_rank:
                     break
                 pair_len += 1
 
@@ -359,9 +388,9 @@ class Scoring:
                 return 0, []
 
             points = pair_len * (pair_len - 1)
-            return points, [f'Pair of {pair_len} for {points}']
+            return points, [f'Pair of {pair_len} for {points}'] if explain else []
 
-        cards_ranks = [card[0] for card in cards]
+        cards_ranks = [CardDeck.RANK_LOOKUP[card] for card in cards]
         points, pairs = 0, []
 
         for rank in set(cards_ranks):
@@ -369,17 +398,18 @@ class Scoring:
             if pair_len < 2:
                 continue
 
-            pair = ' '.join([card for card in cards if card[0] == rank])
             pair_points = pair_len * (pair_len - 1)
-
             points += pair_points
-            pairs.append(f'Pair of {pair_len} for {pair_points} [{pair}]')
+
+            if explain:
+                pair = ' '.join([CardDeck.card_to_str(card) for card in cards if CardDeck.RANK_LOOKUP[card] == rank])
+                pairs.append(f'Pair of {pair_len} for {pair_points} [{pair}]')
 
         return points, pairs
 
 
     @staticmethod
-    def score_run(cards: list[str], option: str) -> tuple[int, list[str]]:
+    def score_run(cards: list[Card], option: str, explain: bool = True) -> tuple[int, list[str]]:
         """
         Option "play": Calculate score if the last card starts or continues a run.
 
@@ -388,20 +418,21 @@ class Scoring:
         ------
 
         Arguments:
-            cards: A sequence of cards in rank-suit format.
+            cards: A sequence of cards.
             option: What is being scored ("play", "hand", "crib").
+            explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
         cards_len = len(cards)
         if cards_len < 3:
             return 0, []
 
-        cards_ranks = [CardDeck.get_card_rank(card) for card in cards]
+        cards_ranks = [CardDeck.RANK_LOOKUP[card] for card in cards]
         cards_ranks.reverse()
 
         if option == 'play':
@@ -417,7 +448,7 @@ class Scoring:
                     continue
 
                 if max(unique_cards) - min(unique_cards) == run_len - 1:
-                    return run_len, [f'Run of {run_len} for {run_len}']
+                    return run_len, [f'Run of {run_len} for {run_len}'] if explain else []
 
             return 0, []
 
@@ -436,14 +467,18 @@ class Scoring:
                     num_dups = sum([cards_ranks.count(rank) if cards_ranks.count(rank) > 1 else 0
                                     for rank in combo]) or 1
                     points = run_len * num_dups
-                    run = ' '.join([card for card in cards if CardDeck.get_card_rank(card) in combo])
+                    if not explain:
+                        return points, []
+
+                    run = ' '.join([CardDeck.card_to_str(card) for card in cards
+                                    if CardDeck.RANK_LOOKUP[card] in combo])
                     return points, [f'{run_names[num_dups - 1]} of {len(set(combo))} for {points} [{run}]']
 
         return 0, []
 
 
     @staticmethod
-    def score_flush(cards: list[str], starter_card: str, option: str) -> tuple[int, list[str]]:
+    def score_flush(cards: list[Card], starter_card: Card, option: str, explain: bool = True) -> tuple[int, list[str]]:
         """
         Option "play": Does nothing.
 
@@ -455,27 +490,30 @@ class Scoring:
         ------
 
         Arguments:
-            cards: A sequence of cards in rank-suit format.
+            cards: A sequence of cards.
             starter_card: The starter card.
             option: What is being scored ("play", "hand", "crib").
+            explain: Whether to describe the scored tricks or only calculate the score.
 
         ------
 
         Returns:
-            The total score along with a list of all tricks scored.
+            The total score along with a list of all tricks scored (empty when not explaining).
         """
 
         if option == 'play':
             return 0, []
 
-        unique_suits = set([card[1] for card in cards])
+        unique_suits = set([CardDeck.SUIT_LOOKUP[card] for card in cards])
         unique_suits_len = len(unique_suits)
 
         if unique_suits_len == 1:
-            flush = ' '.join(cards)
-            score = 5 if starter_card[1] in unique_suits else 4
+            score = 5 if CardDeck.SUIT_LOOKUP[starter_card] in unique_suits else 4
             if option == 'crib' and score != 5:
                 return 0, []
+            if not explain:
+                return score, []
+            flush = ' '.join(map(CardDeck.card_to_str, cards))
             return score, [f'Flush of {score} for {score} [{flush}]']
 
         return 0, []
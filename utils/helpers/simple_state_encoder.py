@@ -1,4 +1,6 @@
-from utils.helpers import CardDeck
+import numpy as np
+
+from utils.helpers import CardDeck, Card
 
 
 class StateEncoder:
@@ -8,16 +10,25 @@ class StateEncoder:
     LENGTH_DISCARD_INPUT = 39
     LENGTH_PEGGING_INPUT = 69
 
+    # The encoding of each card (see encode_card) and its worth, by card index. The last rows are zeros,
+    # so that empty card slots (-1) in the batched encodings are encoded like missing cards.
+    CARD_FEATURES = np.array(
+        [[CardDeck.WORTH_LOOKUP[card], *(CardDeck.SUIT_LOOKUP[card] == suit for suit in range(4)),
+          CardDeck.RANK_LOOKUP[card]] for card in range(52)] + [[0] * 6],
+        dtype = np.float32
+    )
+    CARD_WORTHS = np.array(CardDeck.WORTH_LOOKUP + (0,), dtype = np.int64)
+
 
     @classmethod
-    def encode_card(cls, card: str) -> list[int]:
+    def encode_card(cls, card: Card) -> list[int]:
         """
         Encode a given card into a format recognizable for a neural network.
 
         ------
 
         Arguments:
-            card: The card that will be encoded, in rank-suit format.
+            card: The card that will be encoded.
 
         ------
 
@@ -26,11 +37,9 @@ class StateEncoder:
             the suit, and one integer value for the rank).
         """
 
-        card_rank = CardDeck.get_card_rank(card)
-        card_worth = CardDeck.get_card_worth(card)
-        card_suit = card[1]
-
-        card_suit_idx = CardDeck.CARD_SUITS.index(card_suit)
+        card_rank = CardDeck.RANK_LOOKUP[card]
+        card_worth = CardDeck.WORTH_LOOKUP[card]
+        card_suit_idx = CardDeck.SUIT_LOOKUP[card]
 
         encoded_card = [0] * 6
 
@@ -43,7 +52,7 @@ class StateEncoder:
 
     @classmethod
     def encode_state_for_discard_phase(cls, player_score: int, opponent_score: int, is_dealer: bool,
-                                       player_hand: list[str]) -> list[float | int]:
+                                       player_hand: list[Card]) -> list[float | int]:
         """
         Encode the state during the discard phase into a format recognizable for a neural network.
 
@@ -75,7 +84,7 @@ class StateEncoder:
 
     @classmethod
     def encode_state_for_pegging_phase(cls, player_score: int, opponent_score: int, current_crib_sum: int,
-                                       current_crib_cards: list[str], player_hand: list[str]) -> list[float | int]:
+                                       current_crib_cards: list[Card], player_hand: list[Card]) -> list[float | int]:
         """
         Encode the state during the pegging phase into a format recognizable for a neural network.
 
@@ -119,4 +128,123 @@ class StateEncoder:
         return encoded_state
 
 
+    @classmethod
+    def encode_states_for_discard_phase(cls, inputs: np.ndarray, player_scores: list[int], opponent_scores: list[int],
+                                        is_dealer: list[bool], player_hands: list[list[Card]]) -> np.ndarray:
+        """
+        Encode a batch of states during the discard phase, like encode_state_for_discard_phase, into given rows.
+
+        ------
+
+        Arguments:
+            inputs: The rows to fill (states x LENGTH_DISCARD_INPUT).
+            player_scores: The neural network player's score in each state.
+            opponent_scores: The opponent's score in each state.
+            is_dealer: Whether the neural network player is the dealer in each state.
+            player_hands: The neural network player's 6 cards in hand in each state (states x 6).
+
+        ------
+
+        Returns:
+            The filled rows.
+        """
+
+        hands = np.asarray(player_hands, dtype = np.int64).reshape(len(inputs), 6)
+
+        # The scores are normalized in double precision like in encode_state_for_discard_phase,
+        # then rounded into the rows.
+        inputs[:, 0] = np.minimum(player_scores, 121) / 121
+        inputs[:, 1] = np.minimum(opponent_scores, 121) / 121
+        inputs[:, 2] = is_dealer
+        inputs[:, 3 :] = cls.CARD_FEATURES[hands].reshape(len(inputs), -1)
+
+        return inputs
+
+
+    @classmethod
+    def encode_states_for_pegging_phase(cls, inputs: np.ndarray, player_scores: list[int], opponent_scores: list[int],
+                                        current_crib_sums: list[int], current_crib_cards: list[list[Card]],
+                                        player_hands: list[list[Card]]) -> np.ndarray:
+        """
+        Encode a batch of states during the pegging phase, like encode_state_for_pegging_phase, into given rows.
+
+        ------
+
+        Arguments:
+            inputs: The rows to fill (states x LENGTH_PEGGING_INPUT).
+            player_scores: The neural network player's score in each state.
+            opponent_scores: The opponent's score in each state.
+            current_crib_sums: The total of the current crib in each state.
+            current_crib_cards: The first 7 played cards in the current crib in each state,
+                                padded with -1 (states x 7).
+            player_hands: The neural network player's cards in hand in each state, padded with -1 (states x 4).
+
+        ------
+
+        Returns:
+            The filled rows.
+        """
+
+        crib_cards = np.asarray(current_crib_cards, dtype = np.int64).reshape(len(inputs), 7)
+        hands = np.asarray(player_hands, dtype = np.int64).reshape(len(inputs), 4)
+
+        # The scores are normalized in double precision like in encode_state_for_pegging_phase,
+        # then rounded into the rows.
+        inputs[:, 0] = np.minimum(player_scores, 121) / 121
+        inputs[:, 1] = np.minimum(opponent_scores, 121) / 121
+        inputs[:, 2] = current_crib_sums
+        inputs[:, 3 : 45] = cls.CARD_FEATURES[crib_cards].reshape(len(inputs), -1)
+        inputs[:, 45 :] = cls.CARD_FEATURES[hands].reshape(len(inputs), -1)
+
+        return inputs
+
+
+    @classmethod
+    def get_pegging_valid_mask(cls, current_crib_sums: list[int], player_hands: list[list[Card]]) -> np.ndarray:
+        """
+        Find the legal actions of a batch of states during the pegging phase.
+
+        ------
+
+        Arguments:
+            current_crib_sums: The total of the current crib in each state.
+            player_hands: The neural network player's cards in hand in each state, padded with -1 (states x 4).
+
+        ------
+
+        Returns:
+            Whether each action is legal in each state (states x 5): playing the card in each hand slot,
+            then 'GO', which is only legal when no card can be played.
+        """
+
+        hands = np.asarray(player_hands, dtype = np.int64).reshape(-1, 4)
+        crib_sums = np.asarray(current_crib_sums, dtype = np.int64)
+
+        valid_mask = np.empty((len(hands), 5), dtype = bool)
+        valid_mask[:, : 4] = (hands >= 0) & (cls.CARD_WORTHS[hands] + crib_sums[:, None] <= 31)
+        valid_mask[:, 4] = ~valid_mask[:, : 4].any(axis = 1)
+
+        return valid_mask
+
+
+    @staticmethod
+    def pad_cards(cards: list[Card], length: int) -> list[Card]:
+        """
+        Pad a list of cards with -1 (or cut it) to a fixed length, for the batched encodings.
+
+        ------
+
+        Arguments:
+            cards: The cards.
+            length: The length of the padded list.
+
+        ------
+
+        Returns:
+            The padded list of cards.
+        """
+
+        return cards[:length] + [-1] * (length - len(cards))
+
+
 __all__ = ['StateEncoder']
@@ -1,4 +1,4 @@
-from utils.helpers import CardDeck
+from utils.helpers import CardDeck, Card
 
 class StateEncoder:
     """ Helper for encoding the game state and its parts into a format recognizable for a neural network. """
@@ -9,14 +9,14 @@ class StateEncoder:
 
 
     @classmethod
-    def encode_card(cls, card: str) -> list[int]:
+    def encode_card(cls, card: Card) -> list[int]:
         """
         Encode a given card into a format recognizable for a neural network.
 
         ------
 
         Arguments:
-            card: The card that will be encoded, in rank-suit format.
+            card: The card that will be encoded.
 
         ------
 
@@ -24,10 +24,8 @@ class StateEncoder:
             The card encoded in a vector of 17 binary values (13 for rank, 4 for suit).
         """
 
-        card_rank = CardDeck.get_card_rank(card)
-        card_suit = card[1]
-
-        card_suit_idx = CardDeck.CARD_SUITS.index(card_suit)
+        card_rank = CardDeck.RANK_LOOKUP[card]
+        card_suit_idx = CardDeck.SUIT_LOOKUP[card]
 
         encoded_card = [0] * 17
 
@@ -39,7 +37,7 @@ class StateEncoder:
 
     @classmethod
     def encode_state_for_discard_phase(cls, player_score: int, opponent_score: int, is_dealer: bool,
-                                       player_hand: list[str]) -> list[float | int]:
+                                       player_hand: list[Card]) -> list[float | int]:
         """
         Encode the state during the discard phase into a format recognizable for a neural network.
 
@@ -71,7 +69,7 @@ class StateEncoder:
 
     @classmethod
     def encode_state_for_pegging_phase(cls, player_score: int, opponent_score: int, current_crib_sum: int,
-                                       current_crib_cards: list[str], player_hand: list[str]) -> list[float | int]:
+                                       current_crib_cards: list[Card], player_hand: list[Card]) -> list[float | int]:
         """
         Encode the state during the pegging phase into a format recognizable for a neural network.
 
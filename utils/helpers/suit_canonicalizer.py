@@ -0,0 +1,201 @@
+from utils.helpers import Card
+
+
+class SuitCanonicalizer:
+    """
+    Helper for mapping cards to a canonical renaming of the suits.
+
+    Scores only look at the ranks of the cards and at whether suits are equal (flushes and his nobs), so states
+    that only differ by a renaming of the suits are worth the same. The canonical renaming orders the suits by the
+    cards of the hand, then by the starter card, then by the cards played so far and the order they were played
+    in, so that every such state maps to one canonical form with one hashable key.
+    """
+
+
+    @classmethod
+    def get_suit_masks(cls, cards: list[Card]) -> list[int]:
+        """
+        Get the rank bitmask of each suit in a list of cards.
+
+        ------
+
+        Arguments:
+            cards: The cards.
+
+        ------
+
+        Returns:
+            The bitmask of the ranks (bit 0-12) present in each of the 4 suits.
+        """
+
+        masks = [0, 0, 0, 0]
+        for card in cards:
+            masks[card // 13] |= 1 << (card % 13)
+
+        return masks
+
+
+    @classmethod
+    def get_suit_map(cls, hand: list[Card], starter_card: Card | None = None,
+                     history: list[list[Card | str]] = None) -> list[int]:
+        """
+        Get the canonical suit of each suit for a state.
+
+        ------
+
+        Arguments:
+            hand: The cards in hand.
+            starter_card: The starter card, if it has been cut.
+            history: The cards played in each count of the Play phase (GO entries are ignored).
+
+        ------
+
+        Returns:
+            The canonical suit index (0-3) of each of the 4 suits.
+        """
+
+        played_cards = [card for count in history or [] for card in count if card != 'GO']
+        hand_masks = cls.get_suit_masks(hand)
+        played_masks = cls.get_suit_masks(played_cards)
+
+        first_plays = [len(played_cards)] * 4
+        for position, card in reversed(list(enumerate(played_cards))):
+            first_plays[card // 13] = position
+
+        def suit_order(suit: int) -> tuple[int, bool, int, int]:
+            is_starter_suit = starter_card is not None and starter_card // 13 == suit
+            return hand_masks[suit], is_starter_suit, played_masks[suit], -first_plays[suit]
+
+        suit_map = [0, 0, 0, 0]
+        for canonical_suit, suit in enumerate(sorted(range(4), key = suit_order, reverse = True)):
+            suit_map[suit] = canonical_suit
+
+        return suit_map
+
+
+    @classmethod
+    def map_cards(cls, cards: list[Card | str], suit_map: list[int]) -> list[Card | str]:
+        """
+        Rename the suits of a list of cards.
+
+        ------
+
+        Arguments:
+            cards: The cards (GO entries are kept as they are).
+            suit_map: The new suit index of each of the 4 suits.
+
+        ------
+
+        Returns:
+            The renamed cards, in the same order.
+        """
+
+        return [card if card == 'GO' else suit_map[card // 13] * 13 + card % 13 for card in cards]
+
+
+    @classmethod
+    def restore_cards(cls, cards: list[Card | str], suit_map: list[int]) -> list[Card | str]:
+        """
+        Map canonical cards back to the suits of the original state.
+
+        ------
+
+        Arguments:
+            cards: The canonical cards.
+            suit_map: The suit map the state was canonicalized with.
+
+        ------
+
+        Returns:
+            The original cards, in the same order.
+        """
+
+        inverse_map = [0, 0, 0, 0]
+        for suit, canonical_suit in enumerate(suit_map):
+            inverse_map[canonical_suit] = suit
+
+        return cls.map_cards(cards, inverse_map)
+
+
+    @classmethod
+    def canonicalize(cls, hand: list[Card], starter_card: Card | None = None, history: list[list[Card | str]] = None
+                     ) -> tuple[tuple[tuple[Card, ...], Card | None, tuple[tuple[Card | str, ...], ...]], list[int]]:
+        """
+        Get the canonical form of a state.
+
+        ------
+
+        Arguments:
+            hand: The cards in hand.
+            starter_card: The starter card, if it has been cut.
+            history: The cards played in each count of the Play phase.
+
+        ------
+
+        Returns:
+            The canonical state as a hashable key (the sorted canonical hand, the canonical starter card and
+            the canonical cards played in each count, in order), and the suit map that leads to it.
+        """
+
+        history = history or []
+        suit_map = cls.get_suit_map(hand, starter_card, history)
+
+        canonical_hand = tuple(sorted(cls.map_cards(hand, suit_map)))
+        canonical_starter = None if starter_card is None else cls.map_cards([starter_card], suit_map)[0]
+        canonical_history = tuple(tuple(cls.map_cards(count, suit_map)) for count in history)
+
+        return (canonical_hand, canonical_starter, canonical_history), suit_map
+
+
+    @classmethod
+    def get_hand_key(cls, hand: list[Card]) -> tuple[int, list[int]]:
+        """
+        Get the compact canonical key of a hand and the suit renaming that leads to it.
+
+        ------
+
+        Arguments:
+            hand: The cards of the hand.
+
+        ------
+
+        Returns:
+            The canonical key (the rank bitmasks of the canonical suits, 13 bits each, from the first suit
+            in the highest bits) and the canonical suit index of each of the hand's suits.
+        """
+
+        masks = cls.get_suit_masks(hand)
+        suit_map = cls.get_suit_map(hand)
+
+        key = 0
+        for suit in sorted(range(4), key = suit_map.__getitem__):
+            key = (key << 13) | masks[suit]
+
+        return key, suit_map
+
+
+    @classmethod
+    def hand_from_key(cls, key: int) -> list[Card]:
+        """
+        Get the sorted cards of the canonical hand with the given key.
+
+        ------
+
+        Arguments:
+            key: The compact canonical key.
+
+        ------
+
+        Returns:
+            The cards of the canonical hand.
+        """
+
+        hand = []
+        for suit in range(4):
+            mask = (key >> (13 * (3 - suit))) & 0x1FFF
+            hand.extend(suit * 13 + rank for rank in range(13) if mask >> rank & 1)
+
+        return hand
+
+
+__all__ = ['SuitCanonicalizer']
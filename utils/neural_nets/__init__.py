@@ -1,3 +1,4 @@
 from .discard_nets import *
 from .pegging_nets import *
+from .scripted_net import *
 from .trainers import *
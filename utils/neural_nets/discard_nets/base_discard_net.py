@@ -1,9 +1,10 @@
+import numpy as np
 import torch
 from torch import nn
 from torch.nn import functional as F
 from itertools import combinations
 
-from utils.helpers import StateEncoder
+from utils.helpers import StateEncoder, InferenceMemo, Card
 
 
 class BaseDiscardNet(nn.Module):
@@ -20,6 +21,30 @@ class BaseDiscardNet(nn.Module):
         super().__init__()
 
         self.net = None
+        self.memo = InferenceMemo()
+        self._input_buffer = None
+
+
+    def _get_input_buffer(self, batch_size: int) -> np.ndarray:
+        """
+        Get the preallocated input buffer for a batch of states, growing it if needed.
+
+        ------
+
+        Arguments:
+            batch_size: The number of states in the batch.
+
+        ------
+
+        Returns:
+            A view of the buffer with one row per state (batch_size x INPUT_SIZE).
+        """
+
+        if self._input_buffer is None or len(self._input_buffer) < batch_size:
+            size = batch_size if self._input_buffer is None else max(batch_size, 2 * len(self._input_buffer))
+            self._input_buffer = np.empty((size, self.INPUT_SIZE), dtype = np.float32)
+
+        return self._input_buffer[:batch_size]
 
 
     def load_weights(self, file_name: str) -> None:
@@ -33,6 +58,7 @@ class BaseDiscardNet(nn.Module):
         """
 
         self.net.load_state_dict(torch.load(f'trained_nets/discard_nets/{file_name}.pt', map_location = self.device))
+        self.memo.clear()
 
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
@@ -42,7 +68,7 @@ class BaseDiscardNet(nn.Module):
 
 
     def get_distribution_policy(self, player_score: int, opponent_score: int, is_dealer: bool,
-                                player_hand: list[str]) -> list[tuple[str, str, torch.Tensor]]:
+                                player_hand: list[Card]) -> list[tuple[Card, Card, torch.Tensor]]:
         """
         Get the processed output of the network for a given input.
 
@@ -75,8 +101,8 @@ class BaseDiscardNet(nn.Module):
 
 
     @staticmethod
-    def get_combo_confidence(distribution: list[tuple[str, str, torch.Tensor]],
-                             card1: str, card2: str) -> torch.Tensor | None:
+    def get_combo_confidence(distribution: list[tuple[Card, Card, torch.Tensor]],
+                             card1: Card, card2: Card) -> torch.Tensor | None:
         """
         Get the confidence for a specific discard combination from the given network output.
 
@@ -94,12 +120,12 @@ class BaseDiscardNet(nn.Module):
         """
 
         for combo in distribution:
-            if card1 in combo and card2 in combo:
+            if card1 in combo[:2] and card2 in combo[:2]:
                 return combo[2]
 
 
     def get_discard_action(self, player_score: int, opponent_score: int, is_dealer: bool,
-                           player_hand: list[str]) -> tuple[str, str, torch.Tensor]:
+                           player_hand: list[Card]) -> tuple[Card, Card, torch.Tensor]:
         """
         Choose which cards to discard based on the given state.
 
@@ -117,9 +143,77 @@ class BaseDiscardNet(nn.Module):
             The combination of cards chosen to be discarded along with their confidence score.
         """
 
-        distribution = self.get_distribution_policy(player_score, opponent_score, is_dealer, player_hand)
-        best_combo = max(distribution, key = lambda x: x[2].item())
-        return best_combo[0], best_combo[1], best_combo[2]
+        combo_idxs, confidences = self.get_discard_actions([player_score], [opponent_score], [is_dealer], [player_hand])
+        card1, card2 = self.DISCARD_COMBO_ORDER[combo_idxs.item()][1]
+        return player_hand[card1], player_hand[card2], confidences[0]
+
+
+    def get_policy(self, player_scores: list[int], opponent_scores: list[int], is_dealer: list[bool],
+                   player_hands: list[list[Card]]) -> torch.Tensor:
+        """
+        Get the log-softmax values of all discard combinations in a batch of states, as a single tensor.
+
+        Column i holds the discard combination DISCARD_COMBO_ORDER[i] (pair of hand positions) in every state,
+        so actions can be sampled, looked up and scored with tensor operations. Unlike get_discard_actions,
+        this keeps the autograd graph and uses new input rows, since autograd keeps them for the backward pass.
+
+        ------
+
+        Arguments:
+            player_scores: The neural network player's score in each state.
+            opponent_scores: The opponent's score in each state.
+            is_dealer: Whether the neural network player is the dealer in each state.
+            player_hands: The neural network player's 6 cards in hand in each state (states x 6).
+
+        ------
+
+        Returns:
+            The log-softmax values of the discard combinations (states x OUTPUT_SIZE).
+        """
+
+        inputs = np.empty((len(player_hands), self.INPUT_SIZE), dtype = np.float32)
+        StateEncoder.encode_states_for_discard_phase(inputs, player_scores, opponent_scores, is_dealer, player_hands)
+        inputs = torch.from_numpy(inputs).to(self.device)
+
+        return F.log_softmax(self.net(inputs), dim = -1)
+
+
+    @torch.inference_mode()
+    def get_discard_actions(self, player_scores: list[int], opponent_scores: list[int], is_dealer: list[bool],
+                            player_hands: list[list[Card]]) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Choose which cards to discard in a batch of states, with a single forward pass and no autograd.
+
+        The states are encoded with StateEncoder straight into a preallocated input buffer,
+        so each chosen discard is the same as with get_discard_action. If the memo is enabled
+        (see InferenceMemo), only the states that are not memoized go through the network.
+
+        ------
+
+        Arguments:
+            player_scores: The neural network player's score in each state.
+            opponent_scores: The opponent's score in each state.
+            is_dealer: Whether the neural network player is the dealer in each state.
+            player_hands: The neural network player's 6 cards in hand in each state (states x 6).
+
+        ------
+
+        Returns:
+            The index of the chosen discard combination (into DISCARD_COMBO_ORDER) in each state,
+            along with its confidence score.
+        """
+
+        inputs = self._get_input_buffer(len(player_hands))
+        StateEncoder.encode_states_for_discard_phase(inputs, player_scores, opponent_scores, is_dealer, player_hands)
+
+        def forward(idxs: np.ndarray | slice) -> np.ndarray:
+            outputs = self.net(torch.from_numpy(inputs[idxs]).to(self.device))
+            return F.log_softmax(outputs, dim = -1).cpu().numpy()
+
+        probs = torch.from_numpy(self.memo.get_outputs(inputs, forward)).to(self.device)
+        combo_idxs = probs.argmax(dim = -1)
+
+        return combo_idxs, probs.gather(1, combo_idxs[:, None]).squeeze(1)
 
 
 __all__ = ['BaseDiscardNet']
@@ -1,8 +1,9 @@
+import numpy as np
 import torch
 from torch import nn
 from torch.nn import functional as F
 
-from utils.helpers import StateEncoder, CardDeck
+from utils.helpers import StateEncoder, InferenceMemo, CardDeck, Card
 
 
 class BasePeggingNet(nn.Module):
@@ -10,6 +11,7 @@ class BasePeggingNet(nn.Module):
 
     INPUT_SIZE = StateEncoder.LENGTH_PEGGING_INPUT
     OUTPUT_SIZE = 5
+    GO_ACTION = 4
     device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 
     def __init__(self) -> None:
@@ -18,6 +20,30 @@ class BasePeggingNet(nn.Module):
         super().__init__()
 
         self.net = None
+        self.memo = InferenceMemo()
+        self._input_buffer = None
+
+
+    def _get_input_buffer(self, batch_size: int) -> np.ndarray:
+        """
+        Get the preallocated input buffer for a batch of states, growing it if needed.
+
+        ------
+
+        Arguments:
+            batch_size: The number of states in the batch.
+
+        ------
+
+        Returns:
+            A view of the buffer with one row per state (batch_size x INPUT_SIZE).
+        """
+
+        if self._input_buffer is None or len(self._input_buffer) < batch_size:
+            size = batch_size if self._input_buffer is None else max(batch_size, 2 * len(self._input_buffer))
+            self._input_buffer = np.empty((size, self.INPUT_SIZE), dtype = np.float32)
+
+        return self._input_buffer[:batch_size]
 
 
     def load_weights(self, file_name: str) -> None:
@@ -31,6 +57,7 @@ class BasePeggingNet(nn.Module):
         """
 
         self.net.load_state_dict(torch.load(f'trained_nets/pegging_nets/{file_name}.pt', map_location = self.device))
+        self.memo.clear()
 
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
@@ -40,8 +67,8 @@ class BasePeggingNet(nn.Module):
 
 
     def get_distribution_policy(self, player_score: int, opponent_score: int,
-                                current_crib_sum: int, current_crib_cards: list[str],
-                                player_hand: list[str]) -> list[tuple[str, torch.Tensor]]:
+                                current_crib_sum: int, current_crib_cards: list[Card],
+                                player_hand: list[Card]) -> list[tuple[Card | str | None, torch.Tensor]]:
         """
         Get the processed output of the network for a given input.
 
@@ -66,7 +93,7 @@ class BasePeggingNet(nn.Module):
 
         outputs = self.net(torch.tensor(encoded_state, dtype=torch.float32, device=self.device))
 
-        valid_mask = [i < len(player_hand) and CardDeck.get_card_worth(player_hand[i]) + current_crib_sum <= 31
+        valid_mask = [i < len(player_hand) and CardDeck.WORTH_LOOKUP[player_hand[i]] + current_crib_sum <= 31
                       for i in range(4)]
         if True in valid_mask:
             valid_mask.append(False)
@@ -84,7 +111,8 @@ class BasePeggingNet(nn.Module):
 
 
     @staticmethod
-    def get_card_confidence(distribution: list[tuple[str, torch.Tensor]], card: str) -> torch.Tensor | None:
+    def get_card_confidence(distribution: list[tuple[Card | str | None, torch.Tensor]],
+                            card: Card | str) -> torch.Tensor | None:
         """
         Get the confidence for a specific card from the given network output.
 
@@ -106,8 +134,8 @@ class BasePeggingNet(nn.Module):
 
 
     def get_pegging_action(self, player_score: int, opponent_score: int,
-                           current_crib_sum: int, current_crib_cards: list[str],
-                           player_hand: list[str]) -> tuple[str, torch.Tensor]:
+                           current_crib_sum: int, current_crib_cards: list[Card],
+                           player_hand: list[Card]) -> tuple[Card | str, torch.Tensor]:
         """
         Choose which card to play based on the given state.
 
@@ -126,10 +154,132 @@ class BasePeggingNet(nn.Module):
             The card chosen to be played along with its confidence score.
         """
 
-        distribution = self.get_distribution_policy(player_score, opponent_score, current_crib_sum,
-                                                    current_crib_cards, player_hand)
-        best_card = max(distribution, key = lambda x: x[1].item())
-        return best_card[0], best_card[1]
+        action_idxs, confidences = self.get_pegging_actions(
+            [player_score], [opponent_score], [current_crib_sum],
+            [StateEncoder.pad_cards(current_crib_cards, 7)], [StateEncoder.pad_cards(player_hand, 4)]
+        )
+
+        action_idx = action_idxs.item()
+        return 'GO' if action_idx == self.GO_ACTION else player_hand[action_idx], confidences[0]
+
+
+    def _encode_states(self, inputs: np.ndarray, player_scores: list[int], opponent_scores: list[int],
+                       current_crib_sums: list[int], current_crib_cards: list[list[Card]],
+                       player_hands: list[list[Card]]) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Encode a batch of states with StateEncoder into the given input rows and find their illegal actions.
+
+        ------
+
+        Arguments:
+            inputs: The input rows to fill (states x INPUT_SIZE).
+            player_scores: The neural network player's score in each state.
+            opponent_scores: The opponent's score in each state.
+            current_crib_sums: The total of the current crib in each state.
+            current_crib_cards: The first 7 played cards in the current crib in each state,
+                                padded with -1 (states x 7).
+            player_hands: The neural network player's cards in hand in each state, padded with -1 (states x 4).
+
+        ------
+
+        Returns:
+            The filled input rows and the mask of illegal actions (states x OUTPUT_SIZE),
+            as tensors on the network's device.
+        """
+
+        StateEncoder.encode_states_for_pegging_phase(inputs, player_scores, opponent_scores, current_crib_sums,
+                                                     current_crib_cards, player_hands)
+        invalid_mask = ~StateEncoder.get_pegging_valid_mask(current_crib_sums, player_hands)
+
+        return torch.from_numpy(inputs).to(self.device), torch.from_numpy(invalid_mask).to(self.device)
+
+
+    def get_policy(self, player_scores: list[int], opponent_scores: list[int], current_crib_sums: list[int],
+                   current_crib_cards: list[list[Card]], player_hands: list[list[Card]]) -> torch.Tensor:
+        """
+        Get the masked log-softmax values of all actions in a batch of states, as a single tensor.
+
+        Column i holds the card in hand slot i (0-3) and column GO_ACTION holds 'GO' in every state, so actions
+        can be sampled, looked up and scored with tensor operations. Unlike get_pegging_actions, this keeps
+        the autograd graph and uses new input rows, since autograd keeps them for the backward pass.
+
+        ------
+
+        Arguments:
+            player_scores: The neural network player's score in each state.
+            opponent_scores: The opponent's score in each state.
+            current_crib_sums: The total of the current crib in each state.
+            current_crib_cards: The first 7 played cards in the current crib in each state,
+                                padded with -1 (states x 7).
+            player_hands: The neural network player's cards in hand in each state, padded with -1 (states x 4).
+
+        ------
+
+        Returns:
+            The log-softmax values of the actions (states x OUTPUT_SIZE), -inf for illegal actions.
+        """
+
+        inputs = np.empty((len(player_hands), self.INPUT_SIZE), dtype = np.float32)
+        inputs, invalid_mask = self._encode_states(inputs, player_scores, opponent_scores, current_crib_sums,
+                                                   current_crib_cards, player_hands)
+
+        return F.log_softmax(self.net(inputs).masked_fill(invalid_mask, float('-inf')), dim = -1)
+
+
+    @torch.inference_mode()
+    def get_pegging_actions(self, player_scores: list[int], opponent_scores: list[int], current_crib_sums: list[int],
+                            current_crib_cards: list[list[Card]], player_hands: list[list[Card]]
+                            ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Choose which card to play in a batch of states, with a single forward pass and no autograd.
+
+        The states are encoded with StateEncoder straight into a preallocated input buffer,
+        so each chosen action is the same as with get_pegging_action. States with a single legal action
+        never go through the network, and if the memo is enabled (see InferenceMemo),
+        neither do the memoized states.
+
+        ------
+
+        Arguments:
+            player_scores: The neural network player's score in each state.
+            opponent_scores: The opponent's score in each state.
+            current_crib_sums: The total of the current crib in each state.
+            current_crib_cards: The first 7 played cards in the current crib in each state,
+                                padded with -1 (states x 7).
+            player_hands: The neural network player's cards in hand in each state, padded with -1 (states x 4).
+
+        ------
+
+        Returns:
+            The index of the chosen action in each state (the slot of the card in hand, or GO_ACTION),
+            along with its confidence score.
+        """
+
+        inputs = self._get_input_buffer(len(player_hands))
+        StateEncoder.encode_states_for_pegging_phase(inputs, player_scores, opponent_scores, current_crib_sums,
+                                                     current_crib_cards, player_hands)
+        valid_mask = StateEncoder.get_pegging_valid_mask(current_crib_sums, player_hands)
+
+        # The single legal action of a forced state has a log-softmax value of 0.
+        probs = np.where(valid_mask, np.float32(0), np.float32('-inf'))
+        choice_idxs = np.flatnonzero(valid_mask.sum(axis = 1) > 1)
+        self.memo.forced += len(probs) - len(choice_idxs)
+
+        if len(choice_idxs) > 0:
+            choice_inputs = inputs if len(choice_idxs) == len(inputs) else inputs[choice_idxs]
+
+            def forward(idxs: np.ndarray | slice) -> np.ndarray:
+                rows = choice_idxs[idxs]
+                outputs = self.net(torch.from_numpy(choice_inputs[idxs]).to(self.device))
+                invalid_mask = torch.from_numpy(~valid_mask[rows]).to(self.device)
+                return F.log_softmax(outputs.masked_fill(invalid_mask, float('-inf')), dim = -1).cpu().numpy()
+
+            probs[choice_idxs] = self.memo.get_outputs(choice_inputs, forward)
+
+        probs = torch.from_numpy(probs).to(self.device)
+        action_idxs = probs.argmax(dim = -1)
+
+        return action_idxs, probs.gather(1, action_idxs[:, None]).squeeze(1)
 
 
 __all__ = ["BasePeggingNet"]
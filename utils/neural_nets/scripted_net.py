@@ -0,0 +1,124 @@
+import copy
+import json
+import warnings
+
+import torch
+from torch import nn
+
+from .discard_nets import BaseDiscardNet
+from .pegging_nets import BasePeggingNet
+
+
+class ScriptedNet:
+    """
+    Inference with frozen TorchScript exports of the trained networks, optionally with dynamic int8 quantization.
+
+    An export (see script and save) holds the whole network, so it is loaded without its Python architecture.
+    It also holds a metadata.json extra file with the source architecture, whether it is quantized and the
+    measured accuracy delta against the eager network it was exported from.
+    """
+
+    NETS_DIR: str = None
+    EXTENSION = 'jit'
+
+    # Dynamically quantized Linear layers only run on the CPU, so all exports target the CPU.
+    device = torch.device('cpu')
+
+
+    @classmethod
+    def script(cls, network: BaseDiscardNet | BasePeggingNet, quantize: bool = False) -> torch.jit.ScriptModule:
+        """
+        Compile the layers of a trained network into a frozen TorchScript module.
+
+        ------
+
+        Arguments:
+            network: The network to export, with its weights loaded.
+            quantize: Whether to quantize the weights of the Linear layers to int8 (activations stay float).
+
+        ------
+
+        Returns:
+            The frozen module, which maps a batch of encoded states to the outputs of the network.
+        """
+
+        layers = copy.deepcopy(network.net).cpu().eval()
+
+        with warnings.catch_warnings():
+            # TorchScript and eager mode quantization are deprecated, but still the only way to save
+            # a quantized network that loads without its Python architecture.
+            warnings.simplefilter('ignore', FutureWarning)
+            warnings.simplefilter('ignore', DeprecationWarning)
+            warnings.simplefilter('ignore', UserWarning)
+
+            if quantize:
+                layers = torch.ao.quantization.quantize_dynamic(layers, {nn.Linear}, dtype = torch.qint8)
+
+            return torch.jit.freeze(torch.jit.script(layers))
+
+
+    @classmethod
+    def save(cls, module: torch.jit.ScriptModule, path: str, metadata: dict[str, ...]) -> None:
+        """
+        Save a frozen module along with its metadata.
+
+        ------
+
+        Arguments:
+            module: The module, from script.
+            path: The path to save the module to.
+            metadata: The metadata to save in the module's metadata.json extra file.
+        """
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            torch.jit.save(module, path, _extra_files = {'metadata.json' : json.dumps(metadata, indent = 4)})
+
+
+    def load_weights(self, file_name: str) -> None:
+        """
+        Load an exported network (at trained_nets/NETS_DIR/file_name.jit) in place of the layers of the network.
+
+        ------
+
+        Arguments:
+            file_name: The file name to load from.
+        """
+
+        extra_files = {'metadata.json' : ''}
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            self.net = torch.jit.load(f'trained_nets/{self.NETS_DIR}/{file_name}.{self.EXTENSION}',
+                                      map_location = self.device, _extra_files = extra_files)
+
+        self.metadata = json.loads(extra_files['metadata.json'])
+        self.memo.clear()
+
+
+class ScriptedDiscardNet(ScriptedNet, BaseDiscardNet):
+    """ An exported discard network, with the interface of BaseDiscardNet. """
+
+    NETS_DIR = 'discard_nets'
+
+    def __init__(self) -> None:
+        """ Create a new ScriptedDiscardNet instance. """
+
+        super().__init__()
+
+        self.metadata = None
+
+
+class ScriptedPeggingNet(ScriptedNet, BasePeggingNet):
+    """ An exported pegging network, with the interface of BasePeggingNet. """
+
+    NETS_DIR = 'pegging_nets'
+
+    def __init__(self) -> None:
+        """ Create a new ScriptedPeggingNet instance. """
+
+        super().__init__()
+
+        self.metadata = None
+
+
+__all__ = ['ScriptedNet', 'ScriptedDiscardNet', 'ScriptedPeggingNet']
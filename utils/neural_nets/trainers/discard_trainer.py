@@ -1,17 +1,19 @@
+import itertools
 import random
 
+import numpy as np
 import torch
 from torch import optim
 
 from utils.neural_nets import BaseDiscardNet
-from utils.helpers import DiscardEvaluator, CardDeck
+from utils.helpers import DiscardEvaluator, CardDeck, ScoreTable
 
 from multiprocessing import Pool, cpu_count
 
 
-def _get_batch_data(args: dict[str, ...]) -> dict[str, ...]:
+def _get_batch_data(args: dict[str, ...]) -> dict[str, np.ndarray]:
     """
-    Generate input data for a single training batch.
+    Generate the sample states of a single training batch.
 
     ------
 
@@ -21,31 +23,41 @@ def _get_batch_data(args: dict[str, ...]) -> dict[str, ...]:
     ------
 
     Returns:
-        A dictionary with the generated training data.
+        A dictionary with the generated training data, as one array row per state.
     """
 
-    play_style = args['play_style']
-
-    deck = CardDeck(shuffle=True)
-    hand_cards, crib_cards, starter_card = deck.deal_cards(6), deck.deal_cards(2), deck.deal_cards(1)[0]
-    is_dealer = random.choice([True, False])
-    score1, score2 = random.randint(0, 120), random.randint(0, 120)
-
-    ranked_pairs = DiscardEvaluator.get_discard_stats(hand_cards, is_dealer)[play_style]
-    best_cards = ranked_pairs[0][0]
-
-    baseline = sum([score for _, score in ranked_pairs]) / 15
+    play_style, num_states = args['play_style'], args['num_states']
+
+    hand_cards, crib_cards, starter_cards = [], [], []
+    for _ in range(num_states):
+        deck = CardDeck(shuffle=True)
+        hand_cards.append(deck.deal_cards(6))
+        crib_cards.append(deck.deal_cards(2))
+        starter_cards.append(deck.deal_cards(1)[0])
+
+    is_dealer = [random.choice([True, False]) for _ in range(num_states)]
+    scores = [(random.randint(0, 120), random.randint(0, 120)) for _ in range(num_states)]
+
+    if args['time_budget'] is None:
+        discard_idxs, values = DiscardEvaluator.get_discard_stats_many(hand_cards, is_dealer, play_style)
+    else:
+        discard_idxs = np.empty((num_states, 15), dtype = np.int8)
+        values = np.empty((num_states, 15), dtype = np.float64)
+        for state_idx, (hand, dealer) in enumerate(zip(hand_cards, is_dealer)):
+            ranked_pairs = DiscardEvaluator.sample_discard_stats(hand, dealer, play_style,
+                                                                 time_budget = args['time_budget'])
+            discards = list(itertools.combinations(hand, 2))
+            discard_idxs[state_idx] = [discards.index(cards) for cards, _ in ranked_pairs]
+            values[state_idx] = [value for _, value in ranked_pairs]
 
     return {
-        'score1': score1,
-        'score2': score2,
-        'is_dealer': is_dealer,
-        'hand_cards': hand_cards,
-        'crib_cards': crib_cards,
-        'starter_card': starter_card,
-        'best_cards': best_cards,
-        'baseline' : baseline,
-        'ranked_pairs' : ranked_pairs
+        'scores': np.array(scores, dtype = np.int16),
+        'is_dealer': np.array(is_dealer, dtype = bool),
+        'hand_cards': np.array(hand_cards, dtype = np.int8),
+        'crib_cards': np.array(crib_cards, dtype = np.int8),
+        'starter_cards': np.array(starter_cards, dtype = np.int8),
+        'discard_idxs': discard_idxs,
+        'values': values
     }
 
 
@@ -78,7 +90,8 @@ class DiscardTrainer:
     def train(cls, discard_network: BaseDiscardNet, lr: float, wd: float, epochs: int, batch_size: int = 32,
               pool_size: int = 8, play_style: str = 'recommended', num_workers: int = 1,
               alpha: float = 0.0, alpha_decay: float = 0.95, alpha_step: int = 10,
-              accumulate_loss: bool = False, inflate_advantage: bool = False) -> None:
+              accumulate_loss: bool = False, inflate_advantage: bool = False,
+              time_budget: float | None = None) -> None:
         """
         Train the given discard neural network using reinforced supervised or unsupervised learning.
 
@@ -111,6 +124,8 @@ class DiscardTrainer:
             num_workers: How many cores to use for training.
             accumulate_loss: Whether to accumulate gradient loss within a batch before stepping.
             inflate_advantage: Whether to inflate the calculated advantage.
+            time_budget: If given, the play style rankings are estimated by sampling for at most this many
+                         seconds per hand instead of being evaluated exactly.
 
         ------
 
@@ -143,6 +158,7 @@ class DiscardTrainer:
             f'\n'
             f'* Accumulate loss: {accumulate_loss}\n'
             f'* Inflated advantage: {inflate_advantage}\n'
+            f'* Sampling time budget: {time_budget}\n'
             f'\n'
             f'* Supervised: {alpha > 0}\n'
             f'* Alpha: {alpha}\n'
@@ -153,61 +169,51 @@ class DiscardTrainer:
         cls._log(f'Training with {discard_network.device}...')
         net.train()
 
+        ScoreTable.load()
+
         with Pool(processes = num_workers) as pool:
-            batch_data_args = [{'play_style': play_style} for _ in range(pool_size * epochs)]
-            state_pool_generator = pool.imap_unordered(_get_batch_data, batch_data_args, chunksize = pool_size)
+            batch_data_args = [
+                {'play_style': play_style, 'time_budget': time_budget, 'num_states': pool_size} for _ in range(epochs)
+            ]
+            state_pool_generator = pool.imap(_get_batch_data, batch_data_args)
 
             for epoch in range(1, epochs + 1):
                 total_loss, total_reward, total_advantage = 0, 0, 0
                 if accumulate_loss:
                     optimizer.zero_grad()
 
-                state_pool = [next(state_pool_generator) for _ in range(pool_size)]
+                state_pool = next(state_pool_generator)
 
-                for _ in range(batch_size):
-                    state = random.choice(state_pool)
-                    hand_cards = state['hand_cards'].copy()
-                    crib_cards = state['crib_cards'].copy()
-                    is_dealer = state['is_dealer']
-                    starter_card = state['starter_card']
+                state_idxs = random.choices(range(pool_size), k = batch_size)
+                rely_on_coach = random.choices([True, False], [alpha, 1 - alpha], k = batch_size)
 
-                    rely_on_coach = random.choices([True, False], [alpha, 1 - alpha], k = 1)[0]
-                    distribution = discard_network.get_distribution_policy(
-                        state['score1'], state['score2'], is_dealer, hand_cards
+                # The reward of each discard is its rank counted from the worst one, indexed like the policy columns.
+                ranked_idxs = state_pool['discard_idxs'][state_idxs].astype(np.int64)
+                rewards = np.empty(ranked_idxs.shape, dtype = np.int64)
+                np.put_along_axis(rewards, ranked_idxs, np.arange(ranked_idxs.shape[1])[::-1], axis = 1)
+
+                # A single step over the whole batch gives the same gradient as accumulating it state by state.
+                chunk_size = batch_size if accumulate_loss else 1
+                for start in range(0, batch_size, chunk_size):
+                    chunk = slice(start, start + chunk_size)
+                    chunk_idxs = state_idxs[chunk]
+                    scores = state_pool['scores'][chunk_idxs]
+
+                    policy = discard_network.get_policy(
+                        scores[:, 0], scores[:, 1], state_pool['is_dealer'][chunk_idxs],
+                        state_pool['hand_cards'][chunk_idxs]
                     )
 
-                    if rely_on_coach:
-                        best_pair = state['best_cards']
-                        card1, card2 = best_pair[0], best_pair[1]
-                        confidence = discard_network.get_combo_confidence(
-                            distribution, card1, card2
-                        )
-
-                    else:
-                        log_probs = torch.stack([combo[2] for combo in distribution])
-                        probs = torch.exp(log_probs)
-
-                        chosen_combo = distribution[torch.multinomial(probs, 1).item()]
-                        card1, card2, confidence = chosen_combo[0], chosen_combo[1], chosen_combo[2]
-
-                    # hand_cards.remove(card1)
-                    # hand_cards.remove(card2)
-                    # crib_cards.extend([card1, card2])
-                    # hand_score = DiscardEvaluator.score_hand(hand_cards, starter_card)
-                    # crib_score = DiscardEvaluator.score_crib(crib_cards, starter_card)
-                    #
-                    # # reward range is [-29, 53]
-                    # reward = hand_score + crib_score if is_dealer else hand_score - crib_score
-                    # baseline = state['baseline']
-                    # advantage = reward - baseline
-
-                    ranked_pairs = state['ranked_pairs']
-                    reward = 0
-                    for idx, pair in enumerate(reversed(ranked_pairs)):
-                        cards = pair[0]
-                        if card1 in cards and card2 in cards:
-                            reward = idx
-                            break
+                    with torch.no_grad():
+                        sampled_idxs = torch.multinomial(policy.exp(), 1).squeeze(1)
+
+                    coach_idxs = torch.as_tensor(ranked_idxs[chunk, 0], device = policy.device)
+                    coach_mask = torch.as_tensor(rely_on_coach[chunk], device = policy.device)
+                    combo_idxs = torch.where(coach_mask, coach_idxs, sampled_idxs)
+                    confidences = policy.gather(1, combo_idxs[:, None]).squeeze(1)
+
+                    reward = torch.as_tensor(rewards[chunk], device = policy.device).gather(1, combo_idxs[:, None])
+                    reward = reward.squeeze(1)
 
                     baseline = 7
                     advantage = reward - baseline
@@ -218,7 +224,7 @@ class DiscardTrainer:
                     if not accumulate_loss:
                         optimizer.zero_grad()
 
-                    loss = -confidence * advantage
+                    loss = (-confidences * advantage).sum()
 
                     loss.backward()
 
@@ -229,8 +235,8 @@ class DiscardTrainer:
                         optimizer.step()
 
                     total_loss += loss.item()
-                    total_reward += reward
-                    total_advantage += advantage
+                    total_reward += reward.sum().item()
+                    total_advantage += advantage.sum().item()
 
                 if accumulate_loss:
                     # if inflate_advantage:
@@ -5,6 +5,44 @@ import torch
 from torch import optim
 
 from utils.neural_nets import BaseDiscardNet
+from utils.helpers import CardDeck
+
+
+def _parse_state(state: dict[str, ...]) -> dict[str, ...]:
+    """
+    Convert the cards of a dataset state to integer cards (older datasets store them in rank-suit format),
+    and index its discard rewards by policy column.
+
+    ------
+
+    Arguments:
+        state: A state loaded from a dataset.
+
+    ------
+
+    Returns:
+        The same state with converted cards and indexed rewards.
+    """
+
+    state['hand_cards'] = [CardDeck.parse_card(card) for card in state['hand_cards']]
+    state['best_cards'] = [CardDeck.parse_card(card) for card in state['best_cards']]
+    state['ranked_pairs'] = [([CardDeck.parse_card(card) for card in cards], score)
+                             for cards, score in state['ranked_pairs']]
+
+    # The reward (rank counted from the worst pair, 0 if not ranked) of each discard combination of the hand
+    # and the index of the best one, in the order of the policy columns (BaseDiscardNet.DISCARD_COMBO_ORDER).
+    combos = [(state['hand_cards'][pos1], state['hand_cards'][pos2])
+              for _, (pos1, pos2) in BaseDiscardNet.DISCARD_COMBO_ORDER]
+
+    state['combo_rewards'] = [
+        next((idx for idx, (cards, _) in enumerate(reversed(state['ranked_pairs']))
+              if card1 in cards and card2 in cards), 0)
+        for card1, card2 in combos
+    ]
+    state['best_idx'] = next(idx for idx, (card1, card2) in enumerate(combos)
+                             if card1 in state['best_cards'] and card2 in state['best_cards'])
+
+    return state
 
 
 class DiscardTrainerPreLoaded:
@@ -107,7 +145,7 @@ class DiscardTrainerPreLoaded:
             cls._log(f'Preloading states from "{dataset}.json"...')
             with open(f'datasets/discard_datasets/{dataset}.json', 'r') as file:
                 data = json.load(file)
-                total_state_pool.extend(data)
+                total_state_pool.extend(_parse_state(state) for state in data)
         total_state_pool_len = len(total_state_pool)
 
         cls._log(f'Training with {discard_network.device}...')
@@ -132,37 +170,30 @@ class DiscardTrainerPreLoaded:
 
             state_pool = total_state_pool[idx1 : idx2]
 
-            for _ in range(batch_size):
-                state = random.choice(state_pool)
-                hand_cards = state['hand_cards'].copy()
-                is_dealer = state['is_dealer']
+            states = random.choices(state_pool, k = batch_size)
+            rely_on_coach = random.choices([True, False], [alpha, 1 - alpha], k = batch_size)
 
-                rely_on_coach = random.choices([True, False], [alpha, 1 - alpha], k = 1)[0]
-                distribution = discard_network.get_distribution_policy(
-                    state['score1'], state['score2'], is_dealer, hand_cards
-                )
+            # A single step over the whole batch gives the same gradient as accumulating it state by state.
+            chunk_size = batch_size if accumulate_loss else 1
+            for start in range(0, batch_size, chunk_size):
+                chunk = slice(start, start + chunk_size)
+                chunk_states = states[chunk]
 
-                if rely_on_coach:
-                    best_pair = state['best_cards']
-                    card1, card2 = best_pair[0], best_pair[1]
-                    confidence = discard_network.get_combo_confidence(
-                        distribution, card1, card2
-                    )
+                policy = discard_network.get_policy(
+                    [state['score1'] for state in chunk_states], [state['score2'] for state in chunk_states],
+                    [state['is_dealer'] for state in chunk_states], [state['hand_cards'] for state in chunk_states]
+                )
 
-                else:
-                    log_probs = torch.stack([combo[2] for combo in distribution])
-                    probs = torch.exp(log_probs)
+                with torch.no_grad():
+                    sampled_idxs = torch.multinomial(policy.exp(), 1).squeeze(1)
 
-                    chosen_combo = distribution[torch.multinomial(probs, 1).item()]
-                    card1, card2, confidence = chosen_combo[0], chosen_combo[1], chosen_combo[2]
+                coach_idxs = torch.tensor([state['best_idx'] for state in chunk_states], device = policy.device)
+                coach_mask = torch.tensor(rely_on_coach[chunk], device = policy.device)
+                combo_idxs = torch.where(coach_mask, coach_idxs, sampled_idxs)
+                confidences = policy.gather(1, combo_idxs[:, None]).squeeze(1)
 
-                ranked_pairs = state['ranked_pairs']
-                reward = 0
-                for idx, pair in enumerate(reversed(ranked_pairs)):
-                    cards = pair[0]
-                    if card1 in cards and card2 in cards:
-                        reward = idx
-                        break
+                rewards = torch.tensor([state['combo_rewards'] for state in chunk_states], device = policy.device)
+                reward = rewards.gather(1, combo_idxs[:, None]).squeeze(1)
 
                 baseline = 7
                 advantage = reward - baseline
@@ -173,7 +204,7 @@ class DiscardTrainerPreLoaded:
                 if not accumulate_loss:
                     optimizer.zero_grad()
 
-                loss = -confidence * advantage
+                loss = (-confidences * advantage).sum()
 
                 loss.backward()
 
@@ -184,8 +215,8 @@ class DiscardTrainerPreLoaded:
                     optimizer.step()
 
                 total_loss += loss.item()
-                total_reward += reward
-                total_advantage += advantage
+                total_reward += reward.sum().item()
+                total_advantage += advantage.sum().item()
 
             if accumulate_loss:
                 # if inflate_advantage:
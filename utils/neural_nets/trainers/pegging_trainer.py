@@ -5,7 +5,7 @@ import torch
 from torch import optim
 
 from utils.neural_nets import BasePeggingNet
-from utils.helpers import DiscardEvaluator, CardDeck, Scoring
+from utils.helpers import DiscardEvaluator, CardDeck, ScoreTable, GameState, StateEncoder
 
 from multiprocessing import Pool, cpu_count
 
@@ -39,8 +39,7 @@ def _get_batch_data(args: dict[str, ...]) -> dict[str, ...]:
         player_hand.remove(random.choice(player_hand))
         player_hand.remove(random.choice(player_hand))
     else:
-        ranked_pairs = DiscardEvaluator.get_discard_stats(player_hand, is_dealer)[play_style]
-        best_cards = ranked_pairs[0][0]
+        best_cards = DiscardEvaluator.get_best_discard(player_hand, is_dealer, play_style)
         player_hand.remove(best_cards[0])
         player_hand.remove(best_cards[1])
 
@@ -58,7 +57,7 @@ def _get_batch_data(args: dict[str, ...]) -> dict[str, ...]:
 
 
 def _run_episode(state: dict[str, ...], pegging_net: BasePeggingNet,
-                 opponent: BasePlayer) -> tuple[list[torch.Tensor], list[int]]:
+                 opponent: BasePlayer) -> tuple[torch.Tensor, list[int]]:
     """
     Run a sequence of actions that complete a pegging stage.
 
@@ -72,84 +71,66 @@ def _run_episode(state: dict[str, ...], pegging_net: BasePeggingNet,
     ------
 
     Returns:
-        The taken actions as two lists of their log-probabilities and immediate rewards.
+        The log-probabilities of the taken actions as a single tensor, and their immediate rewards.
     """
 
-    called_go = False
-    player1 = 'Me'
-    player2 = opponent
-    player2.cards = state['opponent_hand']
-    state['dealer'] = player1 if state['is_dealer'] else player2
-
-    current_player = 'Me' if not state['is_dealer'] else opponent
-    action_confs, action_scores = [], []
-    alpha = state['alpha']
+    # Imported here since the game package depends on the players, which depend on the neural networks.
+    from utils.game import HeadlessGame
 
+    # The network plays from seat 0 (through the coach when relying on it) and the opponent from seat 1.
     coach = DAPGPlayer()
+    game = HeadlessGame(coach, opponent)
+
+    coach.cards = state['player_hand']
+    opponent.cards = state['opponent_hand']
+    game.resume_play(GameState(
+        cribs = state['cribs'], current_crib_idx = state['current_crib_idx'], crib_sums = state['crib_sums'],
+        starter_card = state['starter_card'], dealer = 0 if state['is_dealer'] else 1,
+        points = [state['score1'], state['score2']]
+    ))
+    game_state = game.state
+
+    action_states, action_idxs, action_scores = [], [], []
+    alpha = state['alpha']
 
     while state['player_hand'] or state['opponent_hand']:
-        prev_called_go = called_go
-        confidence = None
-
-        if current_player == 'Me':
-            current_crib_sum = state['crib_sums'][state['current_crib_idx']]
-            current_crib_cards = state['cribs'][state['current_crib_idx']]
-            distribution = pegging_net.get_distribution_policy(
-                state['score1'], state['score2'], current_crib_sum, current_crib_cards, state['player_hand']
+
+        if game.turn == 0:
+            # The coach plays from the same list of cards, so the hand is copied before it moves.
+            player_hand = state['player_hand'].copy()
+            action_state = (
+                game_state.points[0], game_state.points[1], game_state.crib_sums[game_state.current_crib_idx],
+                StateEncoder.pad_cards(game_state.cribs[game_state.current_crib_idx], 7),
+                StateEncoder.pad_cards(player_hand, 4)
             )
 
             rely_on_coach = random.choices([True, False], [alpha, 1 - alpha], k=1)[0]
             if rely_on_coach:
-                coach.cards = state['player_hand']
-
-                played_card = coach.play_card(state)
-                confidence = pegging_net.get_card_confidence(distribution, played_card)
+                played_card = coach.play_card(game_state)
+                action_idx = pegging_net.GO_ACTION if played_card == 'GO' else player_hand.index(played_card)
             else:
-                log_probs = torch.stack([card[1] for card in distribution])
-                probs = torch.exp(log_probs)
+                with torch.no_grad():
+                    policy = pegging_net.get_policy(*([value] for value in action_state))
 
-                played_card, confidence = distribution[torch.multinomial(probs, 1).item()]
+                action_idx = torch.multinomial(policy[0].exp(), 1).item()
+                played_card = 'GO' if action_idx == pegging_net.GO_ACTION else player_hand[action_idx]
 
             if played_card != 'GO' and not rely_on_coach:
                 state['player_hand'].remove(played_card)
-        else:
-            played_card = opponent.play_card(state)
 
-        if played_card == 'GO':
-            if called_go:
-                state['current_crib_idx'] += 1
-                called_go = False
-            else:
-                called_go = True
-                if current_player == opponent:
-                    state['score1'] += 1
-                else:
-                    state['score2'] += 1
-
-            if current_player == 'Me':
-                action_confs.append(confidence)
-                action_scores.append(0)
+            action_states.append(action_state)
+            action_idxs.append(action_idx)
+            action_scores.append(game.play_move(played_card))
         else:
-            state['cribs'][state['current_crib_idx']].append(played_card)
-            score, _ = Scoring.score_card(state, current_player, update_points = False)
-            state['crib_sums'][state['current_crib_idx']] += CardDeck.get_card_worth(played_card)
-
-            if current_player == 'Me':
-                action_confs.append(confidence)
-                action_scores.append(score)
-                state['score1'] += score
-            else:
-                state['score2'] += score
+            game.play_move(opponent.play_card(game_state))
 
-            if state['crib_sums'][state['current_crib_idx']] == 31:
-                state['current_crib_idx'] += 1
-                called_go = False
-
-        if state['score1'] >= 121 or state['score2'] >= 121:
+        if game.check_win():
             break
 
-        if not (called_go and called_go == prev_called_go):
-            current_player = 'Me' if current_player == opponent else opponent
+    # The network does not change during an episode, so all of its actions are scored in one forward pass.
+    policy = pegging_net.get_policy(*(zip(*action_states) if action_states else [[]] * 5))
+    action_idxs = torch.tensor(action_idxs, dtype = torch.long, device = policy.device)
+    action_confs = policy.gather(1, action_idxs[:, None]).squeeze(1)
 
     return action_confs, action_scores
 
@@ -248,6 +229,8 @@ class PeggingTrainer:
         cls._log(f'Training with {pegging_network.device}...')
         net.train()
 
+        ScoreTable.load()
+
         with Pool(processes = num_workers) as pool:
             num_40p = int(0.4 * pool_size) * epochs
             num_20p = int(0.2 * pool_size) * epochs
@@ -270,17 +253,11 @@ class PeggingTrainer:
 
                     action_confs, action_pts = _run_episode(state, pegging_network, opponent)
 
-                    rewards = []
-                    actual_reward = 0
-                    for points in reversed(action_pts):
-                        actual_reward += points
-                        rewards.insert(0, actual_reward)
+                    # The reward of each action is the sum of the points scored from it until the end of the episode.
+                    rewards = torch.tensor(action_pts, dtype = torch.float32, device = action_confs.device)
+                    rewards = rewards.flip(0).cumsum(0).flip(0)
 
-                    loss = torch.tensor(0.0, requires_grad = True)
-                    for confidence, reward in zip(action_confs, rewards):
-                        if inflate_advantage:
-                            reward = reward ** 2
-                        loss = loss + (-confidence * reward)
+                    loss = -(action_confs * (rewards ** 2 if inflate_advantage else rewards)).sum()
 
                     if not accumulate_loss:
                         optimizer.zero_grad()
@@ -294,8 +271,8 @@ class PeggingTrainer:
                         optimizer.step()
 
                     total_loss += loss.item()
-                    total_reward += sum(rewards)
-                    total_points += rewards[0] if rewards else 0
+                    total_reward += rewards.sum().item()
+                    total_points += rewards[0].item() if len(rewards) else 0
 
                 if accumulate_loss:
                     # if inflate_advantage:
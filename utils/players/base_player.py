@@ -1,6 +1,6 @@
 from abc import abstractmethod, ABC
 
-from utils.helpers import CardDeck
+from utils.helpers import CardDeck, Card, GameState
 
 
 class BasePlayer(ABC):
@@ -11,10 +11,12 @@ class BasePlayer(ABC):
 
         self.cards = []
         self.points = 0
+        # The player's seat in the game state (0 or 1), assigned by the game.
+        self.seat = 0
 
 
     @abstractmethod
-    def discard_cards(self, state: dict[str, ...]) -> list[str]:
+    def discard_cards(self, state: GameState) -> list[Card]:
         """
         Discard two cards from the hand to the dealer's crib.
 
@@ -33,7 +35,7 @@ class BasePlayer(ABC):
 
 
     @abstractmethod
-    def play_card(self, state: dict[str, ...]) -> str:
+    def play_card(self, state: GameState) -> Card | str:
         """
         Play a card from the hand onto the current crib.
 
@@ -51,7 +53,7 @@ class BasePlayer(ABC):
         pass
 
 
-    def get_valid_moves(self, state: dict[str, ...]) -> list[str]:
+    def get_valid_moves(self, state: GameState) -> list[Card | str]:
         """
         Get a list of valid moves for the given state.
 
@@ -66,8 +68,8 @@ class BasePlayer(ABC):
             A list of playable cards, or GO if there are none.
         """
 
-        current_crib_sum = state['crib_sums'][state['current_crib_idx']]
-        valid_cards = [card for card in self.cards if CardDeck.get_card_worth(card) + current_crib_sum <= 31]
+        current_crib_sum = state.crib_sums[state.current_crib_idx]
+        valid_cards = [card for card in self.cards if CardDeck.WORTH_LOOKUP[card] + current_crib_sum <= 31]
 
         return valid_cards if valid_cards else ['GO']
 
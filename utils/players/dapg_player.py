@@ -1,14 +1,14 @@
 import random
-import copy
 
 from .base_player import BasePlayer
-from utils.helpers import DiscardEvaluator, Scoring
+from utils.helpers import DiscardEvaluator, Card, GameState
 
 
 class DAPGPlayer(BasePlayer):
     """ Player agent that discards cards based on statistical analysis, but plays greedy during pegging. """
 
-    def __init__(self, play_style: str = 'recommended') -> None:
+    def __init__(self, play_style: str = 'recommended', time_budget: float | None = None,
+                 num_workers: int = 1) -> None:
         """
         Create a new DAPGPlayer instance.
 
@@ -16,15 +16,25 @@ class DAPGPlayer(BasePlayer):
 
         Arguments:
             play_style: The play style that will be used during discarding.
+            time_budget: If given, discards are estimated by sampling for at most this many seconds
+                         instead of being evaluated exactly.
+            num_workers: The number of processes to evaluate a discard decision with, in a persistent pool
+                         (see DiscardEvaluator).
         """
         super().__init__()
         self.play_style = play_style
+        self.time_budget = time_budget
+        self.num_workers = num_workers
 
 
-    def discard_cards(self, state: dict[str, ...]) -> list[str]:
+    def discard_cards(self, state: GameState) -> list[Card]:
 
-        stats = DiscardEvaluator.get_discard_stats(self.cards, state['dealer'] == self)
-        cards = stats[self.play_style][0][0]
+        is_dealer = state.dealer == self.seat
+        if self.time_budget is None:
+            cards = DiscardEvaluator.get_best_discard(self.cards, is_dealer, self.play_style, self.num_workers)
+        else:
+            cards = DiscardEvaluator.sample_discard_stats(self.cards, is_dealer, self.play_style,
+                                                          time_budget = self.time_budget)[0][0]
 
         self.cards.remove(cards[0])
         self.cards.remove(cards[1])
@@ -32,7 +42,7 @@ class DAPGPlayer(BasePlayer):
         return cards
 
 
-    def play_card(self, state: dict[str, ...]) -> str:
+    def play_card(self, state: GameState) -> Card | str:
 
         moves = self.get_valid_moves(state)
 
@@ -42,11 +52,9 @@ class DAPGPlayer(BasePlayer):
         best_move = None
         best_score = float('-inf')
 
+        tracker = state.pegging
         for move in moves:
-            new_state = copy.deepcopy(state)
-            new_state['cribs'][new_state['current_crib_idx']].append(move)
-
-            score, _ = Scoring.score_card(new_state, self, update_points=False)
+            score = tracker.score(move)
             if score > best_score:
                 best_score = score
                 best_move = move
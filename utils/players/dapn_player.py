@@ -1,6 +1,11 @@
+from typing import TYPE_CHECKING
+
 from utils.players import BasePlayer
-from utils.neural_nets import BasePeggingNet
-from utils.helpers import DiscardEvaluator
+from utils.helpers import DiscardEvaluator, Card, GameState, NumpyPeggingNet
+
+if TYPE_CHECKING:
+    # The torch networks are only needed for type hints, so that players with NumPy networks never import torch.
+    from utils.neural_nets import BasePeggingNet
 
 
 class DAPNPlayer(BasePlayer):
@@ -9,25 +14,38 @@ class DAPNPlayer(BasePlayer):
     uses a neural network during the pegging phase.
     """
 
-    def __init__(self, pegging_net: BasePeggingNet, play_style: str = 'recommended') -> None:
+    def __init__(self, pegging_net: 'BasePeggingNet | NumpyPeggingNet', play_style: str = 'recommended',
+                 time_budget: float | None = None, num_workers: int = 1) -> None:
         """
         Create a new DAPNPlayer instance.
 
         ------
 
         Arguments:
-            pegging_net: A pretrained pegging network.
+            pegging_net: A pretrained pegging network, with torch, exported to TorchScript (see ScriptedPeggingNet)
+                         or exported to NumPy (see NumpyPeggingNet).
+            play_style: The play style that will be used during discarding.
+            time_budget: If given, discards are estimated by sampling for at most this many seconds
+                         instead of being evaluated exactly.
+            num_workers: The number of processes to evaluate a discard decision with, in a persistent pool
+                         (see DiscardEvaluator).
         """
         super().__init__()
         self.pegging_net = pegging_net
-        self.pegging_net.net.eval()
+        self.pegging_net.eval()
         self.play_style = play_style
+        self.time_budget = time_budget
+        self.num_workers = num_workers
 
 
-    def discard_cards(self, state: dict[str, ...]) -> list[str]:
+    def discard_cards(self, state: GameState) -> list[Card]:
 
-        stats = DiscardEvaluator.get_discard_stats(self.cards, state['dealer'] == self)
-        cards = stats[self.play_style][0][0]
+        is_dealer = state.dealer == self.seat
+        if self.time_budget is None:
+            cards = DiscardEvaluator.get_best_discard(self.cards, is_dealer, self.play_style, self.num_workers)
+        else:
+            cards = DiscardEvaluator.sample_discard_stats(self.cards, is_dealer, self.play_style,
+                                                          time_budget = self.time_budget)[0][0]
 
         self.cards.remove(cards[0])
         self.cards.remove(cards[1])
@@ -35,14 +53,13 @@ class DAPNPlayer(BasePlayer):
         return cards
 
 
-    def play_card(self, state: dict[str, ...]) -> str:
+    def play_card(self, state: GameState) -> Card | str:
 
-        opponent = state['player1'] if self == state['player2'] else state['player2']
-        curr_crib_sum = state['crib_sums'][state['current_crib_idx']]
-        curr_crib = state['cribs'][state['current_crib_idx']]
+        curr_crib_sum = state.crib_sums[state.current_crib_idx]
+        curr_crib = state.cribs[state.current_crib_idx]
 
         card, _ = self.pegging_net.get_pegging_action(
-            self.points, opponent.points, curr_crib_sum, curr_crib, self.cards
+            self.points, state.points[1 - self.seat], curr_crib_sum, curr_crib, self.cards
         )
 
         if card != 'GO':
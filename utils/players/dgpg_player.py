@@ -1,34 +1,41 @@
-import copy
 import itertools
 
 from .base_player import BasePlayer
-from utils.helpers import CardDeck, Scoring
+from utils.helpers import CardDeck, CribTable, Scoring, Card, GameState
 
 
 class DGPGPlayer(BasePlayer):
     """ Player agent that plays greedy during both discarding and pegging phases. """
 
-    def __init__(self) -> None:
-        """ Create a new DGPGPlayer instance. """
+    def __init__(self, use_crib_ev: bool = False) -> None:
+        """
+        Create a new DGPGPlayer instance.
+
+        ------
+
+        Arguments:
+            use_crib_ev: Whether to add the expected crib value of each discard (see CribTable) to the hand score.
+        """
 
         super().__init__()
+        self.use_crib_ev = use_crib_ev
 
 
-    def discard_cards(self, state: dict[str, ...]) -> list[str]:
+    def discard_cards(self, state: GameState) -> list[Card]:
 
-        state = copy.deepcopy(state)
-        for starter_card in ['JH', 'JS', 'JC', 'JD']:
+        state = state.snapshot()
+        for starter_card in map(CardDeck.card_from_str, ('JH', 'JS', 'JC', 'JD')):
             if starter_card in self.cards:
                 continue
-            state['starter_card'] = starter_card
+            state.starter_card = starter_card
             break
 
-        if state['starter_card'] is None:
+        if state.starter_card is None:
             deck = CardDeck(shuffle=True)
             for starter_card in deck.cards:
                 if starter_card in self.cards:
                     continue
-                state['starter_card'] = starter_card
+                state.starter_card = starter_card
                 break
 
         player_hand = self.cards.copy()
@@ -38,7 +45,9 @@ class DGPGPlayer(BasePlayer):
 
         for combo in itertools.combinations(player_hand, 2):
             self.cards = [card for card in player_hand if card not in combo]
-            score, _ = Scoring.score_hand(state, self, update_points = False)
+            score, _ = Scoring.score_hand(state, self, update_points = False, explain = False)
+            if self.use_crib_ev:
+                score += CribTable.crib_ev(combo[0], combo[1], state.dealer == self.seat)
 
             if score > best_score:
                 best_score = score
@@ -51,7 +60,7 @@ class DGPGPlayer(BasePlayer):
         return best_combo
 
 
-    def play_card(self, state: dict[str, ...]) -> str:
+    def play_card(self, state: GameState) -> Card | str:
 
         moves = self.get_valid_moves(state)
 
@@ -61,11 +70,9 @@ class DGPGPlayer(BasePlayer):
         best_move = None
         best_score = float('-inf')
 
+        tracker = state.pegging
         for move in moves:
-            new_state = copy.deepcopy(state)
-            new_state['cribs'][new_state['current_crib_idx']].append(move)
-
-            score, _ = Scoring.score_card(new_state, self, update_points=False)
+            score = tracker.score(move)
             if score > best_score:
                 best_score = score
                 best_move = move
@@ -1,9 +1,12 @@
 import itertools
-import copy
+from typing import TYPE_CHECKING
 
 from utils.players import BasePlayer
-from utils.neural_nets import BasePeggingNet
-from utils.helpers import Scoring, CardDeck
+from utils.helpers import Scoring, CardDeck, CribTable, Card, GameState, NumpyPeggingNet
+
+if TYPE_CHECKING:
+    # The torch networks are only needed for type hints, so that players with NumPy networks never import torch.
+    from utils.neural_nets import BasePeggingNet
 
 
 class DGPNPlayer(BasePlayer):
@@ -12,35 +15,38 @@ class DGPNPlayer(BasePlayer):
     and uses a neural network during the pegging phase.
     """
 
-    def __init__(self, pegging_net: BasePeggingNet) -> None:
+    def __init__(self, pegging_net: 'BasePeggingNet | NumpyPeggingNet', use_crib_ev: bool = False) -> None:
         """
         Create a new DAPNPlayer instance.
 
         ------
 
         Arguments:
-            pegging_net: A pretrained pegging network.
+            pegging_net: A pretrained pegging network, with torch, exported to TorchScript (see ScriptedPeggingNet)
+                         or exported to NumPy (see NumpyPeggingNet).
+            use_crib_ev: Whether to add the expected crib value of each discard (see CribTable) to the hand score.
         """
         super().__init__()
         self.pegging_net = pegging_net
-        self.pegging_net.net.eval()
+        self.pegging_net.eval()
+        self.use_crib_ev = use_crib_ev
 
 
-    def discard_cards(self, state: dict[str, ...]) -> list[str]:
+    def discard_cards(self, state: GameState) -> list[Card]:
 
-        state = copy.deepcopy(state)
-        for starter_card in ['JH', 'JS', 'JC', 'JD']:
+        state = state.snapshot()
+        for starter_card in map(CardDeck.card_from_str, ('JH', 'JS', 'JC', 'JD')):
             if starter_card in self.cards:
                 continue
-            state['starter_card'] = starter_card
+            state.starter_card = starter_card
             break
 
-        if state['starter_card'] is None:
+        if state.starter_card is None:
             deck = CardDeck(shuffle = True)
             for starter_card in deck.cards:
                 if starter_card in self.cards:
                     continue
-                state['starter_card'] = starter_card
+                state.starter_card = starter_card
                 break
 
         player_hand = self.cards.copy()
@@ -50,7 +56,9 @@ class DGPNPlayer(BasePlayer):
 
         for combo in itertools.combinations(player_hand, 2):
             self.cards = [card for card in player_hand if card not in combo]
-            score, _ = Scoring.score_hand(state, self, update_points = False)
+            score, _ = Scoring.score_hand(state, self, update_points = False, explain = False)
+            if self.use_crib_ev:
+                score += CribTable.crib_ev(combo[0], combo[1], state.dealer == self.seat)
 
             if score > best_score:
                 best_score = score
@@ -63,14 +71,13 @@ class DGPNPlayer(BasePlayer):
         return best_combo
 
 
-    def play_card(self, state: dict[str, ...]) -> str:
+    def play_card(self, state: GameState) -> Card | str:
 
-        opponent = state['player1'] if self == state['player2'] else state['player2']
-        curr_crib_sum = state['crib_sums'][state['current_crib_idx']]
-        curr_crib = state['cribs'][state['current_crib_idx']]
+        curr_crib_sum = state.crib_sums[state.current_crib_idx]
+        curr_crib = state.cribs[state.current_crib_idx]
 
         card, _ = self.pegging_net.get_pegging_action(
-            self.points, opponent.points, curr_crib_sum, curr_crib, self.cards
+            self.points, state.points[1 - self.seat], curr_crib_sum, curr_crib, self.cards
         )
 
         if card != 'GO':
@@ -1,9 +1,8 @@
 import random
 import itertools
-import copy
 
 from .base_player import BasePlayer
-from utils.helpers import Scoring, CardDeck
+from utils.helpers import Scoring, CardDeck, Card, GameState
 
 class DGPRPlayer(BasePlayer):
     """
@@ -11,21 +10,21 @@ class DGPRPlayer(BasePlayer):
     but makes random moves during the pegging phase.
     """
 
-    def discard_cards(self, state: dict[str, ...]) -> list[str]:
+    def discard_cards(self, state: GameState) -> list[Card]:
 
-        state = copy.deepcopy(state)
-        for starter_card in ['JH', 'JS', 'JC', 'JD']:
+        state = state.snapshot()
+        for starter_card in map(CardDeck.card_from_str, ('JH', 'JS', 'JC', 'JD')):
             if starter_card in self.cards:
                 continue
-            state['starter_card'] = starter_card
+            state.starter_card = starter_card
             break
 
-        if state['starter_card'] is None:
+        if state.starter_card is None:
             deck = CardDeck(shuffle = True)
             for starter_card in deck.cards:
                 if starter_card in self.cards:
                     continue
-                state['starter_card'] = starter_card
+                state.starter_card = starter_card
                 break
 
         player_hand = self.cards.copy()
@@ -35,7 +34,7 @@ class DGPRPlayer(BasePlayer):
 
         for combo in itertools.combinations(player_hand, 2):
             self.cards = [card for card in player_hand if card not in combo]
-            score, _ = Scoring.score_hand(state, self, update_points = False)
+            score, _ = Scoring.score_hand(state, self, update_points = False, explain = False)
 
             if score > best_score:
                 best_score = score
@@ -48,7 +47,7 @@ class DGPRPlayer(BasePlayer):
         return best_combo
 
 
-    def play_card(self, state: dict[str, ...]) -> str:
+    def play_card(self, state: GameState) -> Card | str:
 
         card = random.choice(self.get_valid_moves(state))
 
@@ -1,31 +1,38 @@
 import random
+from typing import TYPE_CHECKING
 
 from utils.players import BasePlayer
-from utils.neural_nets import BaseDiscardNet
+from utils.helpers import Card, GameState, NumpyDiscardNet
+
+if TYPE_CHECKING:
+    # The torch networks are only needed for type hints, so that players with NumPy networks never import torch.
+    from utils.neural_nets import BaseDiscardNet
 
 class DNPRPlayer(BasePlayer):
     """ Player agent that uses a nural network during the discard phase and plays randomly during the pegging phase. """
 
-    def __init__(self, discard_net: BaseDiscardNet) -> None:
+    def __init__(self, discard_net: 'BaseDiscardNet | NumpyDiscardNet') -> None:
         """
         Create a new DNPRPlayer instance.
 
         ------
 
         Arguments:
-            discard_net: A pretrained discard network.
+            discard_net: A pretrained discard network, with torch, exported to TorchScript (see ScriptedDiscardNet)
+                         or exported to NumPy (see NumpyDiscardNet).
         """
         super().__init__()
         self.discard_net = discard_net
-        self.discard_net.net.eval()
+        self.discard_net.eval()
 
 
-    def discard_cards(self, state: dict[str, ...]) -> list[str]:
+    def discard_cards(self, state: GameState) -> list[Card]:
 
-        opponent = state['player1'] if self == state['player2'] else state['player2']
-        is_dealer = state['dealer'] == self
+        is_dealer = state.dealer == self.seat
 
-        card1, card2, _ = self.discard_net.get_discard_action(self.points, opponent.points, is_dealer, self.cards)
+        card1, card2, _ = self.discard_net.get_discard_action(
+            self.points, state.points[1 - self.seat], is_dealer, self.cards
+        )
 
         self.cards.remove(card1)
         self.cards.remove(card2)
@@ -33,7 +40,7 @@ class DNPRPlayer(BasePlayer):
         return [card1, card2]
 
 
-    def play_card(self, state: dict[str, ...]) -> str:
+    def play_card(self, state: GameState) -> Card | str:
 
         card = random.choice(self.get_valid_moves(state))
 
@@ -1,11 +1,12 @@
 import random
 
 from .base_player import BasePlayer
+from utils.helpers import Card, GameState
 
 class RandomPlayer(BasePlayer):
     """ Player agent that makes random moves. """
 
-    def discard_cards(self, state: dict[str, ...]) -> list[str]:
+    def discard_cards(self, state: GameState) -> list[Card]:
 
         cards = random.sample(self.cards, 2)
 
@@ -15,7 +16,7 @@ class RandomPlayer(BasePlayer):
         return cards
 
 
-    def play_card(self, state: dict[str, ...]) -> str:
+    def play_card(self, state: GameState) -> Card | str:
 
         card = random.choice(self.get_valid_moves(state))
 
@@ -1,10 +1,11 @@
 from .base_player import BasePlayer
+from utils.helpers import Card, GameState
 
 
 class UserPlayer(BasePlayer):
     """ Player agent controlled by the user. """
 
-    def discard_cards(self, state: dict[str, ...]) -> list[str]:
+    def discard_cards(self, state: GameState) -> list[Card]:
 
         valid_moves = list(range(1, 7))
 
@@ -26,7 +27,7 @@ class UserPlayer(BasePlayer):
             print("Invalid choice... 🙄", end=' ')
 
 
-    def play_card(self, state: dict[str, ...]) -> str:
+    def play_card(self, state: GameState) -> Card | str:
 
         valid_moves = self.get_valid_moves(state)
         valid_moves_len = len(valid_moves)
@@ -1 +1,2 @@
 from .simulator import *
+from .batch_simulator import *
\ No newline at end of file
@@ -0,0 +1,437 @@
+import itertools
+import time
+
+import numpy as np
+
+from utils.players import (BasePlayer, RandomPlayer, DGPGPlayer, DGPRPlayer, DAPGPlayer, DAPRPlayer,
+                           DAPNPlayer, DGPNPlayer, DNPRPlayer)
+from utils.helpers import CardDeck, CribTable, DiscardEvaluator, PeggingTracker, ScoreTable
+
+
+class BatchSimulator:
+    """
+    Lockstep simulation of many games between scripted and neural network players at once.
+
+    The hands, counts, points and dealers of all games are held in NumPy arrays and every game advances
+    by one decision per step, so a batch costs about as many array operations as a single game. Neural network
+    players choose their moves in all games of a step with one forward pass of their network.
+    """
+
+    # The (discard, pegging) strategies of the supported players.
+    STRATEGIES: dict[type, tuple[str, str]] = {
+        RandomPlayer : ('random', 'random'),
+        DGPGPlayer : ('greedy', 'greedy'),
+        DGPRPlayer : ('greedy', 'random'),
+        DAPGPlayer : ('evaluator', 'greedy'),
+        DAPRPlayer : ('evaluator', 'random'),
+        DAPNPlayer : ('evaluator', 'network'),
+        DGPNPlayer : ('greedy', 'network'),
+        DNPRPlayer : ('network', 'random')
+    }
+
+    RANKS = np.array(CardDeck.RANK_LOOKUP, dtype = np.int64) - 1
+    WORTHS = np.array(CardDeck.WORTH_LOOKUP, dtype = np.int64)
+    RUN_LENGTHS = np.array(PeggingTracker._RUN_LENGTHS, dtype = np.int8)
+
+    DISCARD_PAIRS = np.array(list(itertools.combinations(range(6), 2)), dtype = np.int64)
+    KEPT_CARDS = np.array([[idx for idx in range(6) if idx not in pair] for pair in DISCARD_PAIRS], dtype = np.int64)
+
+    GREEDY_STARTERS = tuple(map(CardDeck.card_from_str, ('JH', 'JS', 'JC', 'JD')))
+    JACK = CardDeck.CARD_RANKS.index('J')
+
+
+    def __init__(self, player1: BasePlayer, player2: BasePlayer, num_simulations: int,
+                 batch_size: int = 100_000, seed: int = None) -> None:
+        """
+        Create a new BatchSimulator instance.
+
+        ------
+
+        Arguments:
+            player1: The first player object. Must be one of the players in STRATEGIES.
+            player2: The second player object. Must be one of the players in STRATEGIES.
+            num_simulations: Number of games to simulate.
+            batch_size: Number of games to simulate at once.
+            seed: The random seed.
+        """
+
+        for player in (player1, player2):
+            if type(player) not in self.STRATEGIES:
+                raise Exception(f'Players of type {player.__class__.__name__} cannot be batch simulated.')
+
+        self.player1 = player1
+        self.player2 = player2
+        self.strategies = (self.STRATEGIES[type(player1)], self.STRATEGIES[type(player2)])
+        self.num_simulations = num_simulations
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+
+
+    def _discard(self, seat: int, hands: np.ndarray, dealers: np.ndarray, decks: np.ndarray,
+                 points: np.ndarray) -> np.ndarray:
+        """
+        Choose the discards of one player in all games.
+
+        ------
+
+        Arguments:
+            seat: The seat of the player.
+            hands: The dealt hands of both players, sorted by rank (games x 2 x 6).
+            dealers: The seat of the dealer in each game.
+            decks: The shuffled decks the hands were dealt from (games x 52).
+            points: The points of both players in each game (games x 2).
+
+        ------
+
+        Returns:
+            The index of the discarded pair (into DISCARD_PAIRS) in each game.
+        """
+
+        strategy = self.strategies[seat][0]
+        player = self.player1 if seat == 0 else self.player2
+        hand = hands[:, seat]
+        num_games = len(hand)
+
+        if strategy == 'random':
+            return self.rng.integers(len(self.DISCARD_PAIRS), size = num_games)
+
+        if strategy == 'greedy':
+            # Score each kept hand with the first Jack that is not in the hand as the starter.
+            starters = np.full(num_games, -1)
+            for jack in reversed(self.GREEDY_STARTERS):
+                starters = np.where((hand == jack).any(axis = 1), starters, jack)
+
+            other_cards = np.concatenate([hands[:, 1 - seat], decks[:, 12:]], axis = 1)
+            random_idxs = self.rng.integers(other_cards.shape[1], size = num_games)
+            random_starters = other_cards[np.arange(num_games), random_idxs]
+            starters = np.where(starters == -1, random_starters, starters)
+
+            combo_idxs = ScoreTable.get_combo_indexes(hand[:, self.KEPT_CARDS])
+            scores = ScoreTable.hand_scores()[combo_idxs * 52 + starters[:, None]]
+            if getattr(player, 'use_crib_ev', False):
+                scores = scores + CribTable.crib_evs(hand[:, self.DISCARD_PAIRS], (dealers == seat)[:, None])
+            return scores.argmax(axis = 1)
+
+        if strategy == 'network':
+            # DISCARD_COMBO_ORDER of the discard networks is the same as DISCARD_PAIRS.
+            combo_idxs, _ = player.discard_net.get_discard_actions(points[:, seat], points[:, 1 - seat],
+                                                                   dealers == seat, hand)
+            return np.array(combo_idxs.tolist())
+
+        pair_idxs = np.empty(num_games, dtype = np.int64)
+        for game_idx in range(num_games):
+            cards = hand[game_idx].tolist()
+            is_dealer = bool(dealers[game_idx] == seat)
+            if player.time_budget is None:
+                discarded = DiscardEvaluator.get_best_discard(cards, is_dealer, player.play_style)
+            else:
+                discarded = DiscardEvaluator.sample_discard_stats(cards, is_dealer, player.play_style,
+                                                                  time_budget = player.time_budget)[0][0]
+            pair_idxs[game_idx] = self.DISCARD_PAIRS.tolist().index(sorted(map(cards.index, discarded)))
+
+        return pair_idxs
+
+
+    def _network_picks(self, seat: int, cards: np.ndarray, crib_sums: np.ndarray, count_cards: np.ndarray,
+                       points: np.ndarray) -> np.ndarray:
+        """
+        Choose the played cards of a neural network player in a set of games, with one forward pass.
+
+        ------
+
+        Arguments:
+            seat: The seat of the player.
+            cards: The cards in hand of the player, -1 for the ones already played (games x 4).
+            crib_sums: The total of the current count in each game.
+            count_cards: The cards played in the current count, padded with -1 (games x 8).
+            points: The points of both players in each game (games x 2).
+
+        ------
+
+        Returns:
+            The hand slot of the played card in each game.
+        """
+
+        player = self.player1 if seat == 0 else self.player2
+
+        # The network sees the cards left in hand in their original order, like the player's list of cards.
+        slots = np.argsort(cards < 0, axis = 1, kind = 'stable')
+        player_hands = np.take_along_axis(cards, slots, axis = 1)
+
+        action_idxs, _ = player.pegging_net.get_pegging_actions(points[:, seat], points[:, 1 - seat], crib_sums,
+                                                                count_cards[:, :7], player_hands)
+
+        return slots[np.arange(len(cards)), np.array(action_idxs.tolist())]
+
+
+    def _peg(self, hands: np.ndarray, dealers: np.ndarray, points: np.ndarray) -> None:
+        """
+        Play the Play phase of all games, updating their points.
+
+        ------
+
+        Arguments:
+            hands: The kept hands of both players (games x 2 x 4). Consumed during play.
+            dealers: The seat of the dealer in each game.
+            points: The points of both players in each game (games x 2).
+        """
+
+        num_games = len(hands)
+        game_idxs = np.arange(num_games)
+
+        crib_sums = np.zeros(num_games, dtype = np.int64)
+        cards_played = np.zeros(num_games, dtype = np.int64)
+        turns = 1 - dealers
+        called_go = np.zeros(num_games, dtype = bool)
+        pair_ranks = np.full(num_games, -1)
+        pair_lens = np.zeros(num_games, dtype = np.int64)
+        # Rank bitmasks of the repeat-free suffixes of each count, as in PeggingTracker (0 when unused).
+        # A count can hold at most the 8 cards of a round, so that is also the longest suffix.
+        suffix_masks = np.zeros((num_games, PeggingTracker.TOTAL_CARDS), dtype = np.int16)
+        count_cards = np.full((num_games, PeggingTracker.TOTAL_CARDS), -1)
+        count_lens = np.zeros(num_games, dtype = np.int64)
+
+        live = np.ones(num_games, dtype = bool)
+        while live.any():
+            cards = hands[game_idxs, turns]
+            has_card = cards >= 0
+            new_sums = crib_sums[:, None] + np.where(has_card, self.WORTHS[cards], 99)
+            valid = has_card & (new_sums <= 31)
+
+            ranks = self.RANKS[cards]
+            rank_bits = np.left_shift(1, ranks).astype(np.int16)
+
+            scores = np.where((new_sums == 15) | (new_sums == 31), 2, 0)
+            pair_lens_new = np.where(ranks == pair_ranks[:, None], pair_lens[:, None] + 1, 0)
+            scores += pair_lens_new * (pair_lens_new - 1)
+            run_masks = suffix_masks[:, None, :] | rank_bits[:, :, None]
+            run_lengths = np.where(suffix_masks[:, None, :] & rank_bits[:, :, None], 0, self.RUN_LENGTHS[run_masks])
+            scores += run_lengths.max(axis = 2)
+            scores += cards_played[:, None] + 1 == PeggingTracker.TOTAL_CARDS
+
+            plays = live & valid.any(axis = 1)
+            goes = live & ~plays
+
+            greedy_picks = np.where(valid, scores, -1).argmax(axis = 1)
+            random_picks = np.where(valid, self.rng.random(valid.shape), -1).argmax(axis = 1)
+            picks = np.empty(num_games, dtype = np.int64)
+            for seat in (0, 1):
+                strategy = self.strategies[seat][1]
+                if strategy == 'network':
+                    seat_games = np.flatnonzero(plays & (turns == seat))
+                    seat_picks = np.zeros(num_games, dtype = np.int64)
+                    if len(seat_games):
+                        seat_picks[seat_games] = self._network_picks(seat, cards[seat_games], crib_sums[seat_games],
+                                                                     count_cards[seat_games], points[seat_games])
+                else:
+                    seat_picks = greedy_picks if strategy == 'greedy' else random_picks
+                picks = np.where(turns == seat, seat_picks, picks)
+            prev_called_go = called_go.copy()
+
+            # GO: the first one gives the opponent a point, the second one starts a new count.
+            new_count = goes & called_go
+            points[goes & ~called_go, 1 - turns[goes & ~called_go]] += 1
+            called_go = np.where(goes, ~called_go, called_go)
+
+            # Playing a card.
+            played_cards = cards[game_idxs, picks]
+            played_ranks = ranks[game_idxs, picks]
+            played_bits = rank_bits[game_idxs, picks]
+
+            points[plays, turns[plays]] += scores[game_idxs, picks][plays]
+            hands[plays, turns[plays], picks[plays]] = -1
+            crib_sums = np.where(plays, crib_sums + self.WORTHS[played_cards], crib_sums)
+            count_cards[plays, count_lens[plays]] = played_cards[plays]
+            count_lens += plays
+            cards_played += plays
+
+            same_rank = played_ranks == pair_ranks
+            pair_lens = np.where(plays, np.where(same_rank, pair_lens + 1, 1), pair_lens)
+            pair_ranks = np.where(plays, played_ranks, pair_ranks)
+
+            prev_masks = suffix_masks[:, :-1]
+            extended_masks = np.where((prev_masks != 0) & (prev_masks & played_bits[:, None] == 0),
+                                      prev_masks | played_bits[:, None], 0)
+            played_masks = np.concatenate([played_bits[:, None], extended_masks], axis = 1)
+            suffix_masks = np.where(plays[:, None], played_masks, suffix_masks)
+
+            hit_31 = plays & (crib_sums == 31)
+            new_count |= hit_31
+            called_go &= ~hit_31
+
+            crib_sums[new_count] = 0
+            pair_ranks[new_count] = -1
+            pair_lens[new_count] = 0
+            suffix_masks[new_count] = 0
+            count_cards[new_count] = -1
+            count_lens[new_count] = 0
+
+            turns = np.where(live & ~(called_go & prev_called_go), 1 - turns, turns)
+
+            live &= (points < 121).all(axis = 1) & (hands >= 0).any(axis = (1, 2))
+
+
+    def _run_batch(self, num_games: int) -> dict[str, np.ndarray]:
+        """
+        Simulate a batch of full games.
+
+        ------
+
+        Arguments:
+            num_games: The number of games in the batch. Player 1 is the first dealer in every even game.
+
+        ------
+
+        Returns:
+            A dictionary with the winner, number of rounds and summed score differences of each game.
+        """
+
+        hand_scores, crib_scores = ScoreTable.hand_scores(), ScoreTable.crib_scores()
+
+        points = np.zeros((num_games, 2), dtype = np.int64)
+        # prepare_new_round() switches the dealer, so we start with the opposite of the first dealer.
+        dealers = 1 - np.arange(num_games) % 2
+        winners = np.full(num_games, -1)
+        total_rounds = np.zeros(num_games, dtype = np.int64)
+        score_diffs = np.zeros((num_games, 3))
+        score_diff_counts = np.zeros((num_games, 3), dtype = np.int64)
+
+        active = np.arange(num_games)
+        while len(active):
+            n = len(active)
+            idxs = np.arange(n)
+            total_rounds[active] += 1
+            dealers[active] = 1 - dealers[active]
+            dealer = dealers[active]
+            round_points = points[active]
+
+            # DEAL AND DISCARD PHASE
+            decks = np.argsort(self.rng.random((n, 52)), axis = 1)
+            hands = decks[:, :12].reshape(n, 2, 6)
+            hands = np.take_along_axis(hands, np.argsort(self.RANKS[hands], axis = 2, kind = 'stable'), axis = 2)
+            starters = decks[:, 12]
+
+            kept = np.empty((n, 2, 4), dtype = np.int64)
+            cribs = np.empty((n, 4), dtype = np.int64)
+            for seat in (0, 1):
+                pair_idxs = self._discard(seat, hands, dealer, decks, round_points)
+                kept[:, seat] = hands[idxs[:, None], seat, self.KEPT_CARDS[pair_idxs]]
+                cribs[:, 2 * seat: 2 * seat + 2] = hands[idxs[:, None], seat, self.DISCARD_PAIRS[pair_idxs]]
+
+            heels = np.where(self.RANKS[starters] == self.JACK, 2, 0)
+            round_points[idxs, dealer] += heels
+
+            hand_points = hand_scores[ScoreTable.get_combo_indexes(kept) * 52 + starters[:, None]].astype(np.int64)
+            crib_points = crib_scores[ScoreTable.get_combo_indexes(cribs) * 52 + starters].astype(np.int64) - heels
+
+            # PLAY PHASE
+            self._peg(kept.copy(), dealer, round_points)
+            round_winners = np.where(round_points[:, 0] >= 121, 0, np.where(round_points[:, 1] >= 121, 1, -1))
+
+            # SHOW PHASE
+            # As in Game, the non-dealer's hand is still counted after a win during the Play phase.
+            round_points[idxs, 1 - dealer] += hand_points[idxs, 1 - dealer]
+            round_winners = np.where(round_points[:, 0] >= 121, 0, np.where(round_points[:, 1] >= 121, 1, -1))
+
+            ongoing = round_winners == -1
+            round_points[idxs, dealer] += np.where(ongoing, hand_points[idxs, dealer], 0)
+            round_winners = np.where(ongoing & (round_points[idxs, dealer] >= 121), dealer, round_winners)
+
+            ongoing = round_winners == -1
+            round_points[idxs, dealer] += np.where(ongoing, crib_points, 0)
+            round_winners = np.where(ongoing & (round_points[idxs, dealer] >= 121), dealer, round_winners)
+
+            points[active] = round_points
+            winners[active] = round_winners
+
+            ongoing = round_winners == -1
+            score_diff = round_points[:, 0] - round_points[:, 1]
+            for column, rounds_mask in enumerate((ongoing, ongoing & (dealer == 0), ongoing & (dealer == 1))):
+                score_diffs[active, column] += np.where(rounds_mask, score_diff, 0)
+                score_diff_counts[active, column] += rounds_mask
+
+            active = active[ongoing]
+
+        # Games won in their first round have no score differences, so they are left out of the averages.
+        avg_score_diffs = np.divide(score_diffs, score_diff_counts, out = np.full(score_diffs.shape, np.nan),
+                                    where = score_diff_counts > 0)
+
+        return {
+            'winners' : winners,
+            'first_dealers' : np.arange(num_games) % 2,
+            'total_rounds' : total_rounds,
+            'avg_score_diffs' : avg_score_diffs
+        }
+
+
+    def start(self) -> str:
+        """
+        Start the simulator.
+
+        ------
+
+        Returns:
+            Results of the simulations.
+        """
+
+        total_sim_time = time.time()
+        ScoreTable.load()
+
+        batches = []
+        num_done = 0
+        while num_done < self.num_simulations:
+            num_games = min(self.batch_size, self.num_simulations - num_done)
+            batches.append(self._run_batch(num_games))
+            num_done += num_games
+            print(f'\r\033[K[ BATCH SIMULATOR ] : Running simulations... {num_done} / {self.num_simulations}', end = '')
+
+        winners = np.concatenate([batch['winners'] for batch in batches])
+        first_dealers = np.concatenate([batch['first_dealers'] for batch in batches])
+        total_rounds = np.concatenate([batch['total_rounds'] for batch in batches])
+        avg_score_diffs = np.concatenate([batch['avg_score_diffs'] for batch in batches])
+
+        sim_time = time.time() - total_sim_time
+        player1_wins = int((winners == 0).sum())
+        player2_wins = int((winners == 1).sum())
+        dealer1_wins = int(((winners == 0) & (first_dealers == 0)).sum())
+        dealer2_wins = int(((winners == 1) & (first_dealers == 1)).sum())
+        dealer1_win_percent = dealer1_wins / player1_wins * 100 if player1_wins != 0 else 0
+        dealer2_win_percent = dealer2_wins / player2_wins * 100 if player2_wins != 0 else 0
+        score_diffs = np.nanmean(avg_score_diffs, axis = 0)
+
+        results = (
+            f'\n'
+            f'-----[ BATCH SIMULATION RESULTS ]-----\n'
+            f'[ {self.player1.__class__.__name__} ] vs [ {self.player2.__class__.__name__} ]\n'
+            f'=================================================\n'
+            f'--- Configuration             :\n'
+            f'* Player 1                    : {self.player1.__class__.__name__}\n'
+            f'* Player 2                    : {self.player2.__class__.__name__}\n'
+            f'* Number of Simulations       : {self.num_simulations}\n'
+            f'* Batch Size                  : {self.batch_size}\n'
+            f'=================================================\n'
+            f'--- Duration Stats            :\n'
+            f'* Total Simulation Time       : {sim_time:.2f} sec\n'
+            f'* Games per Second            : {self.num_simulations / sim_time:.0f}\n'
+            f'=================================================\n'
+            f'--- Game Conclusion Stats     :\n'
+            f'* Player 1 Wins               : {player1_wins} ( {player1_wins / self.num_simulations * 100:.2f}% )\n'
+            f'* Player 2 Wins               : {player2_wins} ( {player2_wins / self.num_simulations * 100:.2f}% )\n'
+            f'* Player 1 Wins as 1st Dealer : {dealer1_wins} of {player1_wins} ( {dealer1_win_percent:.2f}% )\n'
+            f'* Player 2 Wins as 1st Dealer : {dealer2_wins} of {player2_wins} ( {dealer2_win_percent:.2f}% )\n'
+            f'* Avg Game Length             : {int(total_rounds.mean())} rounds\n'
+            f'=================================================\n'
+            f'--- Score Difference Stats    :\n'
+            f'* Avg Score Diff Overall      : {score_diffs[0]:.2f}\n'
+            f'* Avg Score Diff (P1 dealer)  : {score_diffs[1]:.2f}\n'
+            f'* Avg Score Diff (P2 dealer)  : {score_diffs[2]:.2f}\n'
+            f'  [!] score_diff = player1.score - player2.score\n'
+            f'=================================================\n'
+            f'\n'
+        )
+
+        print(results)
+        return results
+
+
+__all__ = ['BatchSimulator']
@@ -2,8 +2,9 @@ from multiprocessing import Pool, cpu_count
 import cProfile
 import time
 
-from utils.game import Game
+from utils.game import HeadlessGame
 from utils.players import BasePlayer, UserPlayer
+from utils.helpers import DiscardCache, ScoreTable
 
 
 def _get_game_data(args: dict[str, ...]) -> dict[str, ...]:
@@ -23,10 +24,8 @@ def _get_game_data(args: dict[str, ...]) -> dict[str, ...]:
 
     player1, player2, first_dealer = args['player1'], args['player2'], args['first_dealer']
 
-    game = Game(
+    game = HeadlessGame(
         player1 = player1, player2 = player2, first_dealer = first_dealer,
-        wait_after_move = None, wait_after_info = False,
-        show_opponents_hand = False, visuals = False,
         measure_statistics = True
     )
 
@@ -41,7 +40,8 @@ def _get_game_data(args: dict[str, ...]) -> dict[str, ...]:
         'avg_score_diff' : sum(game.stats_score_diff) / len(game.stats_score_diff),
         'avg_score_diff_dealer1' : sum(game.stats_score_diff_dealer1) / len(game.stats_score_diff_dealer1),
         'avg_score_diff_dealer2' : sum(game.stats_score_diff_dealer2) / len(game.stats_score_diff_dealer2),
-        'first_dealer' : first_dealer
+        'first_dealer' : first_dealer,
+        'discard_cache' : DiscardCache.pop_counters()
     }
 
 
@@ -50,7 +50,8 @@ class Simulator:
     """ Game simulations and performance measurements. """
 
     def __init__(self, player1: BasePlayer, player2: BasePlayer, num_simulations: int,
-                 measure_performance: bool = True, num_workers: int = 1) -> None:
+                 measure_performance: bool = True, num_workers: int = 1,
+                 discard_cache_size: int = DiscardCache.MAX_SIZE) -> None:
         """
         Create a new Simulator instance.
 
@@ -62,6 +63,7 @@ class Simulator:
             num_simulations: Number of simulations to run.
             measure_performance: Whether to measure the performance of the code.
             num_workers: Number of cores to use for simulations.
+            discard_cache_size: Maximum number of hands in the discard cache of each worker (0 to disable it).
         """
 
         if isinstance(player1, UserPlayer) or isinstance(player2, UserPlayer):
@@ -72,6 +74,7 @@ class Simulator:
         self.num_simulations = num_simulations
         self.measure_performance = measure_performance
         self.num_workers = min(cpu_count(), num_workers)
+        self.discard_cache_size = discard_cache_size
 
 
     def _run_simulations(self) -> str:
@@ -92,10 +95,14 @@ class Simulator:
         sum_avg_score_diffs_d2 = 0
         player1_wins, player2_wins = 0, 0
         dealer1_wins, dealer2_wins = 0, 0
+        discard_cache_hits, discard_cache_misses = 0, 0
 
         print('[ SIMULATOR ] : Running simulations...', end = '\r')
 
-        with Pool(processes = self.num_workers) as pool:
+        ScoreTable.load()
+
+        with Pool(processes = self.num_workers, initializer = DiscardCache.configure,
+                  initargs = (self.discard_cache_size,)) as pool:
             _sim_args = []
 
             _sim_args.extend([{
@@ -114,6 +121,8 @@ class Simulator:
                     sum_avg_score_diffs += result['avg_score_diff']
                     sum_avg_score_diffs_d1 += result['avg_score_diff_dealer1']
                     sum_avg_score_diffs_d2 += result['avg_score_diff_dealer2']
+                    discard_cache_hits += result['discard_cache']['hits']
+                    discard_cache_misses += result['discard_cache']['misses']
 
                     if winner == 'player1':
                         player1_wins += 1
@@ -153,6 +162,8 @@ class Simulator:
 
         dealer1_win_percent = dealer1_wins / player1_wins * 100 if player1_wins != 0 else 0
         dealer2_win_percent = dealer2_wins / player2_wins * 100 if player2_wins != 0 else 0
+        discard_cache_lookups = discard_cache_hits + discard_cache_misses
+        discard_cache_hit_percent = discard_cache_hits / discard_cache_lookups * 100 if discard_cache_lookups else 0
 
         results = (
             f'\n'
@@ -165,6 +176,7 @@ class Simulator:
             f'* Number of Simulations       : {self.num_simulations}\n'
             f'* Number of Workers           : {self.num_workers}\n'
             f'* Measuring Performance       : {self.measure_performance}\n'
+            f'* Discard Cache Size          : {self.discard_cache_size}\n'
             f'=================================================\n'
             f'--- Duration Stats            :\n'
             f'* Total Simulation Time       : {time.time() - total_sim_time:.2f} sec\n'
@@ -184,6 +196,11 @@ class Simulator:
             f'* Avg Score Diff (P2 dealer)  : {sum_avg_score_diffs_d2 / self.num_simulations:.2f}\n'
             f'  [!] score_diff = player1.score - player2.score\n'
             f'=================================================\n'
+            f'--- Discard Cache Stats       :\n'
+            f'* Hits                        : {discard_cache_hits} of {discard_cache_lookups} '
+            f'( {discard_cache_hit_percent:.2f}% )\n'
+            f'* Misses                      : {discard_cache_misses}\n'
+            f'=================================================\n'
             f'\n'
         )
 